@@ -31,6 +31,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'admissions.middleware.MetricsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -44,7 +45,8 @@ ROOT_URLCONF = 'admission_portal.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # Django's template backend, timed for the request metrics
+        'BACKEND': 'admissions.metrics.TimedDjangoTemplates',
         'DIRS': [os.path.join(BASE_DIR, 'templates')],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -52,6 +54,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'admissions.context_processors.user_roles',
             ],
         },
     },
@@ -71,6 +74,32 @@ DATABASES = {
         'PASSWORD': os.getenv("DB_PASSWORD"),
         'HOST': os.getenv("DB_HOST"),
         'PORT': os.getenv("DB_PORT"),
+        # Persistent connections; worth setting under ASGI, where async views
+        # run queries in a pool of worker threads (see admissions.concurrency).
+        'CONN_MAX_AGE': int(os.getenv("DB_CONN_MAX_AGE", "0")),
+        'CONN_HEALTH_CHECKS': True,
+    }
+}
+
+# DB_ENGINE=sqlite runs against a local file instead (e.g. for `manage.py loadtest`
+# on a machine without MySQL).
+if os.getenv("DB_ENGINE") == "sqlite":
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.getenv("DB_NAME") or BASE_DIR / 'db.sqlite3',
+            'CONN_MAX_AGE': int(os.getenv("DB_CONN_MAX_AGE", "0")),
+        }
+    }
+
+# Cache
+# Role versions and other shared stamps live here; use a shared backend
+# (Redis, Memcached, database) when running more than one worker process.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv("CACHE_BACKEND", 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv("CACHE_LOCATION", ''),
     }
 }
 
@@ -121,3 +150,36 @@ LOGOUT_REDIRECT_URL = 'home'
 
 AUTH_USER_MODEL = 'auth.User'
 
+
+
+# Application numbers reserved per worker process in one counter update.
+# 1 keeps numbers gap-free; larger blocks take the counter row off the hot path.
+ADMISSIONS_APPLICATION_NUMBER_BLOCK = int(os.getenv("ADMISSIONS_APPLICATION_NUMBER_BLOCK", "1"))
+
+# Read officer dashboard counts from the materialized status counters
+# instead of aggregating the applications table on every request. The
+# counters are only maintained while this is on: run
+# `python manage.py rebuild_status_counters` right after switching it on.
+ADMISSIONS_STATUS_COUNTERS = os.getenv("ADMISSIONS_STATUS_COUNTERS") == "True"
+
+# Officer queue pagination: 'pages' (numbered, OFFSET + COUNT) or 'cursor'
+# (keyset, constant cost per page). ?paginate= overrides per request.
+ADMISSIONS_QUEUE_PAGINATION = os.getenv("ADMISSIONS_QUEUE_PAGINATION", "pages")
+
+# Course search backend: 'fulltext' (MySQL FULLTEXT indexes), 'memory'
+# (in-process inverted index) or 'auto' to pick by database vendor.
+ADMISSIONS_COURSE_SEARCH = os.getenv("ADMISSIONS_COURSE_SEARCH", "auto")
+
+# Per-view request metrics (latency, SQL, template time, response size),
+# served in Prometheus format at /metrics/ to superusers.
+ADMISSIONS_METRICS = os.getenv("ADMISSIONS_METRICS", "True") == "True"
+
+# Serve the dashboards and listings from admissions.async_views, which run
+# their independent queries concurrently. Enable when running under ASGI.
+ADMISSIONS_ASYNC_VIEWS = os.getenv("ADMISSIONS_ASYNC_VIEWS") == "True"
+
+# Push application status changes to open student dashboards over
+# Server-Sent Events. Each open dashboard holds a connection, so only
+# enable it under ASGI. Idle streams re-check every _POLL seconds.
+ADMISSIONS_LIVE_STATUS = os.getenv("ADMISSIONS_LIVE_STATUS", str(ADMISSIONS_ASYNC_VIEWS)) == "True"
+ADMISSIONS_LIVE_STATUS_POLL = int(os.getenv("ADMISSIONS_LIVE_STATUS_POLL", "15"))
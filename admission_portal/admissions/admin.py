@@ -1,17 +1,123 @@
-from django.contrib import admin
-from .models import Course, Application, SeatAllocation
+import io
+
+from django import forms
+from django.contrib import admin, messages
+from django.core.exceptions import PermissionDenied
+from django.template.response import TemplateResponse
+from django.urls import path
+
+from .importing import APPLICATION_COLUMNS, COURSE_COLUMNS, OPTIONAL_APPLICATION_COLUMNS, import_applications, import_courses
+from .eligibility import reevaluate_course
+from .waitlist import promote_waitlist
+from .models import Course, Application, EligibilityAudit, SeatAllocation, WaitlistEntry
+
+
+class CsvImportForm(forms.Form):
+    file = forms.FileField(help_text='UTF-8 CSV with a header row')
+    dry_run = forms.BooleanField(required=False, help_text='Only validate, do not import anything')
+
+
+class CsvImportMixin:
+    """Adds an "Import CSV" page to the changelist"""
+    change_list_template = 'admin/admissions/change_list_import.html'
+    import_columns = []
+
+    def run_import(self, stream, dry_run):
+        raise NotImplementedError
+
+    def get_urls(self):
+        info = self.model._meta.app_label, self.model._meta.model_name
+        return [
+            path('import/', self.admin_site.admin_view(self.import_csv), name='%s_%s_import' % info),
+        ] + super().get_urls()
+
+    def import_csv(self, request):
+        if not self.has_add_permission(request):
+            raise PermissionDenied
+
+        form = CsvImportForm(request.POST or None, request.FILES or None)
+        result = None
+        if request.method == 'POST' and form.is_valid():
+            # Read the upload as a text stream instead of loading it into memory
+            stream = io.TextIOWrapper(form.cleaned_data['file'].file, encoding='utf-8-sig', newline='')
+            try:
+                result = self.run_import(stream, form.cleaned_data['dry_run'])
+            except (ValueError, UnicodeDecodeError) as e:
+                self.message_user(request, f'❌ Import failed: {e}', messages.ERROR)
+            else:
+                verb = 'Validated' if result.dry_run else 'Imported'
+                level = messages.WARNING if result.errors else messages.SUCCESS
+                self.message_user(
+                    request,
+                    f'{verb} {result.created} of {result.rows} rows in {result.elapsed:.1f}s; '
+                    f'{len({e.line for e in result.errors})} row(s) rejected.',
+                    level,
+                )
+
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': f'Import {self.model._meta.verbose_name_plural} from CSV',
+            'form': form,
+            'result': result,
+            'errors': result.errors[:500] if result else [],
+            'columns': self.import_columns,
+        }
+        return TemplateResponse(request, 'admin/admissions/import_csv.html', context)
+
 
 @admin.register(Course)
-class CourseAdmin(admin.ModelAdmin):
+class CourseAdmin(CsvImportMixin, admin.ModelAdmin):
     list_display = ('code', 'name', 'department', 'course_type', 'total_seats', 'filled_seats', 'available_seats', 'min_percentage')
     list_filter = ('department', 'course_type')
     search_fields = ('code', 'name', 'department')
     readonly_fields = ('filled_seats',)
+    import_columns = COURSE_COLUMNS
+
+    def run_import(self, stream, dry_run):
+        return import_courses(stream, dry_run=dry_run)
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if change and 'min_percentage' in form.changed_data:
+            audit = reevaluate_course(obj, previous_min_percentage=form.initial.get('min_percentage'), changed_by=request.user)
+            self.message_user(
+                request,
+                f'Eligibility re-checked: {audit.became_eligible} now eligible, {audit.became_ineligible} no longer eligible.',
+            )
+        if change and obj.total_seats > (form.initial.get('total_seats') or 0):
+            promotion = promote_waitlist([obj], allocated_by=request.user)
+            self.message_user(request, f'{promotion.total_allocated} waitlisted applications were given the new seats.')
 
 @admin.register(Application)
-class ApplicationAdmin(admin.ModelAdmin):
+class ApplicationAdmin(CsvImportMixin, admin.ModelAdmin):
     list_display = ('application_number', 'student', 'course', 'status', 'is_eligible', 'submission_date')
     list_filter = ('status', 'is_eligible', 'course', 'submission_date')
     search_fields = ('application_number', 'student__username', 'student__email')
     readonly_fields = ('application_number', 'created_at', 'last_updated')
     date_hierarchy = 'submission_date'
+    import_columns = APPLICATION_COLUMNS + OPTIONAL_APPLICATION_COLUMNS
+
+    def run_import(self, stream, dry_run):
+        return import_applications(stream, dry_run=dry_run)
+
+
+@admin.register(EligibilityAudit)
+class EligibilityAuditAdmin(admin.ModelAdmin):
+    list_display = ('course', 'previous_min_percentage', 'min_percentage', 'reevaluated', 'became_eligible', 'became_ineligible', 'changed_by', 'created_at')
+    list_filter = ('course',)
+    list_select_related = ('course', 'changed_by')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(WaitlistEntry)
+class WaitlistEntryAdmin(admin.ModelAdmin):
+    list_display = ('application', 'course', 'percentage_obtained', 'submitted_at', 'queued_at')
+    list_filter = ('course',)
+    list_select_related = ('application', 'course')
+    readonly_fields = ('percentage_obtained', 'submitted_at', 'queued_at')
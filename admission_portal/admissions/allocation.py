@@ -0,0 +1,190 @@
+"""Merit-list seat allocation.
+
+Allocates seats for many courses in one pass instead of one
+``review_application`` POST at a time. Candidates are loaded as plain
+tuples in a single query, ranked by ``percentage_obtained`` in memory and
+written back with bulk inserts and set-based updates inside one
+transaction.
+
+Locks are taken in the same order as ``reserve_seat``: the courses, then
+the candidates' student rows, and only then are their existing seats
+read, so a reservation in another course can't seat the same student
+alongside this run. On SQLite, which has no row locks, the database's
+single writer serializes the two instead.
+"""
+import time
+from dataclasses import dataclass, field
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.utils import timezone
+
+from .catalog import bump_catalog_version
+from .models import Application, Course, SeatAllocation
+from .stats import adjust_status_counts
+
+
+# Applications that have not been decided against can be placed on the merit list.
+CANDIDATE_STATUSES = ['SUBMITTED', 'UNDER_REVIEW', 'SHORTLISTED', 'APPROVED']
+
+CONFIRMATION_DAYS = 14
+BATCH_SIZE = 1000
+
+
+@dataclass
+class CourseResult:
+    course_id: int
+    code: str
+    available_before: int
+    allocated: int = 0
+    cutoff: float = None
+
+
+@dataclass
+class AllocationResult:
+    dry_run: bool
+    courses: list = field(default_factory=list)
+    allocations: list = field(default_factory=list)
+    skipped_already_seated: int = 0
+    timings: dict = field(default_factory=dict)
+
+    @property
+    def total_allocated(self):
+        return len(self.allocations)
+
+
+def _rank_candidates(rows, capacity, seated_students):
+    """Walk candidates in merit order and pick winners.
+
+    ``rows`` are ``(app_id, student_id, course_id, percentage, status)`` tuples
+    already sorted best-first. A student is seated at most once: the first
+    course in merit order that still has room wins, mirroring
+    ``SeatAllocation.can_allocate``.
+    """
+    winners = []
+    skipped = 0
+    for app_id, student_id, course_id, percentage, status in rows:
+        if student_id in seated_students:
+            skipped += 1
+            continue
+        if capacity.get(course_id, 0) <= 0:
+            continue
+        capacity[course_id] -= 1
+        seated_students.add(student_id)
+        winners.append((app_id, student_id, course_id, percentage, status))
+    return winners, skipped
+
+
+def allocate_merit_list(courses=None, allocated_by=None, dry_run=False, application_ids=None):
+    """Allocate seats by merit for ``courses`` (all courses when ``None``).
+
+    When ``application_ids`` is given only those applications are
+    considered. Returns an ``AllocationResult`` with the per-course cutoff
+    and phase timings; nothing is written when ``dry_run`` is set.
+    """
+    result = AllocationResult(dry_run=dry_run)
+    started = time.perf_counter()
+
+    with transaction.atomic():
+        course_qs = Course.objects.all()
+        if courses is not None:
+            course_qs = course_qs.filter(pk__in=[getattr(c, 'pk', c) for c in courses])
+        if not dry_run:
+            course_qs = course_qs.select_for_update()
+        course_rows = list(course_qs.order_by('code').values_list('id', 'code', 'total_seats', 'filled_seats'))
+
+        capacity = {}
+        for course_id, code, total, filled in course_rows:
+            capacity[course_id] = max(total - filled, 0)
+            result.courses.append(CourseResult(course_id, code, capacity[course_id]))
+
+        candidates = (
+            Application.objects
+            .filter(
+                course_id__in=[c[0] for c in course_rows if capacity[c[0]] > 0],
+                status__in=CANDIDATE_STATUSES,
+                is_eligible=True,
+                seat_allocation__isnull=True,
+            )
+            .order_by('-percentage_obtained', F('submission_date').asc(nulls_last=True), 'id')
+        )
+        if application_ids is not None:
+            candidates = candidates.filter(pk__in=application_ids)
+        rows = list(candidates.values_list('id', 'student_id', 'course_id', 'percentage_obtained', 'status'))
+
+        student_ids = {row[1] for row in rows}
+        if student_ids and not dry_run:
+            list(User.objects.select_for_update().filter(pk__in=student_ids).order_by('pk').values_list('pk'))
+        seated_students = set(
+            SeatAllocation.objects
+            .filter(application__student_id__in=student_ids)
+            .values_list('application__student_id', flat=True)
+        ) if student_ids else set()
+        result.timings['load'] = time.perf_counter() - started
+
+        ranked_at = time.perf_counter()
+        winners, result.skipped_already_seated = _rank_candidates(rows, capacity, seated_students)
+        result.allocations = winners
+        result.timings['rank'] = time.perf_counter() - ranked_at
+
+        by_course = {c.course_id: c for c in result.courses}
+        for app_id, student_id, course_id, percentage, status in winners:
+            course_result = by_course[course_id]
+            course_result.allocated += 1
+            # Winners arrive best-first, so the last one seen is the cutoff.
+            course_result.cutoff = percentage
+
+        if not dry_run and winners:
+            written_at = time.perf_counter()
+            _write_allocations(winners, by_course, allocated_by)
+            result.timings['write'] = time.perf_counter() - written_at
+
+    result.timings['total'] = time.perf_counter() - started
+    return result
+
+
+def _write_allocations(winners, by_course, allocated_by):
+    now = timezone.now()
+    deadline = now.date() + timezone.timedelta(days=CONFIRMATION_DAYS)
+
+    SeatAllocation.objects.bulk_create(
+        [
+            SeatAllocation(
+                application_id=app_id,
+                course_id=course_id,
+                allocated_by=allocated_by,
+                confirmation_deadline=deadline,
+                notes='Allocated by merit list',
+            )
+            for app_id, _, course_id, _, _ in winners
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+    app_ids = [w[0] for w in winners]
+    for start in range(0, len(app_ids), BATCH_SIZE):
+        Application.objects.filter(pk__in=app_ids[start:start + BATCH_SIZE]).update(
+            status='APPROVED',
+            reviewed_by=allocated_by,
+            review_date=now,
+            last_updated=now,
+        )
+
+    deltas = {}
+    for *_, status in winners:
+        if status != 'APPROVED':
+            deltas[status] = deltas.get(status, 0) - 1
+            deltas['APPROVED'] = deltas.get('APPROVED', 0) + 1
+    adjust_status_counts(deltas)
+
+    increments = {cid: c.allocated for cid, c in by_course.items() if c.allocated}
+    Course.objects.filter(pk__in=increments).update(
+        filled_seats=F('filled_seats') + Case(
+            *[When(pk=cid, then=Value(n)) for cid, n in increments.items()],
+            default=Value(0),
+            output_field=IntegerField(),
+        ),
+        updated_at=now,
+    )
+    bump_catalog_version(seats_only=True)
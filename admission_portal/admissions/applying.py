@@ -0,0 +1,96 @@
+"""Race-free creation of a student's application.
+
+``create_application`` locks the student's ``User`` row and, in the same
+single query, counts their active applications and looks for one to the
+same course. The insert then happens in that transaction, so two
+concurrent submits from one student queue behind each other instead of
+both slipping under the limit, and a duplicate surfaces as
+``AlreadyApplied`` rather than an ``IntegrityError``.
+
+Backends without ``SELECT ... FOR UPDATE`` (SQLite) fall back to a
+process-local lock per student, which is enough for a single-process
+development server.
+
+The application number is taken before that transaction opens, so it
+can come from the worker's pre-reserved block instead of holding the
+year's counter row until the apply commits. A rejected submission just
+leaves a gap in the numbering.
+"""
+import threading
+from contextlib import nullcontext
+
+from django.contrib.auth.models import User
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, Exists, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from .models import PENDING_STATUSES, Application
+from .numbering import application_numbers
+
+
+MAX_ACTIVE_APPLICATIONS = 3
+
+# Striped so the fallback never holds more than this many locks
+_LOCKS = [threading.Lock() for _ in range(64)]
+
+
+class ApplicationRejected(Exception):
+    """Base class for apply-time conflicts, carrying a user-facing message."""
+
+
+class AlreadyApplied(ApplicationRejected):
+    pass
+
+
+class ApplicationLimitReached(ApplicationRejected):
+    pass
+
+
+def student_lock(student_id):
+    """The process-local fallback for backends without row locks; a no-op elsewhere."""
+    if connection.features.has_select_for_update:
+        return nullcontext()
+    return _LOCKS[student_id % len(_LOCKS)]
+
+
+def _lock_student(student_id, course_id):
+    """Lock the student row and return ``(active_count, already_applied)`` in one round trip."""
+    applications = Application.objects.filter(student=OuterRef('pk')).order_by()
+    active = applications.filter(status__in=PENDING_STATUSES).values('student').annotate(count=Count('pk')).values('count')
+    return (
+        User.objects.select_for_update()
+        .filter(pk=student_id)
+        .annotate(
+            active_count=Coalesce(Subquery(active), 0),
+            already_applied=Exists(applications.filter(course_id=course_id)),
+        )
+        .values_list('active_count', 'already_applied')
+        .get()
+    )
+
+
+def create_application(student, application, limit=MAX_ACTIVE_APPLICATIONS):
+    """Save the unsaved ``application`` for ``student`` if the duplicate and limit checks pass.
+
+    Raises ``AlreadyApplied`` or ``ApplicationLimitReached``; nothing is
+    written in either case.
+    """
+    application.student = student
+    if not application.application_number:
+        # Outside the apply transaction, where the allocator may reserve a whole block
+        application.application_number = application_numbers.next_number()
+    with student_lock(student.pk), transaction.atomic():
+        active_count, already_applied = _lock_student(student.pk, application.course_id)
+        if already_applied:
+            raise AlreadyApplied('❌ You have already applied to this course')
+        if active_count >= limit:
+            raise ApplicationLimitReached(
+                f'❌ You already have {active_count} active applications. Maximum limit is {limit}.'
+            )
+        try:
+            with transaction.atomic():
+                application.save()
+        except IntegrityError:
+            # Only reachable if the student row lock was bypassed (e.g. an admin insert)
+            raise AlreadyApplied('❌ You have already applied to this course')
+    return application
@@ -0,0 +1,106 @@
+"""Async versions of the dashboard and listing views, for ASGI deployments.
+
+Each view runs the same independent queries as its sync twin in
+``admissions.views``, but all at once (``arun_queries``), so a page costs
+roughly its slowest query instead of the sum of them. Rendering happens
+in the thread-sensitive executor like any sync code. ``admissions.urls``
+routes to these views when ``ADMISSIONS_ASYNC_VIEWS`` is enabled.
+
+``application_status_stream`` has no sync twin: it holds the connection
+open to push status changes (see ``admissions.live``) and is always
+routed here.
+"""
+import random
+import types
+
+from asgiref.sync import sync_to_async
+from django.contrib import admin
+from django.contrib.auth.decorators import login_required
+from django.http import StreamingHttpResponse
+from django.shortcuts import render
+from django.urls import include, path
+
+from . import views
+from .concurrency import arun_queries
+from .decorators import admin_required_with_login, officer_required_with_login, student_required
+from .live import STREAM_MAX_AGE, parse_since, status_events
+
+
+@login_required
+@student_required
+async def dashboard_student(request):
+    """Student dashboard"""
+    results = await arun_queries(views.student_dashboard_queries(request))
+    return await sync_to_async(render)(
+        request, 'admissions/dashboard_student.html', views.student_dashboard_context(results)
+    )
+
+
+@login_required
+@student_required
+async def application_status_stream(request):
+    """Server-Sent Events: status changes of the student's applications as officers review them"""
+    since = parse_since(request.headers.get('Last-Event-ID') or request.GET.get('since'))
+    try:
+        max_age = min(max(int(request.GET['max_age']), 0), STREAM_MAX_AGE)
+    except (KeyError, ValueError):
+        # Spread the reconnects of streams opened together (e.g. after a deploy)
+        max_age = STREAM_MAX_AGE * random.uniform(0.75, 1)
+    response = StreamingHttpResponse(status_events(request.user.pk, since, max_age), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Stop nginx buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@login_required
+@officer_required_with_login
+async def dashboard_officer(request):
+    """Admission officer dashboard"""
+    results = await arun_queries(views.officer_dashboard_queries(request))
+    return await sync_to_async(render)(
+        request, 'admissions/dashboard_officer.html', views.officer_dashboard_context(results)
+    )
+
+
+@login_required
+@officer_required_with_login
+async def manage_applications(request):
+    """View and filter applications - PENDING FIRST!"""
+    queries, state = views.application_queue_queries(request)
+    results = await arun_queries(queries)
+    return await sync_to_async(render)(
+        request, 'admissions/applications.html', views.application_queue_context(request, results, state)
+    )
+
+
+@login_required
+@admin_required_with_login
+async def manage_seats(request):
+    """Manage seat allocations - ADMIN ONLY"""
+    results = await arun_queries(views.seat_overview_queries(request))
+    return await sync_to_async(render)(
+        request, 'admissions/manage_seats.html', views.seat_overview_context(results)
+    )
+
+
+ROUTES = ['dashboard_student', 'dashboard_officer', 'manage_applications', 'manage_seats']
+
+
+def async_urlconf():
+    """The project URLconf with these views swapped in, whatever ``ADMISSIONS_ASYNC_VIEWS`` says.
+
+    For benchmarks and tests: ``override_settings(ROOT_URLCONF=async_urlconf())``.
+    """
+    from . import urls  # urls imports this module
+
+    patterns = [
+        path(str(pattern.pattern), globals()[pattern.name], name=pattern.name) if pattern.name in ROUTES else pattern
+        for pattern in urls.urlpatterns
+    ]
+    module = types.ModuleType('admissions_async_urlconf')
+    module.urlpatterns = [
+        path('backstage/', admin.site.urls),
+        path('', include(patterns)),
+    ]
+    return module
@@ -0,0 +1,215 @@
+"""Course catalog version stamp, catalog snapshot and cached catalog pages.
+
+Anything derived from the course table (the catalog snapshot, cached
+course pages) is keyed on ``catalog_version()``. The stamp lives in the
+cache and ``bump_catalog_version()`` replaces it whenever a course or its
+seat counts change (see ``admissions.signals`` and the seat write paths),
+so stale derived data is simply never looked up again. The search index
+only reads the searchable text, so it is keyed on ``search_version()``,
+which seat changes (``seats_only=True``) leave alone.
+"""
+import hashlib
+import threading
+import uuid
+from dataclasses import dataclass
+from functools import cached_property, partial
+from types import MappingProxyType
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import Course
+
+
+VERSION_KEY = 'admissions:catalog:version'
+SEARCH_VERSION_KEY = 'admissions:catalog:search_version'
+MODIFIED_KEY = 'admissions:catalog:modified:{}'
+PAGE_KEY = 'admissions:catalog:page:{}:{}'
+STATS_KEY = 'admissions:catalog:stats:{}'
+
+PAGE_TIMEOUT = 60 * 60
+
+
+def _stamp(key):
+    version = cache.get(key)
+    if version is None:
+        # A missing stamp (cold cache or eviction) starts a new version rather than reusing an old one.
+        cache.add(key, uuid.uuid4().hex, None)
+        version = cache.get(key)
+    return version
+
+
+def catalog_version():
+    return _stamp(VERSION_KEY)
+
+
+def search_version():
+    """Changes only when searchable course text may have changed, not on seat counts."""
+    return _stamp(SEARCH_VERSION_KEY)
+
+
+def _set_new_version(seats_only=False):
+    version = uuid.uuid4().hex
+    cache.set(MODIFIED_KEY.format(version), timezone.now(), None)
+    cache.set(VERSION_KEY, version, None)
+    if not seats_only:
+        cache.set(SEARCH_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def bump_catalog_version(seats_only=False):
+    """Invalidate everything derived from the catalog.
+
+    ``seats_only`` keeps the search index, for writes that only move
+    seat counts. Inside a transaction the stamp is bumped again on commit,
+    so a page rendered from the old rows in between is not kept under the
+    new stamp.
+    """
+    _set_new_version(seats_only)
+    if connection.in_atomic_block:
+        transaction.on_commit(partial(_set_new_version, seats_only))
+
+
+@dataclass(frozen=True, slots=True)
+class CourseRecord:
+    """The columns of a course the student-facing pages show."""
+    id: int
+    code: str
+    name: str
+    department: str
+    duration: int
+    course_type: str
+    total_seats: int
+    filled_seats: int
+    min_percentage: float
+    fee_per_year: object
+
+    COLUMNS = ('id', 'code', 'name', 'department', 'duration', 'course_type',
+               'total_seats', 'filled_seats', 'min_percentage', 'fee_per_year')
+
+    @property
+    def pk(self):
+        return self.id
+
+    @property
+    def available_seats(self):
+        return self.total_seats - self.filled_seats
+
+    @property
+    def seat_percentage(self):
+        if self.total_seats == 0:
+            return 0
+        return (self.filled_seats / self.total_seats) * 100
+
+    def as_course(self):
+        """A ``Course`` carrying these columns, as if loaded with ``only()``, for foreign keys and forms."""
+        # from_db() expects the loaded columns in model field order
+        columns = [f.attname for f in Course._meta.concrete_fields if f.attname in self.COLUMNS]
+        return Course.from_db(DEFAULT_DB_ALIAS, columns, [getattr(self, column) for column in columns])
+
+    def get_course_type_display(self):
+        return COURSE_TYPE_LABELS.get(self.course_type, self.course_type)
+
+    def __str__(self):
+        return f"{self.code} - {self.name}"
+
+
+COURSE_TYPE_LABELS = dict(Course.COURSE_TYPES)
+
+
+class CatalogSnapshot:
+    """Every course as a ``CourseRecord``, read in one query and never changed afterwards."""
+
+    def __init__(self, rows, version=None):
+        self.version = version
+        self.courses = tuple(CourseRecord(*row) for row in rows)  # by code, like Course.Meta.ordering
+        self.by_department = tuple(sorted(self.courses, key=lambda c: (c.department, c.code)))
+        self.by_id = MappingProxyType({course.id: course for course in self.courses})
+        # Widgets rendered from this version (see forms.CourseSelect)
+        self.rendered = {}
+
+    @classmethod
+    def build(cls, version=None):
+        return cls(Course.objects.order_by('code').values_list(*CourseRecord.COLUMNS), version)
+
+    def get(self, course_id):
+        return self.by_id.get(course_id)
+
+    @cached_property
+    def choices(self):
+        """``(id, "CODE - Name")`` pairs for course dropdowns."""
+        return tuple((course.id, str(course)) for course in self.courses)
+
+    def __contains__(self, course_id):
+        return course_id in self.by_id
+
+    def __iter__(self):
+        return iter(self.courses)
+
+    def __getitem__(self, index):
+        # Indexes and slices like the course tuple, so |slice and |first work in templates
+        return self.courses[index]
+
+    def __len__(self):
+        return len(self.courses)
+
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+
+def catalog_snapshot():
+    """The process-local snapshot for the current catalog version, rebuilt on first use after a change."""
+    global _snapshot
+    version = catalog_version()
+    snapshot = _snapshot
+    if snapshot is None or snapshot.version != version:
+        with _snapshot_lock:
+            if _snapshot is None or _snapshot.version != version:
+                _snapshot = CatalogSnapshot.build(version)
+            snapshot = _snapshot
+    return snapshot
+
+
+def catalog_last_modified():
+    """When the catalog last changed, from ``Course.updated_at`` or the last bump."""
+    key = MODIFIED_KEY.format(catalog_version())
+    modified = cache.get(key)
+    if modified is None:
+        modified = Course.objects.aggregate(latest=Max('updated_at'))['latest']
+        if modified is not None:
+            cache.add(key, modified, None)
+    return modified
+
+
+def page_cache_key(name, *parts):
+    digest = hashlib.md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+    return PAGE_KEY.format(name, f'{catalog_version()}:{digest}')
+
+
+def catalog_etag(*parts):
+    return hashlib.md5(repr((catalog_version(),) + parts).encode(), usedforsecurity=False).hexdigest()
+
+
+def record_page_cache(hit):
+    """Count a page cache hit or miss; totals are shared by every worker using this cache."""
+    key = STATS_KEY.format('hits' if hit else 'misses')
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Evicted between add() and incr(); losing one sample is fine.
+        pass
+
+
+def page_cache_stats():
+    found = cache.get_many([STATS_KEY.format('hits'), STATS_KEY.format('misses')])
+    hits = found.get(STATS_KEY.format('hits'), 0)
+    misses = found.get(STATS_KEY.format('misses'), 0)
+    total = hits + misses
+    return {'hits': hits, 'misses': misses, 'ratio': hits / total if total else 0.0}
+
+
+def reset_page_cache_stats():
+    cache.delete_many([STATS_KEY.format('hits'), STATS_KEY.format('misses')])
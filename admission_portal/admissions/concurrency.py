@@ -0,0 +1,39 @@
+"""Run a view's independent queries one after another, or all at once.
+
+Views describe their independent queries as ``{name: callable}``.
+``run_queries`` calls them in turn for the sync views. ``arun_queries``
+is for the async views: Django's async ORM methods (``acount``,
+``aget``...) all queue on the one thread-sensitive executor, so they
+never overlap. Here each callable gets its own worker thread, and so its
+own database connection, and the queries run concurrently.
+
+Worker threads keep their connections between requests for up to
+``CONN_MAX_AGE`` seconds, so with an ASGI server set ``DB_CONN_MAX_AGE``
+and allow for up to one connection per executor thread per process.
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+
+
+def run_queries(queries):
+    """``{name: result}`` of calling every query in turn."""
+    return {name: query() for name, query in queries.items()}
+
+
+def _in_worker(query):
+    def run():
+        # What the request cycle does for request threads: drop connections past CONN_MAX_AGE
+        close_old_connections()
+        try:
+            return query()
+        finally:
+            close_old_connections()
+    return sync_to_async(run, thread_sensitive=False)
+
+
+async def arun_queries(queries):
+    """``{name: result}`` of running every query concurrently, each in its own thread."""
+    results = await asyncio.gather(*(_in_worker(query)() for query in queries.values()))
+    return dict(zip(queries, results))
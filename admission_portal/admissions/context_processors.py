@@ -0,0 +1,10 @@
+from .roles import get_roles, OFFICER, STUDENT
+
+
+def user_roles(request):
+    """Expose the cached role flags so templates don't query user.groups"""
+    roles = get_roles(request)
+    return {
+        'user_is_officer': OFFICER in roles,
+        'user_is_student': STUDENT in roles,
+    }
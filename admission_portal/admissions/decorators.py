@@ -2,46 +2,62 @@ from django.contrib.auth.decorators import login_required
 from django.shortcuts import redirect
 from django.contrib import messages
 from functools import wraps
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from .roles import is_officer, is_student
 
-def student_required(view_func):
-    @wraps(view_func)
-    @login_required  
-    def _wrapped_view(request, *args, **kwargs):
-        if not request.user.groups.filter(name='Students').exists():
-            if request.user.groups.filter(name='Admission Officers').exists():
-                messages.error(request, '⛔ This page is for students only.')
-                return redirect('dashboard_officer')
-            else:
-                messages.error(request, '⛔ Please register as a student first.')
-                return redirect('register')
-        return view_func(request, *args, **kwargs)
-    return _wrapped_view
+def _role_check(check):
+    """Turn ``check(request)`` (a redirect when access is denied, else None) into a view decorator.
 
-def officer_required_with_login(view_func):
-    @wraps(view_func)
-    @login_required  
-    def _wrapped_view(request, *args, **kwargs):
-        if not request.user.groups.filter(name='Admission Officers').exists():
-            if request.user.groups.filter(name='Students').exists():
-                messages.error(request, '⛔ Access denied. This page is for officers only.')
-                return redirect('dashboard_student')
-            else:
-                messages.error(request, '⛔ Access denied. Officer privileges required.')
-                return redirect('home')
-        return view_func(request, *args, **kwargs)
-    return _wrapped_view
+    Works for sync and async views; for async views the check (session,
+    cache and group lookups) runs in a thread.
+    """
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            @login_required
+            async def _wrapped_view(request, *args, **kwargs):
+                denied = await sync_to_async(check)(request)
+                if denied is not None:
+                    return denied
+                return await view_func(request, *args, **kwargs)
+        else:
+            @wraps(view_func)
+            @login_required
+            def _wrapped_view(request, *args, **kwargs):
+                denied = check(request)
+                if denied is not None:
+                    return denied
+                return view_func(request, *args, **kwargs)
+        return _wrapped_view
+    return decorator
 
-def admin_required_with_login(view_func):
-    @wraps(view_func)
-    @login_required 
-    def _wrapped_view(request, *args, **kwargs):
-        if not request.user.is_superuser:
-            messages.error(request, '⛔ Access denied. Administrator privileges required.')
-            if request.user.groups.filter(name='Admission Officers').exists():
-                return redirect('dashboard_officer')
-            elif request.user.groups.filter(name='Students').exists():
-                return redirect('dashboard_student')
-            else:
-                return redirect('home')
-        return view_func(request, *args, **kwargs)
-    return _wrapped_view
\ No newline at end of file
+@_role_check
+def student_required(request):
+    if not is_student(request):
+        if is_officer(request):
+            messages.error(request, '⛔ This page is for students only.')
+            return redirect('dashboard_officer')
+        else:
+            messages.error(request, '⛔ Please register as a student first.')
+            return redirect('register')
+
+@_role_check
+def officer_required_with_login(request):
+    if not is_officer(request):
+        if is_student(request):
+            messages.error(request, '⛔ Access denied. This page is for officers only.')
+            return redirect('dashboard_student')
+        else:
+            messages.error(request, '⛔ Access denied. Officer privileges required.')
+            return redirect('home')
+
+@_role_check
+def admin_required_with_login(request):
+    if not request.user.is_superuser:
+        messages.error(request, '⛔ Access denied. Administrator privileges required.')
+        if is_officer(request):
+            return redirect('dashboard_officer')
+        elif is_student(request):
+            return redirect('dashboard_student')
+        else:
+            return redirect('home')
@@ -0,0 +1,89 @@
+"""Eligibility of applications against their course's cutoff.
+
+New applications are checked one at a time with ``check_eligibility``.
+When a course's ``min_percentage`` changes, ``reevaluate_course`` brings
+its open applications up to date in the database with one counting query
+and two set-based UPDATEs (one per side of the cutoff), so no rows are
+loaded into Python however many there are. Every run is recorded as an
+``EligibilityAudit`` with how many applications changed each way.
+"""
+from django.db import transaction
+from django.db.models import CharField, Count, DecimalField, Func, Q, TextField, Value
+from django.db.models.functions import Cast, Concat
+
+from .models import Application, Course, EligibilityAudit
+
+
+# Decided applications keep the eligibility they were decided on
+OPEN_STATUSES = ['DRAFT', 'SUBMITTED', 'UNDER_REVIEW', 'SHORTLISTED']
+
+
+def check_eligibility(percentage, min_percentage):
+    """``(is_eligible, eligibility_notes)`` for one application."""
+    if percentage >= min_percentage:
+        return True, f"✅ Eligible: {percentage:.2f}% >= {min_percentage}%"
+    return False, f"❌ Not Eligible: {percentage:.2f}% < {min_percentage}%"
+
+
+class _TwoPlaces(Func):
+    """A percentage as text with two decimals, the way ``f'{percentage:.2f}'`` writes it."""
+    output_field = CharField()
+
+    def as_sql(self, compiler, connection, **extra_context):
+        percentage = Cast(self.get_source_expressions()[0], DecimalField(max_digits=5, decimal_places=2))
+        return compiler.compile(Cast(percentage, CharField()))
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        # SQLite casts 65.00 to NUMERIC as the integer 65
+        return compiler.compile(Func(Value('%.2f'), *self.get_source_expressions(), function='printf'))
+
+
+def _notes(eligible, min_percentage):
+    """``check_eligibility``'s notes as an SQL expression over ``percentage_obtained``."""
+    prefix, comparison = ('✅ Eligible: ', '>=') if eligible else ('❌ Not Eligible: ', '<')
+    return Concat(
+        Value(prefix),
+        _TwoPlaces('percentage_obtained'),
+        Value(f'% {comparison} {min_percentage}%'),
+        output_field=TextField(),
+    )
+
+
+def reevaluate_course(course, previous_min_percentage=None, changed_by=None):
+    """Re-check the open applications for ``course`` against its current cutoff.
+
+    Returns the ``EligibilityAudit`` recording the run.
+    """
+    min_percentage = course.min_percentage
+    with transaction.atomic():
+        applications = Application.objects.filter(course_id=course.pk, status__in=OPEN_STATUSES)
+        counts = applications.aggregate(
+            reevaluated=Count('id'),
+            became_eligible=Count('id', filter=Q(percentage_obtained__gte=min_percentage, is_eligible=False)),
+            became_ineligible=Count('id', filter=Q(percentage_obtained__lt=min_percentage, is_eligible=True)),
+        )
+        # Notes are rewritten on both sides too, so none still quotes the old cutoff
+        applications.filter(percentage_obtained__gte=min_percentage).update(
+            is_eligible=True, eligibility_notes=_notes(True, min_percentage),
+        )
+        applications.filter(percentage_obtained__lt=min_percentage).update(
+            is_eligible=False, eligibility_notes=_notes(False, min_percentage),
+        )
+        return EligibilityAudit.objects.create(
+            course=course,
+            previous_min_percentage=previous_min_percentage,
+            min_percentage=min_percentage,
+            changed_by=changed_by,
+            **counts,
+        )
+
+
+def reevaluate_courses(courses=None, changed_by=None):
+    """``reevaluate_course`` for each of ``courses`` (all courses when ``None``); returns the audits."""
+    course_qs = Course.objects.only('code', 'min_percentage').order_by('code')
+    if courses is not None:
+        course_qs = course_qs.filter(pk__in=[getattr(c, 'pk', c) for c in courses])
+    return [
+        reevaluate_course(course, previous_min_percentage=course.min_percentage, changed_by=changed_by)
+        for course in course_qs
+    ]
@@ -0,0 +1,187 @@
+"""Streaming export of the officer application queue.
+
+``export_rows`` applies the same filters as ``manage_applications`` and
+reads the rows in keyset batches with their student, course and reviewer
+joined, so an export of any size holds only one batch in memory. The CSV
+and XLSX writers are generators of chunks that can be handed
+straight to ``StreamingHttpResponse`` or written to a file.
+"""
+import csv
+import re
+import zipfile
+from datetime import date, datetime
+from xml.sax.saxutils import escape
+
+from django.utils import timezone
+
+from .models import Application
+from .pagination import iterate_in_key_order
+
+
+COLUMNS = [
+    ('Application Number', 'application_number'),
+    ('Username', 'student__username'),
+    ('First Name', 'student__first_name'),
+    ('Last Name', 'student__last_name'),
+    ('Email', 'student__email'),
+    ('Course Code', 'course__code'),
+    ('Course Name', 'course__name'),
+    ('Department', 'course__department'),
+    ('Status', 'status'),
+    ('Percentage', 'percentage_obtained'),
+    ('Eligible', 'is_eligible'),
+    ('Previous School', 'previous_school'),
+    ('Qualification', 'previous_qualification'),
+    ('Year of Passing', 'year_of_passing'),
+    ('Date of Birth', 'date_of_birth'),
+    ('Phone', 'phone'),
+    ('Submitted', 'submission_date'),
+    ('Reviewed By', 'reviewed_by__username'),
+    ('Review Date', 'review_date'),
+    ('Seat Allocated', 'seat_allocation__allocation_date'),
+]
+
+BATCH_SIZE = 2000
+
+STATUS_LABELS = dict(Application.APPLICATION_STATUS)
+STATUS_INDEX = [lookup for _, lookup in COLUMNS].index('status')
+
+# Cells starting with these are run as formulas by spreadsheet programs.
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+XML_ILLEGAL = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+def export_rows(params):
+    """Tuples of plain values for every application matching ``params``."""
+    queryset = Application.objects.matching_filters(params)
+    for row in iterate_in_key_order(queryset, [lookup for _, lookup in COLUMNS], BATCH_SIZE):
+        row = list(row)
+        row[STATUS_INDEX] = STATUS_LABELS.get(row[STATUS_INDEX], row[STATUS_INDEX])
+        yield [_plain(value) for value in row]
+
+
+def _plain(value):
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'Yes' if value else 'No'
+    if isinstance(value, datetime):
+        return timezone.localtime(value).isoformat(sep=' ', timespec='seconds')
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def _text(value):
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+class Echo:
+    """File-like object whose write() hands the written value back."""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(rows):
+    writer = csv.writer(Echo())
+    yield '\ufeff'  # BOM so Excel detects UTF-8
+    yield writer.writerow([header for header, _ in COLUMNS])
+    for row in rows:
+        yield writer.writerow([_text(value) for value in row])
+
+
+class ZipStream:
+    """Write-only buffer a ``ZipFile`` streams into; ``drain()`` takes what's written so far."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+XLSX_PARTS = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Target="xl/workbook.xml" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+        '</Relationships>'
+    ),
+    'xl/workbook.xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Applications" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Target="worksheets/sheet1.xml" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"/>'
+        '</Relationships>'
+    ),
+}
+
+
+def _xlsx_row(values):
+    cells = []
+    for value in values:
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            cells.append(f'<c><v>{value}</v></c>')
+        else:
+            text = escape(XML_ILLEGAL.sub('', str(value)))
+            cells.append(f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>')
+    return f'<row>{"".join(cells)}</row>'
+
+
+def stream_xlsx(rows, flush_every=500):
+    """A single-sheet workbook of ``rows``, zipped on the fly."""
+    buffer = ZipStream()
+    with zipfile.ZipFile(buffer, mode='w', compression=zipfile.ZIP_DEFLATED) as workbook:
+        for name, content in XLSX_PARTS.items():
+            workbook.writestr(name, content)
+        yield buffer.drain()
+
+        with workbook.open('xl/worksheets/sheet1.xml', mode='w', force_zip64=True) as sheet:
+            sheet.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+            )
+            sheet.write(_xlsx_row([header for header, _ in COLUMNS]).encode())
+            for number, row in enumerate(rows, 1):
+                sheet.write(_xlsx_row(row).encode())
+                if number % flush_every == 0:
+                    yield buffer.drain()
+            sheet.write(b'</sheetData></worksheet>')
+    yield buffer.drain()
+
+
+FORMATS = {
+    'csv': (stream_csv, 'text/csv; charset=utf-8'),
+    'xlsx': (stream_xlsx, 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+}
@@ -2,10 +2,74 @@ from django import forms
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.models import User
 from .models import Application, Course
+from .catalog import catalog_snapshot
+from .reviews import ACTIONS as BULK_REVIEW_ACTIONS
+from .eligibility import reevaluate_course
+from .waitlist import promote_waitlist
+from .search import search_courses, tokenize
 from django.core.exceptions import ValidationError
+from django.db import transaction
 from datetime import date
 from django.utils import timezone
 
+
+# Field rules shared by the forms below and the CSV importer (admissions.importing)
+
+def validate_percentage(percentage):
+    if percentage < 0 or percentage > 100:
+        raise ValidationError("Percentage must be between 0 and 100")
+    return percentage
+
+
+def validate_year_of_passing(year, current_year=None):
+    current_year = current_year or timezone.now().year
+    if year < 1900 or year > current_year:
+        raise ValidationError(f"Year must be between 1900 and {current_year}")
+    return year
+
+
+def validate_date_of_birth(dob, today=None):
+    today = today or date.today()
+
+    if dob > today:
+        raise ValidationError("Date of birth cannot be in the future.")
+
+    age = today.year - dob.year - (
+        (today.month, today.day) < (dob.month, dob.day)
+    )
+
+    if age < 16:
+        raise ValidationError("You must be at least 16 years old to apply.")
+
+    return dob
+
+
+def validate_phone(phone, label='Phone number'):
+    if not phone.isdigit():
+        raise ValidationError(f"{label} must contain only digits.")
+
+    if len(phone) != 10:
+        raise ValidationError(f"{label} must be exactly 10 digits.")
+
+    return phone
+
+
+def normalize_course_code(code):
+    return code.upper()
+
+
+def validate_min_percentage(percentage):
+    if percentage < 0 or percentage > 100:
+        raise ValidationError("Minimum percentage must be between 0 and 100.")
+    return percentage
+
+
+def validate_fee(fee):
+    if fee <= 0:
+        raise ValidationError("Fee must be greater than 0.")
+    return fee
+
+
 class UserRegistrationForm(UserCreationForm):
     email = forms.EmailField(required=True)
     first_name = forms.CharField(max_length=30, required=True)
@@ -24,7 +88,61 @@ class UserRegistrationForm(UserCreationForm):
             user.save()
         return user
 
+class CourseSelect(forms.Select):
+    """A course dropdown rendered once per catalog version and selection, then reused"""
+    empty_label = None  # set by CourseChoiceField; part of the cache key
+
+    def render(self, name, value, attrs=None, renderer=None):
+        snapshot = catalog_snapshot()
+        selected = str(value or '')
+        if selected and not (selected.isdigit() and int(selected) in snapshot):
+            # Only real selections are memoized, so junk query strings can't grow the cache
+            return super().render(name, value, attrs, renderer)
+        key = (name, selected, tuple(sorted(self.build_attrs(self.attrs, attrs).items())), self.empty_label)
+        html = snapshot.rendered.get(key)
+        if html is None:
+            html = snapshot.rendered[key] = super().render(name, value, attrs, renderer)
+        return html
+
+
+class CourseChoiceField(forms.ChoiceField):
+    """Course picker backed by the catalog snapshot: no query to render or to validate.
+
+    Cleans to a ``Course`` (see ``CourseRecord.as_course``) so it can stand
+    in for a ModelForm foreign key.
+    """
+    widget = CourseSelect
+
+    def __init__(self, *, empty_label='---------', **kwargs):
+        self.empty_label = empty_label
+        super().__init__(choices=self.snapshot_choices, **kwargs)
+        self.widget.empty_label = empty_label
+
+    def snapshot_choices(self):
+        return [('', self.empty_label), *catalog_snapshot().choices]
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        try:
+            record = catalog_snapshot().get(int(value))
+        except (TypeError, ValueError):
+            record = None
+        if record is None:
+            raise ValidationError(self.error_messages['invalid_choice'], code='invalid_choice', params={'value': value})
+        return record.as_course()
+
+    def validate(self, value):
+        # to_python already looked the id up; skip ChoiceField's scan of every choice
+        forms.Field.validate(self, value)
+
+    def has_changed(self, initial, data):
+        return str(getattr(initial, 'pk', initial) or '') != str(data or '')
+
+
 class ApplicationForm(forms.ModelForm):
+    course = CourseChoiceField(empty_label='-- Choose a course --')
+
     class Meta:
         model = Application
         fields =[
@@ -47,65 +165,27 @@ class ApplicationForm(forms.ModelForm):
             ('12th', '12th Standard'),
             ('Diploma', 'Diploma'),
             ]
+
+    def _get_validation_exclusions(self):
+        exclude = super()._get_validation_exclusions()
+        # CourseChoiceField already checked the id against the catalog snapshot; skip the FK lookup
+        exclude.add('course')
+        return exclude
     
     def clean_percentage_obtained(self):
-        percentage = self.cleaned_data['percentage_obtained']
-        if percentage < 0 or percentage > 100:
-            raise ValidationError("Percentage must be between 0 and 100")
-        return percentage
+        return validate_percentage(self.cleaned_data['percentage_obtained'])
     
     def clean_year_of_passing(self):
-        year = self.cleaned_data['year_of_passing']
-        current_year = timezone.now().year
-        if year < 1900 or year > current_year:
-            raise ValidationError(f"Year must be between 1900 and {current_year}")
-        return year
+        return validate_year_of_passing(self.cleaned_data['year_of_passing'])
 
     def clean_date_of_birth(self):
-        dob = self.cleaned_data.get('date_of_birth')
-        today = date.today()
-
-        if dob > today:
-            raise forms.ValidationError("Date of birth cannot be in the future.")
-
-        age = today.year - dob.year - (
-            (today.month, today.day) < (dob.month, dob.day)
-        )
-
-        if age < 16:
-            raise forms.ValidationError("You must be at least 16 years old to apply.")
-
-        return dob
+        return validate_date_of_birth(self.cleaned_data.get('date_of_birth'))
 
     def clean_phone(self):
-        phone = self.cleaned_data.get('phone')
-
-        if not phone.isdigit():
-            raise forms.ValidationError(
-                "Phone number must contain only digits."
-            )
-
-        if len(phone) != 10:
-            raise forms.ValidationError(
-                "Phone number must be exactly 10 digits."
-            )
-
-        return phone
+        return validate_phone(self.cleaned_data.get('phone'))
 
     def clean_emergency_contact(self):
-        contact = self.cleaned_data.get('emergency_contact')
-
-        if not contact.isdigit():
-            raise forms.ValidationError(
-                "Emergency contact must contain only digits."
-            )
-
-        if len(contact) != 10:
-            raise forms.ValidationError(
-                "Emergency contact must be exactly 10 digits."
-            )
-
-        return contact
+        return validate_phone(self.cleaned_data.get('emergency_contact'), label='Emergency contact')
 
 class ReviewApplicationForm(forms.ModelForm):
     class Meta:
@@ -117,16 +197,56 @@ class ReviewApplicationForm(forms.ModelForm):
         }
 
 class CourseSearchForm(forms.Form):
-    name = forms.CharField(required=False, widget=forms.TextInput(attrs={'placeholder': 'Course name...'}))
-    department = forms.CharField(required=False, widget=forms.TextInput(attrs={'placeholder': 'Department...'}))
+    q = forms.CharField(required=False, max_length=200, widget=forms.TextInput(attrs={'placeholder': 'Keywords...'}))
+    name = forms.CharField(required=False, max_length=200, widget=forms.TextInput(attrs={'placeholder': 'Course name...'}))
+    department = forms.CharField(required=False, max_length=100, widget=forms.TextInput(attrs={'placeholder': 'Department...'}))
     course_type = forms.ChoiceField(required=False, choices=[('', 'All Types')] + Course.COURSE_TYPES)
 
+    def search(self, queryset):
+        """Apply the search to ``queryset``; an empty or invalid form leaves it unchanged"""
+        if not self.is_valid():
+            return queryset
+        return search_courses(queryset, **self.cleaned_data)
+
+    def normalized_params(self):
+        """Non-empty search parameters in canonical form, for cache keys and page links"""
+        if not self.is_valid():
+            return {}
+        params = {}
+        for field in ('q', 'name', 'department'):
+            words = tokenize(self.cleaned_data.get(field))
+            if words:
+                params[field] = ' '.join(words)
+        if self.cleaned_data.get('course_type'):
+            params['course_type'] = self.cleaned_data['course_type']
+        return params
+
 class ApplicationFilterForm(forms.Form):
     status = forms.ChoiceField(required=False, choices=[('', 'All Status')] + Application.APPLICATION_STATUS)
-    course = forms.ModelChoiceField(required=False, queryset=Course.objects.all(), empty_label="All Courses")
+    course = CourseChoiceField(required=False, empty_label='All Courses', widget=CourseSelect(attrs={'class': 'form-control'}))
     date_from = forms.DateField(required=False, widget=forms.DateInput(attrs={'type': 'date'}))
     date_to = forms.DateField(required=False, widget=forms.DateInput(attrs={'type': 'date'}))
 
+class BulkReviewForm(forms.Form):
+    action = forms.ChoiceField(
+        choices=[(key, label) for key, (label, _, _) in BULK_REVIEW_ACTIONS.items()],
+        widget=forms.Select(attrs={'class': 'form-control'}),
+    )
+    applications = forms.TypedMultipleChoiceField(required=False, coerce=int)
+    select_all = forms.BooleanField(required=False)
+    review_notes = forms.CharField(required=False, max_length=2000, widget=forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Review notes (optional)'}))
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Any id is accepted here; the filtered queryset decides what is reviewed
+        self.fields['applications'].valid_value = lambda value: str(value).isdigit()
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if not cleaned_data.get('select_all') and not cleaned_data.get('applications'):
+            raise ValidationError('Select at least one application.')
+        return cleaned_data
+
 class CourseForm(forms.ModelForm):
     class Meta:
         model = Course
@@ -140,18 +260,41 @@ class CourseForm(forms.ModelForm):
             'eligibility_criteria': forms.Textarea(attrs={'rows': 3}),
         }
     
+    def __init__(self, *args, changed_by=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.changed_by = changed_by
+        self.eligibility_audit = None
+        self.promotion = None
+
+    def save(self, commit=True):
+        # A new cutoff re-evaluates the course's open applications with it
+        editing = commit and self.instance.pk is not None
+        cutoff_changed = editing and 'min_percentage' in self.changed_data
+        seats_added = editing and self.cleaned_data['total_seats'] > (self.initial.get('total_seats') or 0)
+        with transaction.atomic():
+            if editing:
+                # Only the form's columns: filled_seats belongs to concurrent reservations and promotions
+                course = super().save(commit=False)
+                course.save(update_fields=[*self._meta.fields, 'updated_at'])
+                self._save_m2m()
+            else:
+                course = super().save(commit=commit)
+            if cutoff_changed:
+                self.eligibility_audit = reevaluate_course(
+                    course,
+                    previous_min_percentage=self.initial.get('min_percentage'),
+                    changed_by=self.changed_by,
+                )
+            if seats_added:
+                # New seats go to the head of the waitlist
+                self.promotion = promote_waitlist([course], allocated_by=self.changed_by)
+        return course
+
     def clean_code(self):
-        code = self.cleaned_data['code']
-        return code.upper()
+        return normalize_course_code(self.cleaned_data['code'])
     
     def clean_min_percentage(self):
-        percentage = self.cleaned_data.get('min_percentage')
-        if percentage < 0 or percentage > 100:
-            raise forms.ValidationError("Minimum percentage must be between 0 and 100.")
-        return percentage
+        return validate_min_percentage(self.cleaned_data.get('min_percentage'))
     
     def clean_fee_per_year(self):
-        fee = self.cleaned_data.get('fee_per_year')
-        if fee <= 0:
-            raise forms.ValidationError("Fee must be greater than 0.")
-        return fee
+        return validate_fee(self.cleaned_data.get('fee_per_year'))
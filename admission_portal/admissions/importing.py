@@ -0,0 +1,364 @@
+"""Bulk CSV import of courses and applications.
+
+Rows are streamed from the CSV and validated with the same field rules
+as ``CourseForm`` and ``ApplicationForm`` (the validators in
+``admissions.forms``), a batch at a time: everything a row needs from the
+database (existing course codes, students, earlier applications) is
+fetched once per batch instead of once per row. Imported pending
+applications count towards the same active-application limit as
+``create_application``, with the file's earlier rows included. Valid rows are inserted
+with ``bulk_create``, one transaction per batch; invalid rows are skipped
+and reported by line number.
+"""
+import csv
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group, User
+from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from . import forms
+from .applying import MAX_ACTIVE_APPLICATIONS
+from .catalog import bump_catalog_version
+from .eligibility import check_eligibility
+from .models import PENDING_STATUSES, Application, Course
+from .numbering import assign_application_numbers
+from .roles import STUDENT
+from .stats import adjust_status_counts
+
+
+BATCH_SIZE = 1000
+DATE_FORMATS = ['%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y']
+
+COURSE_COLUMNS = [
+    'code', 'name', 'department', 'description', 'duration', 'course_type',
+    'total_seats', 'min_percentage', 'fee_per_year', 'eligibility_criteria',
+]
+APPLICATION_COLUMNS = [
+    'username', 'course_code', 'previous_school', 'previous_qualification', 'percentage_obtained',
+    'year_of_passing', 'date_of_birth', 'address', 'phone', 'emergency_contact',
+]
+OPTIONAL_APPLICATION_COLUMNS = ['email', 'first_name', 'last_name']
+
+
+@dataclass
+class RowError:
+    line: int
+    field: str
+    message: str
+
+
+@dataclass
+class ImportResult:
+    kind: str
+    dry_run: bool = False
+    rows: int = 0
+    created: int = 0
+    users_created: int = 0
+    errors: list = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def write_error_report(self, stream):
+        writer = csv.writer(stream)
+        writer.writerow(['line', 'field', 'error'])
+        for error in self.errors:
+            writer.writerow([error.line, error.field, error.message])
+
+
+def parse_date(value):
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format).date()
+        except ValueError:
+            continue
+    raise ValueError(value)
+
+
+class RowReader:
+    """Converts and validates the fields of one CSV row, collecting errors."""
+
+    def __init__(self, line, row, errors):
+        self.line = line
+        self.row = row
+        self.errors = errors
+        self.valid = True
+
+    def error(self, field_name, message):
+        self.valid = False
+        self.errors.append(RowError(self.line, field_name, message))
+
+    def get(self, field_name, convert=None, validators=(), max_length=None, required=True):
+        value = (self.row.get(field_name) or '').strip()
+        if not value:
+            if required:
+                self.error(field_name, 'This field is required.')
+            return value
+        if max_length and len(value) > max_length:
+            self.error(field_name, f'Ensure this value has at most {max_length} characters (it has {len(value)}).')
+            return None
+        try:
+            if convert is not None:
+                value = convert(value)
+            for validator in validators:
+                value = validator(value)
+        except (ValueError, InvalidOperation):
+            self.error(field_name, f'Invalid value: {value!r}')
+            return None
+        except ValidationError as e:
+            self.error(field_name, e.messages[0])
+            return None
+        return value
+
+
+def _max_length(model, field_name):
+    return model._meta.get_field(field_name).max_length
+
+
+def _check_columns(reader, required):
+    missing = [column for column in required if column not in (reader.fieldnames or [])]
+    if missing:
+        raise ValueError(f"Missing CSV column(s): {', '.join(missing)}")
+
+
+def _batches(reader, size):
+    batch = []
+    # Line 1 is the header.
+    for line, row in enumerate(reader, start=2):
+        batch.append((line, row))
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def import_courses(stream, dry_run=False, batch_size=BATCH_SIZE):
+    """Import courses from the CSV text ``stream``; returns an ``ImportResult``."""
+    result = ImportResult('courses', dry_run=dry_run)
+    started = time.perf_counter()
+    reader = csv.DictReader(stream)
+    _check_columns(reader, COURSE_COLUMNS)
+    course_types = {code for code, _ in Course.COURSE_TYPES}
+    seen_codes = set()
+
+    def course_type(value):
+        if value not in course_types:
+            raise ValidationError(f"Course type must be one of {', '.join(sorted(course_types))}.")
+        return value
+
+    for batch in _batches(reader, batch_size):
+        result.rows += len(batch)
+        parsed = []
+        for line, row in batch:
+            fields = RowReader(line, row, result.errors)
+            course = Course(
+                code=fields.get('code', validators=[forms.normalize_course_code], max_length=_max_length(Course, 'code')),
+                name=fields.get('name', max_length=_max_length(Course, 'name')),
+                department=fields.get('department', max_length=_max_length(Course, 'department')),
+                description=fields.get('description'),
+                duration=fields.get('duration', int),
+                course_type=fields.get('course_type', validators=[course_type]),
+                total_seats=fields.get('total_seats', int),
+                min_percentage=fields.get('min_percentage', float, [forms.validate_min_percentage]),
+                fee_per_year=fields.get('fee_per_year', Decimal, [forms.validate_fee]),
+                eligibility_criteria=fields.get('eligibility_criteria'),
+            )
+            if fields.valid and course.code in seen_codes:
+                fields.error('code', f'Duplicate course code {course.code} in this file.')
+            if fields.valid:
+                seen_codes.add(course.code)
+                parsed.append((fields, course))
+
+        existing = set(Course.objects.filter(code__in=[c.code for _, c in parsed]).values_list('code', flat=True))
+        courses = []
+        for fields, course in parsed:
+            if course.code in existing:
+                fields.error('code', f'Course with code {course.code} already exists.')
+            else:
+                courses.append(course)
+
+        if courses and not dry_run:
+            with transaction.atomic():
+                Course.objects.bulk_create(courses)
+        result.created += len(courses)
+
+    if result.created and not dry_run:
+        bump_catalog_version()
+    result.errors.sort(key=lambda error: error.line)
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def import_applications(stream, status='SUBMITTED', dry_run=False, batch_size=BATCH_SIZE):
+    """Import applications from the CSV text ``stream``; returns an ``ImportResult``.
+
+    Students are matched by username and created (without a usable
+    password, in the Students group) when they don't exist yet.
+    """
+    result = ImportResult('applications', dry_run=dry_run)
+    started = time.perf_counter()
+    reader = csv.DictReader(stream)
+    _check_columns(reader, APPLICATION_COLUMNS)
+
+    courses = {code: (pk, min_percentage) for pk, code, min_percentage in Course.objects.values_list('id', 'code', 'min_percentage')}
+    students_group, _ = Group.objects.get_or_create(name=STUDENT)
+    username_validator = UnicodeUsernameValidator()
+    today = date.today()
+    current_year = today.year
+    seen_pairs = set()
+    # username: active applications, counting the rows accepted from this file so far
+    active = {}
+    limited = status in PENDING_STATUSES
+
+    def course_code(value):
+        value = forms.normalize_course_code(value)
+        if value not in courses:
+            raise ValidationError(f'Unknown course code {value}.')
+        return value
+
+    def username(value):
+        username_validator(value)
+        return value
+
+    def email(value):
+        validate_email(value)
+        return value
+
+    for batch in _batches(reader, batch_size):
+        result.rows += len(batch)
+        parsed = []
+        for line, row in batch:
+            fields = RowReader(line, row, result.errors)
+            values = dict(
+                username=fields.get('username', validators=[username], max_length=_max_length(User, 'username')),
+                course_code=fields.get('course_code', validators=[course_code]),
+                previous_school=fields.get('previous_school', max_length=_max_length(Application, 'previous_school')),
+                previous_qualification=fields.get(
+                    'previous_qualification', max_length=_max_length(Application, 'previous_qualification')
+                ),
+                percentage_obtained=fields.get('percentage_obtained', float, [forms.validate_percentage]),
+                year_of_passing=fields.get(
+                    'year_of_passing', int, [lambda year: forms.validate_year_of_passing(year, current_year)]
+                ),
+                date_of_birth=fields.get(
+                    'date_of_birth', parse_date, [lambda dob: forms.validate_date_of_birth(dob, today)]
+                ),
+                address=fields.get('address'),
+                phone=fields.get('phone', validators=[forms.validate_phone]),
+                emergency_contact=fields.get(
+                    'emergency_contact', validators=[lambda value: forms.validate_phone(value, label='Emergency contact')]
+                ),
+                email=fields.get('email', validators=[email], required=False, max_length=_max_length(User, 'email')),
+                first_name=fields.get('first_name', required=False, max_length=_max_length(User, 'first_name')),
+                last_name=fields.get('last_name', required=False, max_length=_max_length(User, 'last_name')),
+            )
+            if not fields.valid:
+                continue
+            pair = (values['username'], values['course_code'])
+            if pair in seen_pairs:
+                fields.error('course_code', f"Duplicate application of {pair[0]} for {pair[1]} in this file.")
+                continue
+            seen_pairs.add(pair)
+            parsed.append((fields, values))
+
+        usernames = {values['username'] for _, values in parsed}
+        student_ids = dict(User.objects.filter(username__in=usernames).values_list('username', 'id'))
+        applied = set(
+            Application.objects
+            .filter(student_id__in=student_ids.values(), course_id__in={courses[v['course_code']][0] for _, v in parsed})
+            .values_list('student_id', 'course_id')
+        )
+        if limited:
+            untracked = {name: student_ids.get(name) for name in usernames if name not in active}
+            counts = dict(
+                Application.objects
+                .filter(student_id__in=[pk for pk in untracked.values() if pk], status__in=PENDING_STATUSES)
+                .order_by().values('student_id').annotate(count=Count('id'))
+                .values_list('student_id', 'count')
+            )
+            active.update({name: counts.get(pk, 0) for name, pk in untracked.items()})
+        rows = []
+        for fields, values in parsed:
+            student_id = student_ids.get(values['username'])
+            if (student_id, courses[values['course_code']][0]) in applied:
+                fields.error('course_code', f"{values['username']} has already applied for {values['course_code']}.")
+            elif limited and active[values['username']] >= MAX_ACTIVE_APPLICATIONS:
+                fields.error('username', (
+                    f"{values['username']} already has {active[values['username']]} active applications. "
+                    f"Maximum limit is {MAX_ACTIVE_APPLICATIONS}."
+                ))
+            else:
+                if limited:
+                    active[values['username']] += 1
+                rows.append(values)
+
+        new_users = {}
+        for values in rows:
+            if values['username'] not in student_ids and values['username'] not in new_users:
+                new_users[values['username']] = User(
+                    username=values['username'],
+                    email=values['email'] or '',
+                    first_name=values['first_name'] or '',
+                    last_name=values['last_name'] or '',
+                    password=make_password(None),
+                )
+
+        if rows and not dry_run:
+            with transaction.atomic():
+                _write_applications(rows, new_users, student_ids, students_group, courses, status)
+        result.created += len(rows)
+        result.users_created += len(new_users)
+
+    result.errors.sort(key=lambda error: error.line)
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def _write_applications(rows, new_users, student_ids, students_group, courses, status):
+    if new_users:
+        User.objects.bulk_create(new_users.values())
+        # Not every backend hands back primary keys from bulk_create.
+        created = dict(User.objects.filter(username__in=new_users).values_list('username', 'id'))
+        student_ids.update(created)
+        User.groups.through.objects.bulk_create(
+            [User.groups.through(user_id=user_id, group_id=students_group.pk) for user_id in created.values()],
+            ignore_conflicts=True,
+        )
+
+    now = timezone.now()
+    applications = []
+    for values in rows:
+        course_id, min_percentage = courses[values['course_code']]
+        percentage = values['percentage_obtained']
+        eligible, notes = check_eligibility(percentage, min_percentage)
+        applications.append(Application(
+            student_id=student_ids[values['username']],
+            course_id=course_id,
+            previous_school=values['previous_school'],
+            previous_qualification=values['previous_qualification'],
+            percentage_obtained=percentage,
+            year_of_passing=values['year_of_passing'],
+            date_of_birth=values['date_of_birth'],
+            address=values['address'],
+            phone=values['phone'],
+            emergency_contact=values['emergency_contact'],
+            status=status,
+            submission_date=None if status == 'DRAFT' else now,
+            is_eligible=eligible,
+            eligibility_notes=notes,
+        ))
+    assign_application_numbers(applications)
+    Application.objects.bulk_create(applications)
+    adjust_status_counts({status: len(applications)})
@@ -0,0 +1,149 @@
+"""Live application status for open student dashboards (Server-Sent Events).
+
+``Application.save`` and ``bulk_review`` call ``publish_status_changes``
+with the students whose applications changed status. Once the
+transaction commits, ``status_feed`` wakes every stream waiting on one of
+those students. A woken stream reads what changed itself, by
+``last_updated``, so the feed carries no data and a coalesced wake-up
+can't drop an update.
+
+The feed only reaches streams in the same process. Streams also re-read
+``last_updated`` every ``ADMISSIONS_LIVE_STATUS_POLL`` seconds while idle,
+which picks up changes made by other worker processes and by queryset
+updates that don't publish. Polls run on executor threads, so with
+``DB_CONN_MAX_AGE`` set each worker keeps up to one connection per
+executor thread for them, as for ``arun_queries``.
+"""
+import asyncio
+import json
+import threading
+from contextlib import contextmanager
+from datetime import timedelta
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .concurrency import arun_queries
+from .models import Application
+
+
+# Streams end after this many seconds and the browser reconnects with Last-Event-ID
+STREAM_MAX_AGE = 300
+RETRY_MS = 3000
+# Look back this far so a transaction that committed after a later one isn't missed
+COMMIT_SKEW = timedelta(seconds=5)
+
+
+class StatusFeed:
+    """Wakes the streams subscribed to a student when their applications change."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waiters = {}
+
+    @contextmanager
+    def subscribe(self, student_id):
+        """An ``asyncio.Event`` set whenever ``student_id``'s applications change."""
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._lock:
+            self._waiters.setdefault(student_id, set()).add(waiter)
+        try:
+            yield waiter[1]
+        finally:
+            with self._lock:
+                waiters = self._waiters.get(student_id, set())
+                waiters.discard(waiter)
+                if not waiters:
+                    self._waiters.pop(student_id, None)
+
+    def publish(self, student_ids):
+        """Wake every stream of ``student_ids``; safe to call from any thread."""
+        with self._lock:
+            waiters = [waiter for student_id in student_ids for waiter in self._waiters.get(student_id, ())]
+        for loop, event in waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # The stream's event loop has shut down
+                pass
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(waiters) for waiters in self._waiters.values())
+
+
+status_feed = StatusFeed()
+
+
+def publish_status_changes(student_ids):
+    """Wake the streams of ``student_ids`` once the current transaction commits."""
+    student_ids = set(student_ids)
+    if student_ids:
+        transaction.on_commit(partial(status_feed.publish, student_ids))
+
+
+def parse_since(value):
+    """The stream cursor from ``Last-Event-ID`` or ``?since=``; now when missing or malformed."""
+    since = parse_datetime(value) if value else None
+    if since is None:
+        return timezone.now()
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since)
+    return since
+
+
+def changes_since(student_id, since):
+    """The student's applications touched after ``since`` (less ``COMMIT_SKEW``), oldest first."""
+    return list(
+        Application.objects.filter(student_id=student_id, last_updated__gt=since - COMMIT_SKEW)
+        .order_by('last_updated', 'id')
+        .values('id', 'application_number', 'status', 'last_updated')
+    )
+
+
+def format_event(change):
+    data = {
+        'id': change['id'],
+        'application_number': change['application_number'],
+        'status': change['status'],
+        # What the dashboard's {{ app.status|title }} renders
+        'label': change['status'].title(),
+    }
+    return f"id: {change['last_updated'].isoformat()}\nevent: status\ndata: {json.dumps(data)}\n\n"
+
+
+async def status_events(student_id, since, max_age=STREAM_MAX_AGE):
+    """The SSE body: status changes of ``student_id``'s applications after ``since``.
+
+    Yields a keep-alive comment every poll interval without changes and
+    ends after ``max_age`` seconds (0: report what changed and stop).
+    """
+    poll_interval = getattr(settings, 'ADMISSIONS_LIVE_STATUS_POLL', 15)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_age
+    sent = {}
+    yield f'retry: {RETRY_MS}\n\n'
+    with status_feed.subscribe(student_id) as wakeup:
+        while True:
+            wakeup.clear()
+            # On a worker thread, like the async views' queries: polls stay off the one
+            # thread-sensitive thread that runs every sync view and middleware
+            results = await arun_queries({'changes': partial(changes_since, student_id, since)})
+            for change in results['changes']:
+                # The look-back window re-reads rows this stream already reported
+                if sent.get(change['id']) == change['last_updated']:
+                    continue
+                sent[change['id']] = change['last_updated']
+                since = max(since, change['last_updated'])
+                yield format_event(change)
+
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return
+            try:
+                await asyncio.wait_for(wakeup.wait(), min(poll_interval, remaining))
+            except asyncio.TimeoutError:
+                yield ': ping\n\n'
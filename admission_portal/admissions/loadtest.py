@@ -0,0 +1,564 @@
+"""In-process load test of every route in ``admissions.urls``.
+
+Each entry in ``ROUTES`` builds the requests for one URL name: who sends
+them (anonymous, a student, an officer or a superuser), the path and any
+POST data, plus whatever rows they consume (a draft to submit, a course
+to delete). Requests are prepared before the clock starts, then sent
+concurrently through the Django test client, so the timings cover the
+middleware, view and template stack but not the fixture work.
+"""
+import itertools
+import os
+import random
+import statistics
+import threading
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.hashers import make_password
+from django.conf import settings
+from django.contrib.auth.models import Group, User
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from . import urls
+from .models import Application, Course
+from .numbering import assign_application_numbers
+from .roles import OFFICER, STUDENT
+from .stats import adjust_status_counts
+
+
+USERNAME_PREFIX = 'loadtest_'
+COURSE_PREFIX = 'LT'
+PASSWORD = 'Load-Test-2026'
+OK_STATUSES = {200, 302, 304}
+
+COURSE_QUERIES = [
+    {},
+    {'page': 2},
+    {'q': 'engineering'},
+    {'q': 'data scince'},
+    {'department': 'Physics'},
+    {'course_type': 'PG'},
+]
+REVIEW_ACTIONS = ['save', 'reject', 'approve_only', 'approve_and_allocate']
+BULK_REVIEW_ACTIONS = ['under_review', 'shortlist', 'approve', 'reject', 'approve_and_allocate']
+BULK_REVIEW_SIZE = 25
+
+
+@dataclass
+class Request:
+    user: object  # a User, or None for an anonymous visitor
+    method: str
+    path: str
+    data: dict = field(default_factory=dict)
+    # Log in on a client of its own (for requests that log in or out)
+    fresh_client: bool = False
+
+
+@dataclass
+class RouteResult:
+    name: str
+    requests: int = 0
+    errors: int = 0
+    elapsed: float = 0.0
+    latencies: list = field(default_factory=list, repr=False)
+    queries: list = field(default_factory=list, repr=False)
+    statuses: dict = field(default_factory=dict)
+
+    def percentile(self, pct):
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(int(len(ordered) * pct), len(ordered) - 1)] * 1000
+
+    def summary(self):
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'statuses': {str(status): count for status, count in sorted(self.statuses.items(), key=str)},
+            'p50_ms': round(self.percentile(0.50), 3),
+            'p95_ms': round(self.percentile(0.95), 3),
+            'p99_ms': round(self.percentile(0.99), 3),
+            'mean_ms': round(statistics.mean(self.latencies) * 1000, 3) if self.latencies else 0.0,
+            'rps': round(self.requests / self.elapsed, 2) if self.elapsed else 0.0,
+            'queries_mean': round(statistics.mean(self.queries), 2) if self.queries else 0.0,
+            'queries_max': max(self.queries, default=0),
+        }
+
+
+class LoadContext:
+    """Users, courses and applications the route builders draw from."""
+
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+        self.sequence = itertools.count(1)
+        self.run_id = f'{self.rng.randrange(16 ** 4):04x}'
+        self.password = make_password(PASSWORD)
+        self.students_group, _ = Group.objects.get_or_create(name=STUDENT)
+        officers_group, _ = Group.objects.get_or_create(name=OFFICER)
+
+        self.admin = self._user('admin', is_staff=True, is_superuser=True)
+        self.officer = self._user('officer')
+        self.officer.groups.add(officers_group)
+        self.students = list(
+            User.objects.filter(groups__name=STUDENT, applications__isnull=False).distinct().order_by('id')[:500]
+        )
+        if not self.students:
+            self.students = self.fresh_students(1)
+        self.course_ids = list(Course.objects.order_by('id').values_list('id', flat=True))
+        if not self.course_ids:
+            raise ValueError('The load test needs at least one course; seed the database first.')
+
+    def _user(self, role, **flags):
+        return User.objects.create(
+            username=f'{USERNAME_PREFIX}{self.run_id}_{role}', password=self.password, **flags
+        )
+
+    def unique(self):
+        return f'{self.run_id}{next(self.sequence):05d}'
+
+    def student(self, i):
+        return self.students[i % len(self.students)]
+
+    def course_id(self):
+        return self.rng.choice(self.course_ids)
+
+    def fresh_students(self, count):
+        """New students with no applications, logged in with ``PASSWORD``."""
+        batch = self.unique()
+        User.objects.bulk_create([
+            User(username=f'{USERNAME_PREFIX}{batch}_{i}', password=self.password, first_name='Load', last_name='Test')
+            for i in range(count)
+        ])
+        students = list(User.objects.filter(username__startswith=f'{USERNAME_PREFIX}{batch}_').order_by('id'))
+        User.groups.through.objects.bulk_create([
+            User.groups.through(user_id=student.pk, group_id=self.students_group.pk) for student in students
+        ])
+        return students
+
+    def application_data(self, course_id):
+        return {
+            'course': course_id,
+            'previous_school': 'Load Test School',
+            'previous_qualification': '12th Grade',
+            'percentage_obtained': round(self.rng.uniform(40, 99), 2),
+            'year_of_passing': 2024,
+            'date_of_birth': '2006-05-17',
+            'address': '1 Benchmark Road',
+            'phone': '9876543210',
+            'emergency_contact': '9123456780',
+        }
+
+    def course_data(self, code, **overrides):
+        data = {
+            'code': code,
+            'name': f'Load Test Course {code}',
+            'department': 'Load Testing',
+            'description': 'Created by the load test.',
+            'duration': 3,
+            'course_type': 'UG',
+            'total_seats': 60,
+            'min_percentage': 55,
+            'fee_per_year': '45000.00',
+            'eligibility_criteria': '12th grade or equivalent',
+        }
+        data.update(overrides)
+        return data
+
+
+@contextmanager
+def test_database():
+    """Create an empty test database and switch to it; dropped on exit.
+
+    The configured database is never touched.
+    """
+    settings_dict = connection.settings_dict
+    if connection.vendor == 'sqlite':
+        # A file, not :memory:, so every client thread shares it
+        if not settings_dict['TEST'].get('NAME'):
+            settings_dict['TEST']['NAME'] = os.path.join(tempfile.gettempdir(), 'admissions_loadtest.sqlite3')
+        # Wait for the write lock instead of failing when threads write at once
+        settings_dict['OPTIONS'].setdefault('timeout', 30)
+        settings_dict['OPTIONS'].setdefault('transaction_mode', 'IMMEDIATE')
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+@contextmanager
+def throwaway_database(scale, seed, stdout=None):
+    """A ``test_database`` seeded with ``populate_sample_data --scale``."""
+    with test_database(), override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+        call_command('populate_sample_data', scale=scale, seed=seed, stdout=stdout)
+        yield
+
+
+ROUTES = {}
+
+
+def route(name):
+    """Register the request builder for URL ``name``: ``build(ctx, count) -> [Request]``."""
+    def register(build):
+        ROUTES[name] = build
+        return build
+    return register
+
+
+def missing_routes():
+    """URL names in ``admissions.urls`` without a load-test builder."""
+    return [pattern.name for pattern in urls.urlpatterns if pattern.name not in ROUTES]
+
+
+@route('home')
+def _home(ctx, count):
+    return [Request(None, 'get', reverse('home')) for _ in range(count)]
+
+
+@route('login')
+def _login(ctx, count):
+    data = {'username': ctx.officer.username, 'password': PASSWORD}
+    return [Request(None, 'post', reverse('login'), data, fresh_client=True) for _ in range(count)]
+
+
+@route('logout')
+def _logout(ctx, count):
+    return [Request(ctx.student(i), 'get', reverse('logout'), fresh_client=True) for i in range(count)]
+
+
+@route('register')
+def _register(ctx, count):
+    requests = []
+    for _ in range(count):
+        username = f'{USERNAME_PREFIX}{ctx.unique()}'
+        requests.append(Request(None, 'post', reverse('register'), {
+            'username': username,
+            'email': f'{username}@example.com',
+            'first_name': 'Load',
+            'last_name': 'Test',
+            'password1': PASSWORD,
+            'password2': PASSWORD,
+        }))
+    return requests
+
+
+@route('view_courses')
+def _view_courses(ctx, count):
+    return [Request(None, 'get', reverse('view_courses'), COURSE_QUERIES[i % len(COURSE_QUERIES)]) for i in range(count)]
+
+
+@route('dashboard_student')
+def _dashboard_student(ctx, count):
+    return [Request(ctx.student(i), 'get', reverse('dashboard_student')) for i in range(count)]
+
+
+@route('application_status_stream')
+def _application_status_stream(ctx, count):
+    # max_age=0 reports the catch-up events and closes instead of holding the stream open
+    since = (timezone.now() - timedelta(days=1)).isoformat()
+    return [
+        Request(ctx.student(i), 'get', reverse('application_status_stream'), {'since': since, 'max_age': 0})
+        for i in range(count)
+    ]
+
+
+@route('apply_for_course')
+def _apply_for_course(ctx, count):
+    return [
+        Request(student, 'post', reverse('apply_for_course'), ctx.application_data(ctx.course_id()))
+        for student in ctx.fresh_students(count)
+    ]
+
+
+@route('submit_application')
+def _submit_application(ctx, count):
+    students = ctx.fresh_students(count)
+    drafts = []
+    for student in students:
+        data = ctx.application_data(ctx.course_id())
+        data['course_id'] = data.pop('course')
+        data['date_of_birth'] = date.fromisoformat(data['date_of_birth'])
+        drafts.append(Application(student=student, status='DRAFT', **data))
+    assign_application_numbers(drafts)
+    Application.objects.bulk_create(drafts)
+    adjust_status_counts({'DRAFT': len(drafts)})
+    ids = dict(Application.objects.filter(student__in=students).values_list('student_id', 'id'))
+    return [
+        Request(student, 'post', reverse('submit_application', args=[ids[student.pk]]))
+        for student in students
+    ]
+
+
+@route('dashboard_officer')
+def _dashboard_officer(ctx, count):
+    return [Request(ctx.officer, 'get', reverse('dashboard_officer')) for _ in range(count)]
+
+
+def _queue_queries(ctx):
+    return [{}, {'page': 3}, {'status': 'SUBMITTED'}, {'show_all': 'true'}, {'course': ctx.course_id()}]
+
+
+@route('manage_applications')
+def _manage_applications(ctx, count):
+    queries = _queue_queries(ctx)
+    return [Request(ctx.officer, 'get', reverse('manage_applications'), queries[i % len(queries)]) for i in range(count)]
+
+
+@route('export_applications')
+def _export_applications(ctx, count):
+    # One course's queue per export keeps each download a realistic size
+    return [
+        Request(ctx.officer, 'get', reverse('export_applications'), {
+            'format': 'csv' if i % 2 == 0 else 'xlsx', 'course': ctx.course_id(), 'show_all': 'true',
+        })
+        for i in range(count)
+    ]
+
+
+@route('review_application')
+def _review_application(ctx, count):
+    ids = list(
+        Application.objects.filter(status__in=['SUBMITTED', 'UNDER_REVIEW'], seat_allocation__isnull=True)
+        .order_by('?').values_list('id', flat=True)[:count]
+    )
+    if not ids:
+        return []
+    return [
+        Request(ctx.officer, 'post', reverse('review_application', args=[ids[i % len(ids)]]), {
+            'status': 'UNDER_REVIEW',
+            'review_notes': 'Reviewed during load test.',
+            'is_eligible': 'on',
+            'eligibility_notes': '',
+            'action': REVIEW_ACTIONS[i % len(REVIEW_ACTIONS)],
+        })
+        for i in range(count)
+    ]
+
+
+@route('bulk_review_applications')
+def _bulk_review_applications(ctx, count):
+    # A page's worth of checkboxes per request, disjoint so every request has work to do
+    ids = list(
+        Application.objects.filter(status__in=['SUBMITTED', 'UNDER_REVIEW'], seat_allocation__isnull=True)
+        .order_by('?').values_list('id', flat=True)[:count * BULK_REVIEW_SIZE]
+    )
+    if not ids:
+        return []
+    return [
+        Request(ctx.officer, 'post', reverse('bulk_review_applications'), {
+            'show_all': 'true',
+            'action': BULK_REVIEW_ACTIONS[i % len(BULK_REVIEW_ACTIONS)],
+            'applications': ids[i * BULK_REVIEW_SIZE:(i + 1) * BULK_REVIEW_SIZE] or ids[:BULK_REVIEW_SIZE],
+            'review_notes': 'Bulk reviewed during load test.',
+        })
+        for i in range(count)
+    ]
+
+
+@route('officer_view_courses')
+def _officer_view_courses(ctx, count):
+    return [
+        Request(ctx.officer, 'get', reverse('officer_view_courses'), COURSE_QUERIES[i % len(COURSE_QUERIES)])
+        for i in range(count)
+    ]
+
+
+@route('merit_allocation')
+def _merit_allocation(ctx, count):
+    # GET is the dry run; a POST would allocate the whole merit list on every request
+    return [Request(ctx.officer, 'get', reverse('merit_allocation')) for _ in range(count)]
+
+
+@route('manage_courses')
+def _manage_courses(ctx, count):
+    return [Request(ctx.admin, 'get', reverse('manage_courses')) for _ in range(count)]
+
+
+@route('add_course')
+def _add_course(ctx, count):
+    return [
+        Request(ctx.admin, 'post', reverse('add_course'), ctx.course_data(f'{COURSE_PREFIX}{ctx.unique()}'))
+        for _ in range(count)
+    ]
+
+
+@route('edit_course')
+def _edit_course(ctx, count):
+    codes = dict(Course.objects.filter(pk__in=ctx.course_ids).values_list('id', 'code'))
+    requests = []
+    for i in range(count):
+        course_id = ctx.course_ids[i % len(ctx.course_ids)]
+        data = ctx.course_data(codes[course_id], description=f'Edited by the load test ({i}).')
+        requests.append(Request(ctx.admin, 'post', reverse('edit_course', args=[course_id]), data))
+    return requests
+
+
+@route('delete_course')
+def _delete_course(ctx, count):
+    batch = f'{COURSE_PREFIX}D{ctx.unique()}'
+    Course.objects.bulk_create([
+        Course(**ctx.course_data(f'{batch}{i:04d}', fee_per_year=45000)) for i in range(count)
+    ])
+    ids = Course.objects.filter(code__startswith=batch).order_by('code').values_list('id', flat=True)
+    return [Request(ctx.admin, 'post', reverse('delete_course', args=[course_id])) for course_id in ids]
+
+
+@route('manage_seats')
+def _manage_seats(ctx, count):
+    return [Request(ctx.admin, 'get', reverse('manage_seats'), {'page': i % 3 + 1}) for i in range(count)]
+
+
+@route('metrics')
+def _metrics(ctx, count):
+    return [Request(ctx.admin, 'get', reverse('metrics')) for _ in range(count)]
+
+
+async def _drain(content):
+    async for _ in content:
+        pass
+
+
+def send(request, clients):
+    """Send one prepared request; returns (status, seconds, queries)."""
+    if request.fresh_client or request.user is None:
+        client = Client()
+        if request.user is not None:
+            client.force_login(request.user)
+    else:
+        client = clients.get(request.user.pk)
+        if client is None:
+            client = clients[request.user.pk] = Client()
+            client.force_login(request.user)
+
+    queries = 0
+
+    def count_queries(execute, sql, params, many, context):
+        nonlocal queries
+        queries += 1
+        return execute(sql, params, many, context)
+
+    method = getattr(client, request.method)
+    with connection.execute_wrapper(count_queries):
+        started = time.perf_counter()
+        response = method(request.path, request.data)
+        if response.streaming and response.is_async:
+            async_to_sync(_drain)(response.streaming_content)
+        elif response.streaming:
+            for _ in response.streaming_content:
+                pass
+        elapsed = time.perf_counter() - started
+    return response.status_code, elapsed, queries
+
+
+def run_route(name, requests, concurrency=1, warmup=0):
+    """Send ``requests`` over ``concurrency`` threads; returns a ``RouteResult``.
+
+    The first ``warmup`` requests are sent one at a time beforehand and
+    not recorded. With one thread everything runs on the calling thread.
+    """
+    result = RouteResult(name)
+    clients = {}
+    for request in requests[:warmup]:
+        send(request, clients)
+    pending = iter(requests[warmup:])
+    mutex = threading.Lock()
+
+    def worker(clients):
+        latencies, queries, statuses, errors = [], [], {}, 0
+        while True:
+            with mutex:
+                request = next(pending, None)
+            if request is None:
+                break
+            try:
+                status, elapsed, count = send(request, clients)
+            except Exception as e:
+                status, elapsed, count = type(e).__name__, 0.0, 0
+            statuses[status] = statuses.get(status, 0) + 1
+            if status not in OK_STATUSES:
+                errors += 1
+                continue
+            latencies.append(elapsed)
+            queries.append(count)
+        with mutex:
+            result.latencies.extend(latencies)
+            result.queries.extend(queries)
+            result.errors += errors
+            result.requests += sum(statuses.values())
+            for status, count in statuses.items():
+                result.statuses[status] = result.statuses.get(status, 0) + count
+
+    started = time.perf_counter()
+    if concurrency <= 1:
+        worker(clients)
+    else:
+        def thread_main():
+            try:
+                worker({})
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=thread_main) for _ in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def run(ctx, names=None, requests=100, concurrency=8, warmup=2, progress=None):
+    """Load-test ``names`` (default: every route); returns ``{name: RouteResult}``."""
+    results = {}
+    for name in names or ROUTES:
+        prepared = ROUTES[name](ctx, requests + warmup)
+        results[name] = run_route(name, prepared, concurrency, warmup)
+        if progress:
+            progress(results[name])
+    return results
+
+
+def baseline(results, **meta):
+    """The machine-readable report ``loadtest --output`` writes."""
+    latencies = [value for result in results.values() for value in result.latencies]
+    total = RouteResult('total', latencies=latencies)
+    total.requests = sum(result.requests for result in results.values())
+    total.errors = sum(result.errors for result in results.values())
+    total.elapsed = sum(result.elapsed for result in results.values())
+    total.queries = [value for result in results.values() for value in result.queries]
+    return {
+        'meta': meta,
+        'routes': {name: result.summary() for name, result in results.items()},
+        'total': total.summary(),
+    }
+
+
+def compare(previous, current, tolerance=0.2):
+    """Per-route changes against an earlier baseline, and the routes that regressed.
+
+    A route regresses when its p95 grows by more than ``tolerance`` (a
+    fraction), it fails more often, or it issues at least one more SQL
+    query per request on average.
+    """
+    rows, regressions = [], []
+    for name, now in current['routes'].items():
+        before = previous.get('routes', {}).get(name)
+        if before is None:
+            rows.append((name, None, now, None))
+            continue
+        change = (now['p95_ms'] - before['p95_ms']) / before['p95_ms'] if before['p95_ms'] else 0.0
+        rows.append((name, before, now, change))
+        if change > tolerance or now['queries_mean'] >= before['queries_mean'] + 1 or now['errors'] > before['errors']:
+            regressions.append(name)
+    return rows, regressions
+
@@ -0,0 +1,62 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from admissions.allocation import allocate_merit_list
+from admissions.models import Course
+
+
+class Command(BaseCommand):
+    help = 'Allocate seats for eligible applications by merit list'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--course',
+            action='append',
+            dest='courses',
+            help='Course code to allocate (repeatable, default: all courses)'
+        )
+        parser.add_argument(
+            '--officer',
+            type=str,
+            help='Username recorded as the allocating officer'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report cutoffs and timings without writing anything'
+        )
+
+    def handle(self, *args, **options):
+        courses = None
+        if options['courses']:
+            codes = [code.upper() for code in options['courses']]
+            courses = list(Course.objects.filter(code__in=codes))
+            missing = set(codes) - {c.code for c in courses}
+            if missing:
+                raise CommandError(f'Unknown course code(s): {", ".join(sorted(missing))}')
+
+        officer = None
+        if options['officer']:
+            try:
+                officer = User.objects.get(username=options['officer'])
+            except User.DoesNotExist:
+                raise CommandError(f'Unknown officer: {options["officer"]}')
+
+        result = allocate_merit_list(courses, allocated_by=officer, dry_run=options['dry_run'])
+
+        title = 'MERIT LIST (DRY RUN)' if result.dry_run else 'MERIT LIST ALLOCATION'
+        self.stdout.write(self.style.SUCCESS('\n' + '='*60))
+        self.stdout.write(self.style.SUCCESS(f'🎯 {title}'))
+        self.stdout.write(self.style.SUCCESS('='*60))
+
+        for course in result.courses:
+            cutoff = f'{course.cutoff:.2f}%' if course.cutoff is not None else '-'
+            self.stdout.write(
+                f'  {course.code:<12} seats: {course.available_before:>6}  '
+                f'allocated: {course.allocated:>6}  cutoff: {cutoff}'
+            )
+
+        self.stdout.write(self.style.SUCCESS(f'\n🪑 Seats allocated: {result.total_allocated}'))
+        self.stdout.write(f'   Skipped (student already seated): {result.skipped_already_seated}')
+        timings = ', '.join(f'{phase} {seconds * 1000:.1f} ms' for phase, seconds in result.timings.items())
+        self.stdout.write(f'⏱️  {timings}')
@@ -0,0 +1,110 @@
+import asyncio
+import time
+from io import StringIO
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import override_settings
+
+from admissions import loadtest
+from admissions.async_views import ROUTES, async_urlconf
+
+
+async def run_asgi(name, requests, concurrency):
+    """Send ``requests`` through the ASGI handler, ``concurrency`` at a time."""
+    clients = {}
+    for request in requests:
+        if request.user.pk not in clients:
+            clients[request.user.pk] = AsyncClient()
+            await clients[request.user.pk].aforce_login(request.user)
+
+    result = loadtest.RouteResult(name)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def send(request):
+        async with semaphore:
+            started = time.perf_counter()
+            response = await clients[request.user.pk].get(request.path, request.data)
+            elapsed = time.perf_counter() - started
+        result.requests += 1
+        result.statuses[response.status_code] = result.statuses.get(response.status_code, 0) + 1
+        if response.status_code in loadtest.OK_STATUSES:
+            result.latencies.append(elapsed)
+        else:
+            result.errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(send(request) for request in requests))
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+class Command(BaseCommand):
+    help = 'Compare sync views under WSGI with the async views under ASGI at the same concurrency'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=100,
+            help='Requests per route and mode (default: 100)'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=16,
+            help='Requests in flight at once (default: 16)'
+        )
+        parser.add_argument(
+            '--scale',
+            type=int,
+            default=5,
+            help='populate_sample_data --scale for the throwaway database (default: 5)'
+        )
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1 or options['concurrency'] < 1:
+            raise CommandError('--requests and --concurrency must be positive')
+
+        self.stdout.write(self.style.SUCCESS(f'\n🌱 Seeding test database ({connection.vendor})...'))
+        rows = []
+        with loadtest.throwaway_database(options['scale'], seed=2026, stdout=StringIO()):
+            ctx = loadtest.LoadContext(seed=2026)
+            for name in ROUTES:
+                requests = loadtest.ROUTES[name](ctx, options['requests'])
+                # Warm both stacks (templates, caches, connections) before timing
+                loadtest.run_route(name, requests[:3])
+                wsgi = loadtest.run_route(name, requests, options['concurrency'])
+                with override_settings(ROOT_URLCONF=async_urlconf()):
+                    asyncio.run(run_asgi(name, requests[:3], 1))
+                    asgi = asyncio.run(run_asgi(name, requests, options['concurrency']))
+                for mode, result in (('WSGI sync', wsgi), ('ASGI async', asgi)):
+                    if result.errors:
+                        raise CommandError(f'❌ {name} ({mode}) failed: {result.statuses}')
+                rows.append((name, wsgi.summary(), asgi.summary()))
+
+        self.report(rows, options)
+
+    def report(self, rows, options):
+        self.stdout.write(self.style.SUCCESS('\n' + '='*88))
+        self.stdout.write(self.style.SUCCESS(
+            f"⚡ WSGI (sync views) vs ASGI (async views): {options['requests']} requests, "
+            f"{options['concurrency']} in flight"
+        ))
+        self.stdout.write(self.style.SUCCESS('='*88))
+        self.stdout.write(
+            f"{'Route':<22}{'Mode':<12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}{'p95 change':>12}"
+        )
+        for name, wsgi, asgi in rows:
+            change = (asgi['p95_ms'] - wsgi['p95_ms']) / wsgi['p95_ms'] if wsgi['p95_ms'] else 0.0
+            for mode, row, note in (('WSGI', wsgi, ''), ('ASGI', asgi, f'{change:+.0%}')):
+                self.stdout.write(
+                    f"{name if mode == 'WSGI' else '':<22}{mode:<12}{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}"
+                    f"{row['p99_ms']:>10.1f}{row['rps']:>10.1f}{note:>12}"
+                )
+        if connection.vendor == 'sqlite':
+            self.stdout.write(self.style.WARNING(
+                '⚠️ SQLite answers from the local process, so overlapping queries gains little here; '
+                'run against MySQL for deployment numbers.'
+            ))
@@ -0,0 +1,133 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.paginator import Paginator
+from django.db import transaction
+
+from admissions.catalog import bump_catalog_version
+from admissions.models import Course
+from admissions.search import CourseIndex, search_courses, use_fulltext
+
+
+SUBJECTS = [
+    'Computer', 'Science', 'Mechanical', 'Engineering', 'Electrical', 'Civil', 'Commerce', 'Accounting',
+    'Business', 'Administration', 'Physics', 'Chemistry', 'Mathematics', 'Statistics', 'Biology',
+    'Biotechnology', 'Economics', 'History', 'Literature', 'Psychology', 'Architecture', 'Design',
+    'Pharmacy', 'Nursing', 'Journalism', 'Robotics', 'Aerospace', 'Marine', 'Agriculture', 'Law',
+]
+DEPARTMENTS = ['Engineering', 'Sciences', 'Commerce', 'Humanities', 'Medicine', 'Law', 'Design', 'Agriculture']
+PHRASES = [
+    'hands-on laboratory work', 'industry internship', 'research project', 'capstone thesis',
+    'field work', 'seminar series', 'studio practice', 'clinical rotation',
+]
+
+# (label, form data) pairs; the icontains baseline only understands name/department.
+QUERIES = [
+    ('name word', {'name': 'mechanical'}),
+    ('department', {'department': 'commerce'}),
+    ('two words', {'name': 'computer science'}),
+    ('prefix', {'name': 'robot'}),
+    ('typo', {'name': 'chemestry'}),
+    ('description', {'q': 'internship'}),
+    ('eligibility', {'q': 'mathematics 12th'}),
+]
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Compare indexed course search with the old icontains filters on a large catalog'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--courses',
+            type=int,
+            default=10000,
+            help='Courses to seed (default: 10000, rolled back afterwards)'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=20,
+            help='Timed runs per query and method (default: 20)'
+        )
+
+    def handle(self, *args, **options):
+        if options['courses'] < 1 or options['repeat'] < 1:
+            raise CommandError('--courses and --repeat must be positive')
+
+        try:
+            with transaction.atomic():
+                self.seed(options['courses'])
+                self.run(options['repeat'])
+                raise Rollback
+        except Rollback:
+            pass
+        # The seeded courses are gone again; drop anything built from them.
+        bump_catalog_version()
+
+    def run(self, repeat):
+        backend = 'MySQL FULLTEXT' if use_fulltext() else 'in-process index'
+        started = time.perf_counter()
+        index = CourseIndex.build()
+        build_ms = (time.perf_counter() - started) * 1000
+        self.stdout.write(f'🔎 Search backend: {backend}; index build {build_ms:.1f} ms, {len(index.vocabulary)} terms')
+        bump_catalog_version()
+        search_courses(Course.objects.all(), name='warmup')
+
+        self.stdout.write(f'\n{"query":<14}{"icontains":>12}{"hits":>7}{"indexed":>12}{"hits":>7}')
+        for label, data in QUERIES:
+            baseline_ms, baseline_hits = self.time(repeat, lambda: self.icontains(data))
+            indexed_ms, indexed_hits = self.time(repeat, lambda: self.indexed(data))
+            self.stdout.write(
+                f'{label:<14}{baseline_ms:>10.2f}ms{baseline_hits:>7}{indexed_ms:>10.2f}ms{indexed_hits:>7}'
+            )
+        self.stdout.write(self.style.SUCCESS('\n✅ Timings are the median of the first results page (count + 5 rows)'))
+
+    def time(self, repeat, search):
+        timings = []
+        hits = 0
+        for _ in range(repeat):
+            started = time.perf_counter()
+            hits = search()
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings), hits
+
+    def first_page(self, courses):
+        paginator = Paginator(courses, 5)
+        list(paginator.get_page(1))
+        return paginator.count
+
+    def icontains(self, data):
+        courses = Course.objects.order_by('department', 'code')
+        if data.get('name'):
+            courses = courses.filter(name__icontains=data['name'])
+        if data.get('department'):
+            courses = courses.filter(department__icontains=data['department'])
+        if data.get('q'):
+            courses = courses.filter(description__icontains=data['q'])
+        return self.first_page(courses)
+
+    def indexed(self, data):
+        return self.first_page(search_courses(Course.objects.order_by('department', 'code'), **data))
+
+    def seed(self, count):
+        rng = random.Random(7)
+        self.stdout.write(f'🌱 Seeding {count} courses...')
+        courses = []
+        for i in range(count):
+            words = rng.sample(SUBJECTS, 2)
+            courses.append(Course(
+                code=f'SRCH{i:05d}', name=' '.join(words), department=rng.choice(DEPARTMENTS),
+                description=f'{words[0]} programme with {rng.choice(PHRASES)} and {rng.choice(PHRASES)}.',
+                duration=rng.choice([2, 3, 4]), course_type=rng.choice(['UG', 'PG', 'DIP']),
+                total_seats=60, min_percentage=rng.choice([50, 60, 70]),
+                eligibility_criteria=f'12th with {rng.choice(SUBJECTS)} and {rng.choice(SUBJECTS)}',
+                fee_per_year=rng.randint(20, 200) * 1000,
+            ))
+        Course.objects.bulk_create(courses, batch_size=1000)
+        bump_catalog_version()
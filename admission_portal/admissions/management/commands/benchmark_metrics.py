@@ -0,0 +1,104 @@
+import statistics
+import time
+from io import StringIO
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from admissions import loadtest
+from admissions.metrics import Registry, RequestSample
+
+
+ROUTES = [
+    'home', 'view_courses', 'dashboard_student', 'dashboard_officer', 'manage_applications',
+    'officer_view_courses', 'manage_courses', 'manage_seats',
+]
+
+
+class Command(BaseCommand):
+    help = 'Measure the request overhead of MetricsMiddleware on read-only routes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=100,
+            help='Requests per route per round (default: 100)'
+        )
+        parser.add_argument(
+            '--rounds',
+            type=int,
+            default=6,
+            help='Alternating rounds with metrics on and off (default: 6)'
+        )
+        parser.add_argument(
+            '--scale',
+            type=int,
+            default=2,
+            help='populate_sample_data --scale for the throwaway database (default: 2)'
+        )
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1 or options['rounds'] < 2:
+            raise CommandError('--requests must be positive and --rounds at least 2')
+
+        self.stdout.write(self.style.SUCCESS('\n🌱 Seeding test database...'))
+        with loadtest.throwaway_database(options['scale'], seed=2026, stdout=StringIO()):
+            ctx = loadtest.LoadContext(seed=2026)
+            requests = {name: loadtest.ROUTES[name](ctx, options['requests']) for name in ROUTES}
+            # Warm caches and connections before timing anything
+            for name in ROUTES:
+                loadtest.run_route(name, requests[name][:5])
+
+            totals = {True: [], False: []}
+            per_route = {True: {name: [] for name in ROUTES}, False: {name: [] for name in ROUTES}}
+            for round_number in range(options['rounds']):
+                # Alternate which mode goes first so drift doesn't favour one
+                for enabled in ((True, False) if round_number % 2 == 0 else (False, True)):
+                    with override_settings(ADMISSIONS_METRICS=enabled):
+                        elapsed = 0.0
+                        for name in ROUTES:
+                            result = loadtest.run_route(name, requests[name])
+                            if result.errors:
+                                raise CommandError(f'❌ {name} failed: {result.statuses}')
+                            elapsed += sum(result.latencies)
+                            per_route[enabled][name].extend(result.latencies)
+                        totals[enabled].append(elapsed)
+
+        self.report(totals, per_route, options)
+
+    def report(self, totals, per_route, options):
+        self.stdout.write(self.style.SUCCESS('\n' + '='*60))
+        self.stdout.write(self.style.SUCCESS('📏 METRICS MIDDLEWARE OVERHEAD'))
+        self.stdout.write(self.style.SUCCESS('='*60))
+        self.stdout.write(f"{'Route':<24}{'off ms':>10}{'on ms':>10}{'change':>10}")
+        for name in ROUTES:
+            off = statistics.median(per_route[False][name]) * 1000
+            on = statistics.median(per_route[True][name]) * 1000
+            self.stdout.write(f'{name:<24}{off:>10.2f}{on:>10.2f}{(on - off) / off:>+10.1%}')
+
+        overheads = [on / off - 1 for on, off in zip(totals[True], totals[False])]
+        requests = options['requests'] * len(ROUTES)
+        self.stdout.write(
+            f'\nPer round ({requests} requests): off={statistics.median(totals[False]):.3f}s '
+            f'on={statistics.median(totals[True]):.3f}s'
+        )
+        self.stdout.write(f'Overhead (median of {len(overheads)} rounds): {statistics.median(overheads):+.2%}')
+
+        # The bookkeeping alone, without any request noise around it
+        registry, sample, count = Registry(), RequestSample(), 100000
+        values = {
+            'request_duration_seconds': 0.02, 'sql_queries': 5, 'sql_duration_seconds': 0.004,
+            'template_render_seconds': 0.006, 'response_size_bytes': 20000,
+        }
+        started = time.perf_counter()
+        for _ in range(count):
+            registry.observe('benchmark', values)
+        per_observe = (time.perf_counter() - started) / count
+        started = time.perf_counter()
+        for _ in range(count):
+            sample.time_query(lambda *args: None, 'SELECT 1', (), False, {})
+        per_query = (time.perf_counter() - started) / count
+        self.stdout.write(
+            f'Recording one request: {per_observe * 1e6:.1f}µs; wrapping one query: {per_query * 1e6:.2f}µs'
+        )
@@ -0,0 +1,197 @@
+import statistics
+import threading
+import time
+import uuid
+from datetime import date
+from queue import Empty, Queue
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connection
+
+from admissions.models import Application, Course, SeatAllocation
+from admissions.reservations import NoSeatsAvailable, SeatReservationError, reserve_seat
+from admissions.stats import adjust_status_counts
+
+
+class Command(BaseCommand):
+    help = 'Hammer one course with concurrent seat reservations and check for oversubscription'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=8,
+            help='Number of concurrent reservation threads (default: 8)'
+        )
+        parser.add_argument(
+            '--seats',
+            type=int,
+            default=100,
+            help='Total seats in the benchmark course (default: 100)'
+        )
+        parser.add_argument(
+            '--applications',
+            type=int,
+            default=400,
+            help='Number of applications competing for the seats (default: 400)'
+        )
+        parser.add_argument(
+            '--keep',
+            action='store_true',
+            help='Keep the benchmark course, students and applications afterwards'
+        )
+
+    def handle(self, *args, **options):
+        workers = options['workers']
+        if workers < 1 or options['applications'] < 1:
+            raise CommandError('--workers and --applications must be positive')
+
+        run_id = uuid.uuid4().hex[:6].upper()
+        course, applications = self.create_fixture(run_id, options['seats'], options['applications'])
+
+        try:
+            queue = Queue()
+            for app_id, student_id in applications:
+                queue.put(Application(pk=app_id, course_id=course.pk, student_id=student_id))
+
+            stats = {'reserved': 0, 'full': 0, 'rejected': 0, 'errors': 0}
+            latencies = []
+            lock_waits = []
+            mutex = threading.Lock()
+
+            def worker():
+                local_latency, local_waits = [], []
+
+                def time_seat_update(execute, sql, params, many, context):
+                    if not sql.startswith('UPDATE') or 'filled_seats' not in sql:
+                        return execute(sql, params, many, context)
+                    started = time.perf_counter()
+                    try:
+                        return execute(sql, params, many, context)
+                    finally:
+                        local_waits.append(time.perf_counter() - started)
+
+                try:
+                    with connection.execute_wrapper(time_seat_update):
+                        while True:
+                            try:
+                                application = queue.get_nowait()
+                            except Empty:
+                                break
+                            started = time.perf_counter()
+                            outcome = 'reserved'
+                            try:
+                                reserve_seat(application)
+                            except NoSeatsAvailable:
+                                outcome = 'full'
+                            except SeatReservationError:
+                                outcome = 'rejected'
+                            except DatabaseError:
+                                outcome = 'errors'
+                            local_latency.append(time.perf_counter() - started)
+                            with mutex:
+                                stats[outcome] += 1
+                finally:
+                    connection.close()
+                    with mutex:
+                        latencies.extend(local_latency)
+                        lock_waits.extend(local_waits)
+
+            threads = [threading.Thread(target=worker) for _ in range(workers)]
+            started = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+
+            course.refresh_from_db()
+            allocations = SeatAllocation.objects.filter(course=course).count()
+            self.report(course, stats, latencies, lock_waits, elapsed, allocations, workers)
+        finally:
+            if not options['keep']:
+                self.cleanup(run_id, course)
+
+    def create_fixture(self, run_id, seats, count):
+        course = Course.objects.create(
+            code=f'BENCH{run_id}',
+            name='Seat Reservation Benchmark',
+            department='Benchmark',
+            description='Temporary course created by benchmark_seat_reservation',
+            duration=1,
+            course_type='UG',
+            total_seats=seats,
+            min_percentage=0,
+            eligibility_criteria='-',
+            fee_per_year=1,
+        )
+        User.objects.bulk_create([
+            User(username=f'bench_{run_id}_{i}', password='!')
+            for i in range(count)
+        ])
+        students = User.objects.filter(username__startswith=f'bench_{run_id}_').values_list('id', flat=True)
+        Application.objects.bulk_create([
+            Application(
+                student_id=student_id,
+                course=course,
+                application_number=f'BENCH{run_id}{i:06d}',
+                previous_school='Benchmark School',
+                previous_qualification='12th',
+                percentage_obtained=75,
+                year_of_passing=2024,
+                date_of_birth=date(2005, 1, 1),
+                address='-',
+                phone='0000000000',
+                emergency_contact='0000000000',
+                status='APPROVED',
+                is_eligible=True,
+            )
+            for i, student_id in enumerate(students)
+        ], batch_size=1000)
+        applications = list(Application.objects.filter(course=course).values_list('id', 'student_id'))
+        # bulk_create skips Application.save, so count the rows the cascade delete will subtract
+        adjust_status_counts({'APPROVED': len(applications)})
+        return course, applications
+
+    def cleanup(self, run_id, course):
+        course.delete()
+        User.objects.filter(username__startswith=f'bench_{run_id}_').delete()
+
+    def report(self, course, stats, latencies, lock_waits, elapsed, allocations, workers):
+        def ms(values, pct):
+            if not values:
+                return 0.0
+            ordered = sorted(values)
+            return ordered[min(int(len(ordered) * pct), len(ordered) - 1)] * 1000
+
+        attempts = sum(stats.values())
+        self.stdout.write(self.style.SUCCESS('\n' + '='*60))
+        self.stdout.write(self.style.SUCCESS('🏁 SEAT RESERVATION BENCHMARK'))
+        self.stdout.write(self.style.SUCCESS('='*60))
+        self.stdout.write(f'Workers: {workers}   Attempts: {attempts}   Elapsed: {elapsed:.3f}s')
+        self.stdout.write(f'Throughput: {attempts / elapsed if elapsed else 0:.1f} reservations/s')
+        self.stdout.write(
+            f'Outcomes: reserved={stats["reserved"]} full={stats["full"]} '
+            f'rejected={stats["rejected"]} db_errors={stats["errors"]}'
+        )
+        self.stdout.write(
+            f'Latency ms: p50={ms(latencies, 0.50):.2f} p95={ms(latencies, 0.95):.2f} '
+            f'p99={ms(latencies, 0.99):.2f}'
+        )
+        total_wait = sum(lock_waits)
+        mean_wait = statistics.mean(lock_waits) * 1000 if lock_waits else 0.0
+        self.stdout.write(
+            f'Seat UPDATE (lock wait) ms: total={total_wait * 1000:.1f} mean={mean_wait:.2f} '
+            f'p99={ms(lock_waits, 0.99):.2f}'
+        )
+        self.stdout.write(
+            f'Course: total_seats={course.total_seats} filled_seats={course.filled_seats} '
+            f'allocations={allocations}'
+        )
+
+        if course.filled_seats > course.total_seats or course.filled_seats != allocations:
+            raise CommandError('❌ Oversubscription or lost update detected!')
+        if allocations != stats['reserved']:
+            raise CommandError('❌ Allocation count does not match successful reservations!')
+        self.stdout.write(self.style.SUCCESS('✅ Zero oversubscription: filled_seats matches allocations'))
@@ -0,0 +1,257 @@
+import asyncio
+import threading
+import time
+import tracemalloc
+from io import StringIO
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from admissions import loadtest
+from admissions.live import status_feed
+from admissions.models import Application
+
+
+MEMORY_SAMPLE = 50
+
+class Stream:
+    """One SSE connection driven straight through the ASGI application."""
+
+    def __init__(self, app, path, cookie):
+        self.app = app
+        self.scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+            'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'root_path': '',
+            'query_string': b'', 'client': ('127.0.0.1', 0), 'server': ('testserver', 80),
+            'headers': [(b'host', b'testserver'), (b'cookie', f'{settings.SESSION_COOKIE_NAME}={cookie}'.encode())],
+        }
+        self.opened = asyncio.Event()
+        self.closing = asyncio.Event()
+        self.requested = False
+        self.status = None
+        self.started = self.first_byte = 0.0
+        self.pings = 0
+        self.events = []
+
+    async def receive(self):
+        if not self.requested:
+            self.requested = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await self.closing.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(self, message):
+        if message['type'] == 'http.response.start':
+            self.status = message['status']
+            return
+        body = message.get('body', b'')
+        if not self.opened.is_set():
+            self.first_byte = time.perf_counter()
+            self.opened.set()
+        if body.startswith(b':'):
+            self.pings += 1
+        elif b'event: status' in body:
+            self.events.append(time.perf_counter())
+
+    async def run(self):
+        self.started = time.perf_counter()
+        await self.app(self.scope, self.receive, self.send)
+        # An error page ends the request without a stream
+        self.opened.set()
+
+
+class Command(BaseCommand):
+    help = 'Hold idle application status streams open in one ASGI worker and measure what they cost'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--connections',
+            type=int,
+            default=1000,
+            help='Streams held open at once (default: 1000)'
+        )
+        parser.add_argument(
+            '--idle',
+            type=float,
+            default=10.0,
+            help='Seconds to hold the streams idle (default: 10)'
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=5.0,
+            help='ADMISSIONS_LIVE_STATUS_POLL for the run (default: 5)'
+        )
+        parser.add_argument(
+            '--reviews',
+            type=int,
+            default=50,
+            help='Status changes published while the streams are open (default: 50)'
+        )
+        parser.add_argument(
+            '--scale',
+            type=int,
+            default=2,
+            help='populate_sample_data --scale for the throwaway database (default: 2)'
+        )
+
+    def handle(self, *args, **options):
+        if options['connections'] < 1 or options['idle'] <= 0 or options['poll_interval'] <= 0:
+            raise CommandError('--connections, --idle and --poll-interval must be positive')
+
+        self.stdout.write(self.style.SUCCESS(f'\n🌱 Seeding test database ({connection.vendor})...'))
+        with loadtest.throwaway_database(options['scale'], seed=2026, stdout=StringIO()):
+            ctx = loadtest.LoadContext(seed=2026)
+            cookies = {}
+            for student in ctx.students:
+                client = Client()
+                client.force_login(student)
+                cookies[student.pk] = client.cookies[settings.SESSION_COOKIE_NAME].value
+            students = [ctx.student(i) for i in range(options['connections'])]
+            with override_settings(ADMISSIONS_LIVE_STATUS_POLL=options['poll_interval']):
+                report = asyncio.run(self.hold(students, cookies, options))
+
+        self.report(report, options)
+
+    async def hold(self, students, cookies, options):
+        app = get_asgi_application()
+        path = reverse('application_status_stream')
+        queries = 0
+
+        def count(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        def wrap(sender, connection, **kwargs):
+            # Polls reconnect from worker threads, so the same connection can be created again
+            if count not in connection.execute_wrappers:
+                connection.execute_wrappers.append(count)
+
+        async def open_streams(students):
+            streams = [Stream(app, path, cookies[student.pk]) for student in students]
+            tasks.extend(asyncio.create_task(stream.run()) for stream in streams)
+            await asyncio.gather(*(stream.opened.wait() for stream in streams))
+            failed = [stream.status for stream in streams if stream.status != 200]
+            if failed:
+                raise CommandError(f'❌ {len(failed)} streams failed to open: {sorted(set(failed))}')
+            # Let every stream finish its first poll before measuring the idle state
+            await asyncio.sleep(min(options['poll_interval'], 1.0))
+            return streams
+
+        connection_created.connect(wrap)
+        tasks = []
+        try:
+            threads_before = threading.active_count()
+            self.stdout.write(f"🔌 Opening {len(students)} streams...")
+            started = time.perf_counter()
+            streams = await open_streams(students)
+            open_seconds = time.perf_counter() - started
+
+            self.stdout.write(f"💤 Holding them idle for {options['idle']:g}s...")
+            queries_before, lag = queries, []
+            idle_until = time.perf_counter() + options['idle']
+            while time.perf_counter() < idle_until:
+                # How late the loop wakes us is how late it would serve a new request
+                tick = time.perf_counter()
+                await asyncio.sleep(0.1)
+                lag.append(time.perf_counter() - tick - 0.1)
+            idle_queries = queries - queries_before
+
+            # tracemalloc slows everything down, so only a sample is traced, after the timings
+            sample = students[:MEMORY_SAMPLE]
+            tracemalloc.start()
+            memory_before = tracemalloc.get_traced_memory()[0]
+            streams += await open_streams(sample)
+            memory_per_stream = (tracemalloc.get_traced_memory()[0] - memory_before) / len(sample)
+            tracemalloc.stop()
+
+            self.stdout.write(f"📣 Publishing {options['reviews']} status changes...")
+            fan_out = await self.publish(streams, students + sample, options['reviews'])
+
+            for stream in streams:
+                stream.closing.set()
+            await asyncio.gather(*tasks)
+        finally:
+            connection_created.disconnect(wrap)
+
+        return {
+            'connections': len(students),
+            'open_seconds': open_seconds,
+            'first_byte': loadtest.RouteResult(
+                'open', latencies=[stream.first_byte - stream.started for stream in streams[:len(students)]]
+            ),
+            'memory_per_stream': memory_per_stream,
+            'threads': threading.active_count() - threads_before,
+            'idle_queries_per_second': idle_queries / options['idle'],
+            'pings': sum(stream.pings for stream in streams),
+            'lag': loadtest.RouteResult('lag', latencies=lag),
+            'fan_out': fan_out,
+            'left_subscribed': len(status_feed),
+        }
+
+    async def publish(self, streams, students, count):
+        """Flip the status of ``count`` students' applications; returns the delivery latencies."""
+        by_student = {}
+        for stream, student in zip(streams, students):
+            by_student.setdefault(student.pk, []).append(stream)
+        applications = await sync_to_async(list)(
+            Application.objects.filter(student_id__in=by_student, status__in=['SUBMITTED', 'UNDER_REVIEW'])
+            .order_by('student_id')[:count * 4]
+        )
+        picked, seen = [], set()
+        for application in applications:
+            if application.student_id not in seen and len(picked) < count:
+                seen.add(application.student_id)
+                picked.append(application)
+
+        latencies = []
+        for application in picked:
+            watching = by_student[application.student_id]
+            before = [len(stream.events) for stream in watching]
+            application.status = 'SHORTLISTED' if application.status == 'UNDER_REVIEW' else 'UNDER_REVIEW'
+            published = time.perf_counter()
+            await sync_to_async(application.save)()
+            deadline = published + 5
+            while time.perf_counter() < deadline and any(
+                len(stream.events) == seen_before for stream, seen_before in zip(watching, before)
+            ):
+                await asyncio.sleep(0.001)
+            latencies.extend(
+                stream.events[seen_before] - published
+                for stream, seen_before in zip(watching, before) if len(stream.events) > seen_before
+            )
+        return loadtest.RouteResult('fan_out', latencies=latencies)
+
+    def report(self, report, options):
+        self.stdout.write(self.style.SUCCESS('\n' + '='*60))
+        self.stdout.write(self.style.SUCCESS(
+            f"📡 IDLE STATUS STREAMS: {report['connections']} in one worker, "
+            f"polling every {options['poll_interval']:g}s"
+        ))
+        self.stdout.write(self.style.SUCCESS('='*60))
+        first_byte, lag, fan_out = report['first_byte'], report['lag'], report['fan_out']
+        self.stdout.write(f"{'Opened all streams in':<36}{report['open_seconds']:>10.2f} s")
+        self.stdout.write(f"{'First byte p50 / p95':<36}{first_byte.percentile(0.5):>10.1f} / {first_byte.percentile(0.95):.1f} ms")
+        self.stdout.write(f"{'Python memory per open stream':<36}{report['memory_per_stream'] / 1024:>10.1f} KB")
+        self.stdout.write(f"{'Extra threads':<36}{report['threads']:>10}")
+        self.stdout.write(f"{'Poll queries while idle':<36}{report['idle_queries_per_second']:>10.1f} /s")
+        self.stdout.write(f"{'Keep-alive comments sent':<36}{report['pings']:>10}")
+        self.stdout.write(f"{'Event loop lag p50 / max':<36}{lag.percentile(0.5):>10.1f} / {max(lag.latencies) * 1000:.1f} ms")
+        self.stdout.write(
+            f"{'Review to dashboard p50 / p95':<36}{fan_out.percentile(0.5):>10.1f} / {fan_out.percentile(0.95):.1f} ms"
+            f" ({len(fan_out.latencies)} deliveries)"
+        )
+        if report['left_subscribed']:
+            self.stdout.write(self.style.ERROR(f"❌ {report['left_subscribed']} streams still subscribed after disconnect"))
+        if connection.vendor == 'sqlite':
+            self.stdout.write(self.style.WARNING(
+                '⚠️ Polls run against a local SQLite file here; against MySQL each poll is a network round trip.'
+            ))
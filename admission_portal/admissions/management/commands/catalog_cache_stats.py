@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from admissions.catalog import page_cache_stats, reset_page_cache_stats
+
+
+class Command(BaseCommand):
+    help = 'Report the hit ratio of the cached course catalog pages'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Zero the counters after reporting them'
+        )
+
+    def handle(self, *args, **options):
+        stats = page_cache_stats()
+        self.stdout.write(
+            f"📊 Catalog page cache: {stats['hits']} hits, {stats['misses']} misses, "
+            f"{stats['ratio']:.1%} hit ratio"
+        )
+        if options['reset']:
+            reset_page_cache_stats()
+            self.stdout.write(self.style.SUCCESS('✓ Counters reset'))
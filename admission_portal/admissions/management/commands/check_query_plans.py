@@ -0,0 +1,167 @@
+import json
+import random
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from admissions import loadtest
+from admissions.models import PENDING_STATUSES, Application, Course
+from admissions.pagination import KeysetPaginator
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN the main queryset of every application view and fail on full table scans'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=20000,
+            help='Applications to seed into a throwaway test database before explaining (default: 20000)'
+        )
+        parser.add_argument(
+            '--no-seed',
+            action='store_true',
+            help='Explain against the existing data instead of a seeded dataset'
+        )
+
+    def handle(self, *args, **options):
+        if options['no_seed']:
+            failures = self.check_plans(options['verbosity'])
+        else:
+            # Seeded rows go to a test database: ANALYZE TABLE commits implicitly on
+            # MySQL, so a transaction can't be relied on to take them back out
+            with loadtest.test_database():
+                self.seed(options['rows'])
+                failures = self.check_plans(options['verbosity'])
+
+        if failures:
+            raise CommandError(f'{len(failures)} query plan(s) degraded to a full table scan')
+        self.stdout.write(self.style.SUCCESS('✅ All view querysets use an index'))
+
+    def check_plans(self, verbosity):
+        """EXPLAIN every view queryset; returns the names of those that scan the applications table."""
+        failures = []
+        self.analyze()
+        for name, queryset in self.view_querysets():
+            plan = queryset.explain(**self.explain_options())
+            # Small lookup tables joined by primary key may be scanned; the applications table may not
+            scans = [table for table in self.full_scans(plan) if table == Application._meta.db_table]
+            if scans:
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(f'  ❌ {name}: full scan of {scans[0]}'))
+            else:
+                self.stdout.write(self.style.SUCCESS(f'  ✓ {name}'))
+            if verbosity > 1:
+                self.stdout.write(plan)
+        return failures
+
+    def view_querysets(self):
+        student_id = Application.objects.values_list('student_id', flat=True).first()
+        course_id = Course.objects.values_list('id', flat=True).first()
+        application_id = Application.objects.values_list('id', flat=True).first()
+        listing = Application.objects.for_listing()
+        queue_order = ('-submission_date', '-created_at')
+
+        return [
+            ('manage_applications (pending)',
+             listing.matching_filters({}).order_by(*queue_order)[:5]),
+            ('manage_applications (show all)',
+             listing.matching_filters({'show_all': 'true'}).order_by(*queue_order)[:5]),
+            ('manage_applications (status filter)',
+             listing.matching_filters({'show_all': 'true', 'status': 'APPROVED'}).order_by(*queue_order)[:5]),
+            ('manage_applications (course filter)',
+             listing.matching_filters({'course': course_id}).order_by(*queue_order)[:5]),
+            ('manage_applications (cursor)',
+             listing.matching_filters({'show_all': 'true'}).order_by(*KeysetPaginator.ordering)[:6]),
+            ('dashboard_officer (recent)',
+             listing.filter(status='SUBMITTED').order_by('-submission_date')[:5]),
+            ('dashboard_student',
+             listing.filter(student_id=student_id).order_by('-created_at')[:3]),
+            ('apply_for_course (already applied)',
+             Application.objects.filter(student_id=student_id, course_id=course_id)[:1]),
+            ('apply_for_course (active count)',
+             Application.objects.filter(student_id=student_id, status__in=PENDING_STATUSES)),
+            ('review_application',
+             Application.objects.for_detail().filter(pk=application_id)),
+        ]
+
+    def explain_options(self):
+        if connection.vendor == 'mysql':
+            return {'format': 'json'}
+        return {}
+
+    def full_scans(self, plan):
+        """Tables the plan reads without any index."""
+        if connection.vendor == 'sqlite':
+            scans = []
+            for line in plan.splitlines():
+                detail = line.split('SCAN ', 1)
+                if len(detail) == 2 and 'USING' not in detail[1]:
+                    scans.append(detail[1].split()[0])
+            return scans
+        if connection.vendor == 'mysql':
+            return [table['table_name'] for table in self.mysql_tables(json.loads(plan)) if table.get('access_type') == 'ALL']
+        if connection.vendor == 'postgresql':
+            return [line.split('Seq Scan on ', 1)[1].split()[0] for line in plan.splitlines() if 'Seq Scan on ' in line]
+        return []
+
+    def mysql_tables(self, node):
+        if isinstance(node, dict):
+            if 'table_name' in node:
+                yield node
+            for value in node.values():
+                yield from self.mysql_tables(value)
+        elif isinstance(node, list):
+            for value in node:
+                yield from self.mysql_tables(value)
+
+    def analyze(self):
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                cursor.execute('ANALYZE')
+            elif connection.vendor == 'mysql':
+                cursor.execute(f'ANALYZE TABLE {Application._meta.db_table}, {Course._meta.db_table}')
+            elif connection.vendor == 'postgresql':
+                cursor.execute('ANALYZE')
+
+    def seed(self, rows):
+        """Bulk-insert a realistic spread of courses, students and applications."""
+        rng = random.Random(42)
+        self.stdout.write(f'🌱 Seeding {rows} applications...')
+        courses = Course.objects.bulk_create([
+            Course(
+                code=f'PLAN{i:04d}', name=f'Plan Course {i}', department=f'Department {i % 20}',
+                description='-', duration=3, course_type='UG', total_seats=100,
+                min_percentage=50, eligibility_criteria='-', fee_per_year=1000,
+            )
+            for i in range(max(rows // 200, 10))
+        ])
+        course_ids = list(Course.objects.filter(code__startswith='PLAN').values_list('id', flat=True))
+        User.objects.bulk_create(
+            [User(username=f'plan_student_{i}', password='!') for i in range(max(rows // 2, 1))],
+            batch_size=1000,
+        )
+        student_ids = list(User.objects.filter(username__startswith='plan_student_').values_list('id', flat=True))
+        statuses = [status for status, _ in Application.APPLICATION_STATUS]
+        now = timezone.now()
+
+        pairs = set()
+        applications = []
+        while len(applications) < rows and len(pairs) < len(student_ids) * len(courses):
+            pair = (rng.choice(student_ids), rng.choice(course_ids))
+            if pair in pairs:
+                continue
+            pairs.add(pair)
+            status = rng.choice(statuses)
+            applications.append(Application(
+                student_id=pair[0], course_id=pair[1], application_number=f'PLAN{len(applications):010d}',
+                previous_school='-', previous_qualification='12th', percentage_obtained=rng.uniform(40, 100),
+                year_of_passing=2024, date_of_birth=date(2005, 1, 1), address='-', phone='0', emergency_contact='0',
+                status=status,
+                submission_date=None if status == 'DRAFT' else now - timedelta(minutes=rng.randint(0, 500000)),
+            ))
+        Application.objects.bulk_create(applications, batch_size=2000)
@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from admissions.export import FORMATS, export_rows
+from admissions.forms import ApplicationFilterForm
+
+
+class Command(BaseCommand):
+    help = 'Export applications to CSV or XLSX with the same filters as the officer queue'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--format',
+            choices=sorted(FORMATS),
+            default='csv',
+            help='Output format (default: csv)'
+        )
+        parser.add_argument(
+            '--output',
+            help='File to write (default: stdout, CSV only)'
+        )
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Include reviewed applications, not only the pending queue'
+        )
+        parser.add_argument('--status', help='Only applications with this status')
+        parser.add_argument('--course', help='Only applications for this course id')
+        parser.add_argument('--date-from', help='Submitted on or after this date (YYYY-MM-DD)')
+        parser.add_argument('--date-to', help='Submitted on or before this date (YYYY-MM-DD)')
+
+    def handle(self, *args, **options):
+        params = {
+            'show_all': 'true' if options['all'] else 'false',
+            'status': options['status'] or '',
+            'course': options['course'] or '',
+            'date_from': options['date_from'] or '',
+            'date_to': options['date_to'] or '',
+        }
+        form = ApplicationFilterForm(params)
+        if not form.is_valid():
+            raise CommandError(f'Invalid filters: {form.errors.as_text()}')
+        if options['format'] == 'xlsx' and not options['output']:
+            raise CommandError('--output is required for xlsx exports')
+
+        writer, _ = FORMATS[options['format']]
+        chunks = writer(export_rows(params))
+        if not options['output']:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
+            return
+
+        mode, encoding = ('w', 'utf-8') if options['format'] == 'csv' else ('wb', None)
+        with open(options['output'], mode, encoding=encoding, newline='' if encoding else None) as output:
+            for chunk in chunks:
+                output.write(chunk)
+        self.stderr.write(self.style.SUCCESS(f"✅ Exported applications to {options['output']}"))
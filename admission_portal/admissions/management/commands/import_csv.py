@@ -0,0 +1,66 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from admissions.importing import BATCH_SIZE, import_applications, import_courses
+from admissions.models import Application
+
+
+class Command(BaseCommand):
+    help = 'Bulk import courses or applications from a CSV file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=['courses', 'applications'], help='What the CSV contains')
+        parser.add_argument('path', help='CSV file with a header row')
+        parser.add_argument(
+            '--status',
+            choices=[status for status, _ in Application.APPLICATION_STATUS],
+            default='SUBMITTED',
+            help='Status of imported applications (default: SUBMITTED)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help=f'Rows validated and inserted per transaction (default: {BATCH_SIZE})'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Validate every row without writing anything'
+        )
+        parser.add_argument(
+            '--errors',
+            help='Write the per-row error report to this CSV file'
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+
+        try:
+            with open(options['path'], encoding='utf-8-sig', newline='') as stream:
+                if options['kind'] == 'courses':
+                    result = import_courses(stream, options['dry_run'], options['batch_size'])
+                else:
+                    result = import_applications(stream, options['status'], options['dry_run'], options['batch_size'])
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        verb = 'Validated' if result.dry_run else 'Imported'
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {verb} {result.created} of {result.rows} {result.kind} rows '
+            f'in {result.elapsed:.1f}s ({result.rows_per_second:.0f} rows/sec)'
+        ))
+        if result.users_created:
+            self.stdout.write(f'👤 {result.users_created} new student account(s) (no usable password yet)')
+
+        if result.errors:
+            self.stdout.write(self.style.WARNING(f'⚠️ {len(result.errors)} error(s) in {len({e.line for e in result.errors})} row(s)'))
+            if options['errors']:
+                with open(options['errors'], 'w', encoding='utf-8', newline='') as report:
+                    result.write_error_report(report)
+                self.stdout.write(f"   Error report written to {options['errors']}")
+            else:
+                for error in result.errors[:20]:
+                    self.stdout.write(f'   line {error.line}, {error.field}: {error.message}')
+                if len(result.errors) > 20:
+                    self.stdout.write('   ... use --errors to write the full report')
@@ -0,0 +1,156 @@
+import json
+import platform
+from io import StringIO
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from admissions import loadtest
+
+
+class Command(BaseCommand):
+    help = 'Seed a throwaway database and load-test every admissions route through the test client'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'routes',
+            nargs='*',
+            help='URL names to test (default: every route in admissions/urls.py)'
+        )
+        parser.add_argument(
+            '--scale',
+            type=int,
+            default=5,
+            help='populate_sample_data --scale for the seeded dataset (default: 5)'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=2026,
+            help='Random seed for the dataset and the requests (default: 2026)'
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=50,
+            help='Timed requests per route (default: 50)'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=8,
+            help='Concurrent client threads (default: 8)'
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=2,
+            help='Untimed requests sent first on each route (default: 2)'
+        )
+        parser.add_argument(
+            '--output',
+            help='Write the results as a JSON baseline to this file'
+        )
+        parser.add_argument(
+            '--compare',
+            help='Compare against a JSON baseline from an earlier run; exits non-zero on regressions'
+        )
+        parser.add_argument(
+            '--tolerance',
+            type=float,
+            default=20.0,
+            help='Allowed p95 slowdown against --compare, in percent (default: 20)'
+        )
+
+    def handle(self, *args, **options):
+        missing = loadtest.missing_routes()
+        if missing:
+            raise CommandError(f"❌ No load-test scenario for route(s): {', '.join(missing)} (see admissions/loadtest.py)")
+        names = options['routes'] or list(loadtest.ROUTES)
+        unknown = [name for name in names if name not in loadtest.ROUTES]
+        if unknown:
+            raise CommandError(f"Unknown route(s): {', '.join(unknown)}")
+        if options['requests'] < 1 or options['concurrency'] < 1 or options['scale'] < 1:
+            raise CommandError('--requests, --concurrency and --scale must be positive')
+        previous = None
+        if options['compare']:
+            with open(options['compare']) as f:
+                previous = json.load(f)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"\n🌱 Seeding test database ({connection.vendor}, scale {options['scale']}, seed {options['seed']})..."
+        ))
+        output = self.stdout if options['verbosity'] > 1 else StringIO()
+        with loadtest.throwaway_database(options['scale'], options['seed'], stdout=output):
+            report = self.run_load_test(names, options)
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"💾 Baseline written to {options['output']}"))
+        if previous is not None:
+            self.compare(previous, report, options['tolerance'])
+
+    def run_load_test(self, names, options):
+        ctx = loadtest.LoadContext(options['seed'])
+
+        self.stdout.write(self.style.SUCCESS('\n' + '='*96))
+        self.stdout.write(self.style.SUCCESS(
+            f"🏋️ LOAD TEST: {options['requests']} requests/route, {options['concurrency']} threads"
+        ))
+        self.stdout.write(self.style.SUCCESS('='*96))
+        self.stdout.write(
+            f"{'Route':<24}{'Reqs':>6}{'Errs':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}{'SQL/req':>9}{'SQL max':>9}"
+        )
+
+        def progress(result):
+            row = result.summary()
+            line = (
+                f"{result.name:<24}{row['requests']:>6}{row['errors']:>6}{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}"
+                f"{row['p99_ms']:>10.1f}{row['rps']:>10.1f}{row['queries_mean']:>9.1f}{row['queries_max']:>9}"
+            )
+            self.stdout.write(self.style.ERROR(line) if result.errors else line)
+
+        results = loadtest.run(
+            ctx, names, options['requests'], options['concurrency'], options['warmup'], progress=progress
+        )
+        report = loadtest.baseline(
+            results,
+            created=timezone.now().isoformat(),
+            database=connection.vendor,
+            django=django.get_version(),
+            python=platform.python_version(),
+            scale=options['scale'],
+            seed=options['seed'],
+            requests=options['requests'],
+            concurrency=options['concurrency'],
+        )
+        total = report['total']
+        self.stdout.write('-'*96)
+        self.stdout.write(
+            f"{'TOTAL':<24}{total['requests']:>6}{total['errors']:>6}{total['p50_ms']:>10.1f}{total['p95_ms']:>10.1f}"
+            f"{total['p99_ms']:>10.1f}{total['rps']:>10.1f}{total['queries_mean']:>9.1f}{total['queries_max']:>9}"
+        )
+        failing = [name for name, row in report['routes'].items() if row['errors']]
+        if failing:
+            self.stdout.write(self.style.WARNING(f"⚠️ Routes with errors: {', '.join(failing)}"))
+        return report
+
+    def compare(self, previous, report, tolerance):
+        rows, regressions = loadtest.compare(previous, report, tolerance / 100)
+        self.stdout.write(self.style.SUCCESS('\n📊 Compared with baseline'))
+        self.stdout.write(f"{'Route':<24}{'p95 before':>12}{'p95 now':>10}{'change':>9}{'SQL before':>12}{'SQL now':>9}")
+        for name, before, now, change in rows:
+            if before is None:
+                self.stdout.write(f"{name:<24}{'-':>12}{now['p95_ms']:>10.1f}{'new':>9}{'-':>12}{now['queries_mean']:>9.1f}")
+                continue
+            line = (
+                f"{name:<24}{before['p95_ms']:>12.1f}{now['p95_ms']:>10.1f}{change:>+9.0%}"
+                f"{before['queries_mean']:>12.1f}{now['queries_mean']:>9.1f}"
+            )
+            self.stdout.write(self.style.ERROR(line) if name in regressions else line)
+        if regressions:
+            raise CommandError(f"❌ Regressions against the baseline: {', '.join(regressions)}")
+        self.stdout.write(self.style.SUCCESS('✅ No regressions against the baseline'))
@@ -1,11 +1,46 @@
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import User, Group
+from admissions.catalog import bump_catalog_version
+from admissions.eligibility import check_eligibility
 from admissions.models import Course, Application, SeatAllocation
+from admissions.numbering import assign_application_numbers
+from admissions.stats import adjust_status_counts
 from django.utils import timezone
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, IntegerField, Value, When
 import random
+import time
 from datetime import timedelta
 
+SCALE_USERNAME_PREFIX = 'scale_student_'
+SCALE_COURSE_PREFIX = 'SC'
+BATCH_SIZE = 5000
+
+FIRST_NAMES = [
+    'Aarav', 'Aditi', 'Arjun', 'Diya', 'Ishaan', 'Kavya', 'Meera', 'Nikhil', 'Priya', 'Rahul',
+    'Riya', 'Rohan', 'Sanjana', 'Tara', 'Vikram', 'John', 'Jane', 'Alice', 'Bob', 'Emily',
+]
+LAST_NAMES = [
+    'Sharma', 'Patel', 'Iyer', 'Reddy', 'Nair', 'Gupta', 'Singh', 'Rao', 'Menon', 'Das',
+    'Smith', 'Johnson', 'Williams', 'Brown', 'Davis',
+]
+DEPARTMENTS = [
+    'Computer Science', 'Mechanical Engineering', 'Electrical Engineering', 'Civil Engineering',
+    'Commerce', 'Business Administration', 'Physics', 'Chemistry', 'Mathematics', 'English', 'Law',
+]
+SUBJECTS = [
+    'Data Science', 'Robotics', 'Accounting', 'Finance', 'Marketing', 'Thermodynamics', 'Power Systems',
+    'Structural Design', 'Quantum Physics', 'Organic Chemistry', 'Statistics', 'Literature', 'Corporate Law',
+]
+# Status mix of generated applications (weights)
+SCALE_STATUSES = [('DRAFT', 10), ('SUBMITTED', 30), ('UNDER_REVIEW', 20), ('SHORTLISTED', 10), ('APPROVED', 15), ('REJECTED', 15)]
+
+
+def scale_username(index):
+    return f'{SCALE_USERNAME_PREFIX}{index:07d}'
+
+
 class Command(BaseCommand):
     help = 'Populate database with sample data for testing'
 
@@ -40,6 +75,17 @@ class Command(BaseCommand):
             default='password123',
             help='Default password for all test users (default: password123)'
         )
+        parser.add_argument(
+            '--scale',
+            type=int,
+            help='Generate a production-sized dataset instead: 1000 students, 10 courses '
+                 'and ~2000 applications per unit of scale'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            help='Random seed, so the same data is generated on every run'
+        )
 
     def handle(self, *args, **options):
         """Main command handler"""
@@ -55,12 +101,24 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS('🚀 STARTING SAMPLE DATA POPULATION'))
         self.stdout.write(self.style.SUCCESS('='*60))
         
+        if options['seed'] is not None:
+            random.seed(options['seed'])
+
         # Clear existing data if requested
         if clear_existing:
             self.clear_existing_data()
         
         # Create groups
         self.create_groups()
+
+        if options['scale'] is not None:
+            self.populate_at_scale(options['scale'], options['seed'], default_password, num_officers)
+            officer = (
+                User.objects.filter(groups__name='Admission Officers').order_by('username')
+                .values_list('username', flat=True).first()
+            )
+            self.show_summary(scale_username(0), officer, default_password)
+            return
         
         # Create sample courses
         self.create_sample_courses(num_courses)
@@ -73,7 +131,7 @@ class Command(BaseCommand):
         self.create_sample_applications()
         
         # Show summary
-        self.show_summary()
+        self.show_summary('john_doe', 'officer1', default_password)
 
     def clear_existing_data(self):
         """Clear all existing sample data"""
@@ -85,6 +143,8 @@ class Command(BaseCommand):
         
         # Don't delete users - they might be needed
         # User.objects.filter(is_superuser=False).delete()
+        # ...except the generated --scale students
+        User.objects.filter(username__startswith=SCALE_USERNAME_PREFIX).delete()
         
         self.stdout.write(self.style.SUCCESS('✓ Existing data cleared'))
 
@@ -405,8 +465,181 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS(f'✓ Created {applications_created} new applications'))
         self.stdout.write(self.style.SUCCESS(f'✓ Created {seat_allocations_created} new seat allocations'))
 
-    def show_summary(self):
-        """Show summary of created data"""
+    def populate_at_scale(self, scale, seed, password, num_officers):
+        """Bulk-generate students, courses, applications and seat allocations"""
+        if scale < 1:
+            raise CommandError('--scale must be at least 1')
+        if User.objects.filter(username__startswith=SCALE_USERNAME_PREFIX).exists():
+            raise CommandError('Scale data already exists; rerun with --clear to regenerate it')
+
+        rng = random.Random(seed)
+        num_students = 1000 * scale
+        num_courses = 10 * scale
+        self.stdout.write(self.style.SUCCESS(
+            f'\n📈 Scale mode: {num_students} students, {num_courses} courses (seed: {seed})'
+        ))
+
+        self.create_sample_officers(num_officers, password)
+        courses = self.bulk_create_courses(rng, num_courses)
+        student_ids = self.bulk_create_students(rng, num_students, password)
+        self.bulk_create_applications(rng, student_ids, courses)
+        bump_catalog_version()
+
+    def report_phase(self, name, rows, elapsed):
+        rate = rows / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(f'  ✓ {name}: {rows} rows in {elapsed:.1f}s ({rate:,.0f} rows/sec)'))
+
+    def bulk_create_courses(self, rng, count):
+        started = time.perf_counter()
+        courses = []
+        for i in range(count):
+            department = rng.choice(DEPARTMENTS)
+            course_type = rng.choice(['UG', 'UG', 'PG', 'DIP'])
+            subject = rng.choice(SUBJECTS)
+            courses.append(Course(
+                code=f'{SCALE_COURSE_PREFIX}{i:06d}',
+                name=f'{dict(Course.COURSE_TYPES)[course_type]} in {department} ({subject})',
+                department=department,
+                course_type=course_type,
+                duration={'UG': rng.choice([3, 4]), 'PG': 2, 'DIP': 1}[course_type],
+                total_seats=rng.choice([30, 40, 60, 90, 120]),
+                min_percentage=rng.choice([50.0, 55.0, 60.0, 65.0, 70.0, 75.0]),
+                fee_per_year=rng.randint(20, 120) * 1000,
+                description=f'{subject} programme offered by the {department} department.',
+                eligibility_criteria='12th grade or equivalent' if course_type != 'PG' else "Bachelor's degree",
+            ))
+        Course.objects.bulk_create(courses, batch_size=BATCH_SIZE)
+        self.report_phase('Courses', count, time.perf_counter() - started)
+        return list(
+            Course.objects.filter(code__startswith=SCALE_COURSE_PREFIX)
+            .order_by('code')
+            .values_list('id', 'course_type', 'min_percentage', 'total_seats')
+        )
+
+    def bulk_create_students(self, rng, count, password):
+        started = time.perf_counter()
+        hashed = make_password(password)  # one hash shared by every generated student
+        student_group = Group.objects.get(name='Students')
+        for start in range(0, count, BATCH_SIZE):
+            users = []
+            for i in range(start, min(start + BATCH_SIZE, count)):
+                first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+                username = scale_username(i)
+                users.append(User(
+                    username=username, first_name=first, last_name=last,
+                    email=f'{username}@example.com', password=hashed,
+                ))
+            with transaction.atomic():
+                User.objects.bulk_create(users)
+        student_ids = list(
+            User.objects.filter(username__startswith=SCALE_USERNAME_PREFIX).order_by('username').values_list('id', flat=True)
+        )
+        Membership = User.groups.through
+        for start in range(0, len(student_ids), BATCH_SIZE):
+            Membership.objects.bulk_create([
+                Membership(user_id=user_id, group_id=student_group.pk)
+                for user_id in student_ids[start:start + BATCH_SIZE]
+            ])
+        self.report_phase('Students', count, time.perf_counter() - started)
+        return student_ids
+
+    def bulk_create_applications(self, rng, student_ids, courses):
+        started = time.perf_counter()
+        officer_ids = list(User.objects.filter(groups__name='Admission Officers').values_list('id', flat=True))
+        statuses, weights = zip(*SCALE_STATUSES)
+        capacity = {course_id: seats for course_id, _, _, seats in courses}
+        filled = {}
+        now = timezone.now()
+        total_applications = 0
+        total_seats = 0
+        # Seats are written chunk by chunk alongside the applications; their time is kept apart
+        seat_seconds = 0.0
+
+        # Generate and insert one chunk of students' applications at a time
+        chunk_students = BATCH_SIZE // 2
+        for start in range(0, len(student_ids), chunk_students):
+            applications = []
+            seat_candidates = []
+            for student_id in student_ids[start:start + chunk_students]:
+                seated = False
+                for course_id, course_type, min_percentage, _ in rng.sample(courses, rng.randint(1, 3)):
+                    status = rng.choices(statuses, weights)[0]
+                    percentage = round(rng.uniform(max(30, min_percentage - 15), min(100, min_percentage + 20)), 2)
+                    is_eligible, eligibility_notes = check_eligibility(percentage, min_percentage)
+                    application = Application(
+                        student_id=student_id,
+                        course_id=course_id,
+                        previous_school=f'{rng.choice(["City", "Central", "Public", "International"])} School #{rng.randint(1, 500)}',
+                        previous_qualification="Bachelor's Degree" if course_type == 'PG' else '12th Grade',
+                        percentage_obtained=percentage,
+                        year_of_passing=rng.randint(2018, 2024),
+                        date_of_birth=now.date() - timedelta(days=rng.randint(18 * 365, 25 * 365)),
+                        address=f'{rng.randint(1, 999)} {rng.choice(["Main St", "Park Ave", "Oak Road", "College Lane"])}',
+                        phone=f'9{rng.randint(0, 999999999):09d}',
+                        emergency_contact=f'8{rng.randint(0, 999999999):09d}',
+                        status=status,
+                        is_eligible=is_eligible,
+                        eligibility_notes=eligibility_notes,
+                        submission_date=None if status == 'DRAFT' else now - timedelta(minutes=rng.randint(1, 60 * 24 * 60)),
+                    )
+                    applications.append(application)
+                    # At most one seat per student, and never past a course's capacity
+                    if status == 'APPROVED' and is_eligible and not seated and capacity[course_id] > 0 and officer_ids:
+                        capacity[course_id] -= 1
+                        seated = True
+                        seat_candidates.append(application)
+
+            with transaction.atomic():
+                assign_application_numbers(applications)
+                Application.objects.bulk_create(applications)
+                counts = {}
+                for application in applications:
+                    counts[application.status] = counts.get(application.status, 0) + 1
+                adjust_status_counts(counts)
+
+                if seat_candidates:
+                    seats_started = time.perf_counter()
+                    # Not every backend returns primary keys from bulk_create
+                    ids = dict(
+                        Application.objects
+                        .filter(application_number__in=[a.application_number for a in seat_candidates])
+                        .values_list('application_number', 'id')
+                    )
+                    SeatAllocation.objects.bulk_create([
+                        SeatAllocation(
+                            application_id=ids[a.application_number],
+                            course_id=a.course_id,
+                            allocated_by_id=rng.choice(officer_ids),
+                            is_confirmed=rng.random() < 0.5,
+                            confirmation_deadline=now.date() + timedelta(days=rng.randint(7, 21)),
+                        )
+                        for a in seat_candidates
+                    ])
+                    for a in seat_candidates:
+                        filled[a.course_id] = filled.get(a.course_id, 0) + 1
+                    seat_seconds += time.perf_counter() - seats_started
+
+            total_applications += len(applications)
+            total_seats += len(seat_candidates)
+        self.report_phase('Applications', total_applications, time.perf_counter() - started - seat_seconds)
+
+        # filled_seats follows the generated allocations exactly
+        started = time.perf_counter()
+        course_ids = list(filled)
+        for start in range(0, len(course_ids), 500):
+            batch = course_ids[start:start + 500]
+            Course.objects.filter(pk__in=batch).update(
+                filled_seats=F('filled_seats') + Case(
+                    *[When(pk=course_id, then=Value(filled[course_id])) for course_id in batch],
+                    default=Value(0),
+                    output_field=IntegerField(),
+                ),
+                updated_at=now,
+            )
+        self.report_phase('Seat allocations', total_seats, seat_seconds + time.perf_counter() - started)
+
+    def show_summary(self, student_username, officer_username, password):
+        """Show summary of created data and a student and officer to log in as"""
         self.stdout.write(self.style.SUCCESS('\n' + '='*60))
         self.stdout.write(self.style.SUCCESS('📊 SUMMARY'))
         self.stdout.write(self.style.SUCCESS('='*60))
@@ -425,8 +658,9 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS(f'🪑 Seat Allocations: {total_seats}'))
         
         self.stdout.write(self.style.SUCCESS('\n🔐 LOGIN CREDENTIALS:'))
-        self.stdout.write(self.style.SUCCESS('   Students: username: john_doe, password: password123'))
-        self.stdout.write(self.style.SUCCESS('   Officers: username: officer1, password: password123'))
+        self.stdout.write(self.style.SUCCESS(f'   Students: username: {student_username}, password: {password}'))
+        if officer_username:
+            self.stdout.write(self.style.SUCCESS(f'   Officers: username: {officer_username}, password: {password}'))
         
         self.stdout.write(self.style.SUCCESS('\n✅ Sample data population completed successfully!'))
         self.stdout.write(self.style.SUCCESS('='*60))
\ No newline at end of file
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from admissions.stats import rebuild_status_counters
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the materialized application status counters from scratch'
+
+    def handle(self, *args, **options):
+        drift = rebuild_status_counters()
+        if not drift:
+            self.stdout.write(self.style.SUCCESS('✓ Status counters were already consistent'))
+            return
+        for status, (stored, actual) in sorted(drift.items()):
+            self.stdout.write(self.style.WARNING(f'  ⚠️ {status}: {stored} -> {actual}'))
+        self.stdout.write(self.style.SUCCESS(f'✓ Reconciled {len(drift)} status counter(s)'))
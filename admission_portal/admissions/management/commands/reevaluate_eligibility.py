@@ -0,0 +1,61 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from admissions.eligibility import reevaluate_courses
+from admissions.models import Course
+
+
+class Command(BaseCommand):
+    help = "Re-check open applications against their course's current cutoff"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--course',
+            action='append',
+            dest='courses',
+            help='Course code to re-check (repeatable, default: all courses)'
+        )
+        parser.add_argument(
+            '--user',
+            type=str,
+            help='Username recorded on the eligibility audit'
+        )
+
+    def handle(self, *args, **options):
+        courses = None
+        if options['courses']:
+            codes = [code.upper() for code in options['courses']]
+            courses = list(Course.objects.filter(code__in=codes).values_list('code', 'id'))
+            missing = set(codes) - {code for code, _ in courses}
+            if missing:
+                raise CommandError(f'Unknown course code(s): {", ".join(sorted(missing))}')
+            courses = [course_id for _, course_id in courses]
+
+        user = None
+        if options['user']:
+            try:
+                user = User.objects.get(username=options['user'])
+            except User.DoesNotExist:
+                raise CommandError(f'Unknown user: {options["user"]}')
+
+        started = time.perf_counter()
+        audits = reevaluate_courses(courses, changed_by=user)
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(self.style.SUCCESS('\n' + '='*60))
+        self.stdout.write(self.style.SUCCESS('🔄 ELIGIBILITY RE-EVALUATION'))
+        self.stdout.write(self.style.SUCCESS('='*60))
+        for audit in audits:
+            if audit.became_eligible or audit.became_ineligible:
+                self.stdout.write(
+                    f'  {audit.course.code:<12} cutoff: {audit.min_percentage:>6.2f}%  '
+                    f'checked: {audit.reevaluated:>6}  +{audit.became_eligible} / -{audit.became_ineligible}'
+                )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'\n✓ Re-checked {sum(a.reevaluated for a in audits)} applications in {len(audits)} course(s) '
+            f'in {elapsed:.2f}s: {sum(a.became_eligible for a in audits)} now eligible, '
+            f'{sum(a.became_ineligible for a in audits)} no longer eligible'
+        ))
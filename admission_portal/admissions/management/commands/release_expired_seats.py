@@ -0,0 +1,61 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from admissions.models import Course
+from admissions.reservations import EXPIRY_BATCH_SIZE, release_expired_seats
+
+
+class Command(BaseCommand):
+    help = 'Release unconfirmed seat allocations past their confirmation deadline'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=EXPIRY_BATCH_SIZE,
+            help=f'Allocations released per transaction (default: {EXPIRY_BATCH_SIZE})'
+        )
+        parser.add_argument(
+            '--no-promote',
+            action='store_true',
+            help='Leave freed seats empty instead of offering them to the waitlist'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep sweeping every --interval seconds instead of exiting (stop with Ctrl+C)'
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=300,
+            help='Seconds between sweeps with --loop (default: 300)'
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1 or options['interval'] < 1:
+            raise CommandError('--batch-size and --interval must be positive')
+
+        try:
+            while True:
+                self.sweep(options)
+                if not options['loop']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING('\n⏹️  Sweeper stopped'))
+
+    def sweep(self, options):
+        result = release_expired_seats(batch_size=options['batch_size'], promote=not options['no_promote'])
+        if not result.total_released:
+            self.stdout.write(self.style.SUCCESS('✓ No expired seat allocations'))
+            return
+
+        codes = dict(Course.objects.filter(pk__in=result.released).values_list('id', 'code'))
+        for course_id, seats in sorted(result.released.items(), key=lambda item: codes.get(item[0], '')):
+            self.stdout.write(f'  {codes.get(course_id, course_id)!s:<12} seats returned: {seats:>6}')
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Released {result.total_released} expired seat(s) in {result.batches} batch(es) '
+            f'in {result.elapsed:.2f}s; {result.promoted} given to waitlisted applications'
+        ))
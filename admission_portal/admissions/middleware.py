@@ -1,34 +1,80 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
 from django.shortcuts import redirect
 from django.contrib import messages
 from django.urls import reverse
+from .metrics import RequestSample, current_sample, install_query_recorder, registry
+from .roles import is_officer
+
+
+class SyncAndAsyncMiddleware:
+    """Base for middleware that runs natively under both WSGI and ASGI.
+
+    Under ASGI ``__acall__`` is used, so an async view is not pushed into a
+    thread just because this middleware is in the stack.
+    """
+    sync_capable = True
+    async_capable = True
 
-class RoleBasedAccessMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
-    
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
     def __call__(self, request):
-        officer_urls = [
-            '/officer/',
-            '/officer/dashboard/',
-            '/officer/applications/',
-            '/officer/application/',
-            '/officer/courses/',
-        ]
-        
-        admin_urls = [
-            '/admin/courses/',
-            '/admin/seats/',
-        ]
-        for url in officer_urls:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.handle(request)
+
+
+class RoleBasedAccessMiddleware(SyncAndAsyncMiddleware):
+    officer_urls = [
+        '/officer/',
+        '/officer/dashboard/',
+        '/officer/applications/',
+        '/officer/application/',
+        '/officer/courses/',
+    ]
+
+    admin_urls = [
+        '/admin/courses/',
+        '/admin/seats/',
+    ]
+
+    def handle(self, request):
+        denied = self.check_access(request)
+        if denied is not None:
+            return denied
+        response = self.get_response(request)
+        return response
+
+    async def __acall__(self, request):
+        # Only protected paths need the (sync) user and role lookups
+        if self.is_protected(request.path):
+            denied = await sync_to_async(self.check_access)(request)
+            if denied is not None:
+                return denied
+        return await self.get_response(request)
+
+    def is_protected(self, path):
+        return any(path.startswith(url) for url in self.officer_urls + self.admin_urls)
+
+    def check_access(self, request):
+        for url in self.officer_urls:
             if request.path.startswith(url):
                 if not request.user.is_authenticated:
                     messages.warning(request, '⚠️ Please login to access this page.')
                     return redirect('login')
-                if not request.user.groups.filter(name='Admission Officers').exists() and not request.user.is_superuser:
+                if not request.user.is_superuser and not is_officer(request):
                     messages.error(request, '⛔ Access denied. Officer privileges required.')
                     return redirect('home')
-                    
-        for url in admin_urls:
+
+        for url in self.admin_urls:
             if request.path.startswith(url):
                 if not request.user.is_authenticated:
                     messages.warning(request, '⚠️ Please login to access this page.')
@@ -36,6 +82,56 @@ class RoleBasedAccessMiddleware:
                 if not request.user.is_superuser:
                     messages.error(request, '⛔ Access denied. Administrator privileges required.')
                     return redirect('home')
-        
-        response = self.get_response(request)
-        return response
\ No newline at end of file
+        return None
+
+
+class MetricsMiddleware(SyncAndAsyncMiddleware):
+    """Record latency, SQL, template time and response size per URL name.
+
+    Disable with ``ADMISSIONS_METRICS = False``; the numbers are served by
+    the superuser-only ``metrics`` view.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'ADMISSIONS_METRICS', True):
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+        # Queries are attributed through a context variable, so a request's
+        # queries count wherever they run (worker threads included).
+        connection_created.connect(install_query_recorder, dispatch_uid='admissions_metrics')
+        for connection in connections.all(initialized_only=True):
+            install_query_recorder(connection=connection)
+
+    def handle(self, request):
+        sample = RequestSample()
+        token = current_sample.set(sample)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_sample.reset(token)
+        self.record(request, response, sample, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        sample = RequestSample()
+        token = current_sample.set(sample)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_sample.reset(token)
+        self.record(request, response, sample, time.perf_counter() - started)
+        return response
+
+    def record(self, request, response, sample, elapsed):
+        match = getattr(request, 'resolver_match', None)
+        values = {
+            'request_duration_seconds': elapsed,
+            'sql_queries': sample.queries,
+            'sql_duration_seconds': sample.sql_seconds,
+            'template_render_seconds': sample.template_seconds,
+        }
+        if not response.streaming:
+            values['response_size_bytes'] = len(response.content)
+        registry.observe(match.view_name if match else 'unresolved', values)
@@ -0,0 +1,20 @@
+# Generated by Django 6.0.2 on 2026-10-16 22:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admissions', '0002_alter_application_unique_together'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationSequence',
+            fields=[
+                ('year', models.PositiveIntegerField(primary_key=True, serialize=False)),
+                ('last_value', models.BigIntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 6.0.2 on 2026-10-16 22:41
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+STATUSES = ['DRAFT', 'SUBMITTED', 'UNDER_REVIEW', 'SHORTLISTED', 'REJECTED', 'APPROVED']
+
+
+def seed_counters(apps, schema_editor):
+    Application = apps.get_model('admissions', 'Application')
+    ApplicationStatusCounter = apps.get_model('admissions', 'ApplicationStatusCounter')
+    counts = dict(Application.objects.order_by().values_list('status').annotate(n=Count('id')))
+    ApplicationStatusCounter.objects.bulk_create(
+        ApplicationStatusCounter(status=status, count=counts.get(status, 0))
+        for status in STATUSES
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admissions', '0003_applicationsequence'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationStatusCounter',
+            fields=[
+                ('status', models.CharField(choices=[('DRAFT', 'Draft'), ('SUBMITTED', 'Submitted'), ('UNDER_REVIEW', 'Under Review'), ('SHORTLISTED', 'Shortlisted'), ('REJECTED', 'Rejected'), ('APPROVED', 'Approved')], max_length=20, primary_key=True, serialize=False)),
+                ('count', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(seed_counters, migrations.RunPython.noop),
+    ]
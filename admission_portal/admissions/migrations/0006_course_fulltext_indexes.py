@@ -0,0 +1,41 @@
+# Generated by Django 6.0.2 on 2026-10-16 23:40
+
+from django.db import migrations
+
+
+FULLTEXT_INDEXES = [
+    ('course_search_ft', ['code', 'name', 'department', 'eligibility_criteria', 'description']),
+    ('course_name_ft', ['code', 'name']),
+    ('course_department_ft', ['department']),
+]
+
+
+def add_fulltext_indexes(apps, schema_editor):
+    # FULLTEXT is MySQL only; other backends use the in-process search index.
+    if schema_editor.connection.vendor != 'mysql':
+        return
+    Course = apps.get_model('admissions', 'Course')
+    quote = schema_editor.quote_name
+    for name, fields in FULLTEXT_INDEXES:
+        columns = ', '.join(quote(Course._meta.get_field(field).column) for field in fields)
+        schema_editor.execute(f'ALTER TABLE {quote(Course._meta.db_table)} ADD FULLTEXT INDEX {quote(name)} ({columns})')
+
+
+def remove_fulltext_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'mysql':
+        return
+    Course = apps.get_model('admissions', 'Course')
+    quote = schema_editor.quote_name
+    for name, _ in FULLTEXT_INDEXES:
+        schema_editor.execute(f'ALTER TABLE {quote(Course._meta.db_table)} DROP INDEX {quote(name)}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admissions', '0005_application_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_fulltext_indexes, remove_fulltext_indexes),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 6.0.2 on 2026-10-17 00:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admissions', '0006_course_fulltext_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EligibilityAudit',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('previous_min_percentage', models.FloatField(blank=True, null=True)),
+                ('min_percentage', models.FloatField()),
+                ('reevaluated', models.IntegerField(default=0)),
+                ('became_eligible', models.IntegerField(default=0)),
+                ('became_ineligible', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('changed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='eligibility_audits', to='admissions.course')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 6.0.2 on 2026-10-17 00:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admissions', '0007_eligibilityaudit'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WaitlistEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('percentage_obtained', models.FloatField()),
+                ('submitted_at', models.DateTimeField()),
+                ('queued_at', models.DateTimeField(auto_now_add=True)),
+                ('application', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='waitlist_entry', to='admissions.application')),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='waitlist_entries', to='admissions.course')),
+            ],
+            options={
+                'ordering': ['course', '-percentage_obtained', 'submitted_at', 'application'],
+                'indexes': [models.Index(fields=['course', '-percentage_obtained', 'submitted_at', 'application'], name='waitlist_order_idx')],
+            },
+        ),
+    ]
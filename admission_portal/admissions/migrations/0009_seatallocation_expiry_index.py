@@ -0,0 +1,19 @@
+# Generated by Django 6.0.2 on 2026-10-17 01:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admissions', '0008_waitlistentry'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='seatallocation',
+            index=models.Index(fields=['is_confirmed', 'confirmation_deadline'], name='seat_expiry_idx'),
+        ),
+    ]
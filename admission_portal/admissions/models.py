@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
@@ -41,6 +41,36 @@ class Course(models.Model):
         ordering = ['code']
 
 
+PENDING_STATUSES = ['DRAFT', 'SUBMITTED', 'UNDER_REVIEW']
+
+
+class ApplicationQuerySet(models.QuerySet):
+    """Querysets shaped for the pages that render applications"""
+
+    def pending(self):
+        return self.filter(status__in=PENDING_STATUSES)
+
+    def matching_filters(self, params):
+        """Apply the officer queue filters (show_all, status, course, date_from, date_to)"""
+        applications = self if params.get('show_all') == 'true' else self.pending()
+        if params.get('status'):
+            applications = applications.filter(status=params['status'])
+        if params.get('course'):
+            applications = applications.filter(course_id=params['course'])
+        if params.get('date_from'):
+            applications = applications.filter(submission_date__date__gte=params['date_from'])
+        if params.get('date_to'):
+            applications = applications.filter(submission_date__date__lte=params['date_to'])
+        return applications
+
+    def for_listing(self):
+        # Every list template shows the student, course and reviewer per row
+        return self.select_related('student', 'course', 'reviewed_by')
+
+    def for_detail(self):
+        return self.select_related('student', 'course', 'reviewed_by', 'seat_allocation__allocated_by')
+
+
 class Application(models.Model):
     APPLICATION_STATUS = [
         ('DRAFT', 'Draft'),
@@ -71,21 +101,48 @@ class Application(models.Model):
     is_eligible = models.BooleanField(default=False)
     eligibility_notes = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = ApplicationQuerySet.as_manager()
     
     class Meta:
         ordering = ['-created_at']
         unique_together = ['student', 'course']
+        indexes = [
+            # officer queue and dashboard: status filter, newest submissions first
+            models.Index(fields=['status', 'submission_date', 'created_at'], name='application_status_sub_idx'),
+            # "show all" queue ordering and keyset cursors
+            models.Index(fields=['submission_date', 'created_at', 'id'], name='application_submitted_idx'),
+            models.Index(fields=['course', 'status'], name='application_course_status_idx'),
+            models.Index(fields=['student', 'status'], name='application_student_status_idx'),
+        ]
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored status so save() can keep the status counters in step
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+
     def save(self, *args, **kwargs):
         if not self.application_number:
-            year = timezone.now().year
-            last_app = Application.objects.filter(created_at__year=year).count()
-            self.application_number = f"APP{year}{last_app + 1:05d}"
+            from .numbering import application_numbers
+            self.application_number = application_numbers.next_number()
         
         if self.status == 'SUBMITTED' and not self.submission_date:
             self.submission_date = timezone.now()
-            
-        super().save(*args, **kwargs)
+
+        from .live import publish_status_changes
+        from .stats import adjust_status_counts
+        previous = None if self._state.adding else getattr(self, '_loaded_status', None)
+        if previous is None and not self._state.adding and self.pk:
+            previous = Application.objects.filter(pk=self.pk).values_list('status', flat=True).first()
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if previous != self.status:
+                adjust_status_counts({previous: -1, self.status: 1})
+                publish_status_changes([self.student_id])
+        self._loaded_status = self.status
     
    
     @classmethod
@@ -144,4 +201,67 @@ class SeatAllocation(models.Model):
         return f"Seat for {self.application.application_number}"
     
     class Meta:
-        ordering = ['-allocation_date']
\ No newline at end of file
+        ordering = ['-allocation_date']
+        indexes = [
+            # the expiry sweep: unconfirmed seats past their deadline
+            models.Index(fields=['is_confirmed', 'confirmation_deadline'], name='seat_expiry_idx'),
+        ]
+
+
+class WaitlistEntry(models.Model):
+    """An approved application waiting for a seat in its course.
+
+    Merit and submission time are copied from the application so the
+    queue order, and a position within it, come from one index.
+    """
+    application = models.OneToOneField(Application, on_delete=models.CASCADE, related_name='waitlist_entry')
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='waitlist_entries')
+    percentage_obtained = models.FloatField()
+    submitted_at = models.DateTimeField()
+    queued_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Waitlist {self.course_id}: {self.application_id}"
+
+    class Meta:
+        ordering = ['course', '-percentage_obtained', 'submitted_at', 'application']
+        indexes = [
+            # queue order within a course; positions are counted from it
+            models.Index(fields=['course', '-percentage_obtained', 'submitted_at', 'application'], name='waitlist_order_idx'),
+        ]
+
+
+class EligibilityAudit(models.Model):
+    """One re-evaluation of a course's applications against its cutoff."""
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='eligibility_audits')
+    previous_min_percentage = models.FloatField(null=True, blank=True)
+    min_percentage = models.FloatField()
+    reevaluated = models.IntegerField(default=0)
+    became_eligible = models.IntegerField(default=0)
+    became_ineligible = models.IntegerField(default=0)
+    changed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.course.code}: +{self.became_eligible} / -{self.became_ineligible} at {self.min_percentage}%"
+
+    class Meta:
+        ordering = ['-created_at']
+
+
+class ApplicationSequence(models.Model):
+    """Per-year counter behind ``Application.application_number``."""
+    year = models.PositiveIntegerField(primary_key=True)
+    last_value = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.year}: {self.last_value}"
+
+
+class ApplicationStatusCounter(models.Model):
+    """Materialized number of applications per status."""
+    status = models.CharField(max_length=20, primary_key=True, choices=Application.APPLICATION_STATUS)
+    count = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.status}: {self.count}"
@@ -0,0 +1,123 @@
+"""Application number generation.
+
+Numbers come from a per-year ``ApplicationSequence`` row bumped with a
+single atomic UPDATE, so issuing a number is O(1) no matter how many
+applications the year already holds and concurrent submissions can no
+longer collide on the unique ``application_number``.
+
+A worker process may reserve numbers in blocks
+(``ADMISSIONS_APPLICATION_NUMBER_BLOCK``) to take the counter row out of
+the hot path; unused numbers in a block are simply skipped when the
+process exits.
+"""
+import threading
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F, IntegerField, Max
+from django.db.models.functions import Cast, Substr
+from django.utils import timezone
+
+from .models import Application, ApplicationSequence
+
+
+def format_application_number(year, value):
+    # ``05d`` is a minimum width, so numbers past 99,999 simply grow longer.
+    return f"APP{year}{value:05d}"
+
+
+def _highest_issued(year):
+    # Seed a new year's counter past every number already issued. A COUNT(*) would
+    # fall behind once an application is deleted and reissue a taken number.
+    prefix = format_application_number(year, 0)[:-5]
+    highest = (
+        Application.objects.filter(application_number__startswith=prefix)
+        .annotate(value=Cast(Substr('application_number', len(prefix) + 1), IntegerField()))
+        .aggregate(highest=Max('value'))['highest']
+    )
+    return highest or 0
+
+
+def reserve_numbers(year, count=1):
+    """Atomically reserve ``count`` consecutive values for ``year``.
+
+    Returns ``(first, last)``. The UPDATE holds the counter row lock until
+    the surrounding transaction ends.
+    """
+    with transaction.atomic():
+        updated = ApplicationSequence.objects.filter(year=year).update(last_value=F('last_value') + count)
+        if not updated:
+            try:
+                with transaction.atomic():
+                    ApplicationSequence.objects.create(year=year, last_value=_highest_issued(year) + count)
+            except IntegrityError:
+                # Another worker created the row first.
+                ApplicationSequence.objects.filter(year=year).update(last_value=F('last_value') + count)
+        last = ApplicationSequence.objects.values_list('last_value', flat=True).get(year=year)
+    return last - count + 1, last
+
+
+class ApplicationNumberAllocator:
+    """Hands out application numbers, optionally from pre-reserved blocks."""
+
+    def __init__(self, block_size=None):
+        self._block_size = block_size
+        self._lock = threading.Lock()
+        self._blocks = {}
+
+    @property
+    def block_size(self):
+        if self._block_size is not None:
+            return self._block_size
+        return max(getattr(settings, 'ADMISSIONS_APPLICATION_NUMBER_BLOCK', 1), 1)
+
+    def next_number(self, year=None):
+        return self.take(1, year)[0]
+
+    def take(self, count, year=None):
+        """Return ``count`` formatted application numbers for ``year``."""
+        year = year or timezone.now().year
+        values = []
+        with self._lock:
+            values.extend(self._from_block(year, count))
+            missing = count - len(values)
+            if missing:
+                # A block reserved inside a transaction that later rolls back
+                # would hand out numbers another worker can reuse, so only
+                # pre-allocate when the reservation commits on its own.
+                reserve = missing
+                if not connection.in_atomic_block:
+                    reserve = max(missing, self.block_size)
+                first, last = reserve_numbers(year, reserve)
+                values.extend(range(first, first + missing))
+                if first + missing <= last:
+                    self._blocks[year] = [first + missing, last]
+        return [format_application_number(year, value) for value in values]
+
+    def _from_block(self, year, count):
+        block = self._blocks.get(year)
+        if not block:
+            return []
+        start, end = block
+        stop = min(start + count, end + 1)
+        if stop > end:
+            del self._blocks[year]
+        else:
+            block[0] = stop
+        return range(start, stop)
+
+    def reset(self):
+        with self._lock:
+            self._blocks.clear()
+
+
+application_numbers = ApplicationNumberAllocator()
+
+
+def assign_application_numbers(applications, year=None):
+    """Fill ``application_number`` on unsaved applications before ``bulk_create``."""
+    pending = [app for app in applications if not app.application_number]
+    if pending:
+        for app, number in zip(pending, application_numbers.take(len(pending), year)):
+            app.application_number = number
+    return applications
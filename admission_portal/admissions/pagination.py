@@ -0,0 +1,144 @@
+"""Keyset (cursor) pagination for the officer application queue.
+
+Pages are addressed by the ``(submission_date, created_at, id)`` key of
+their boundary rows instead of an OFFSET, so every page is one index
+range scan and no ``COUNT(*)`` is needed. Cursors are signed so they stay
+opaque and are bound to the filters they were issued for.
+
+The queue is ordered newest first. ``submission_date`` is nullable and,
+as on MySQL and SQLite, NULLs sort after every date in descending order.
+"""
+from datetime import datetime
+
+from django.core import signing
+from django.db.models import Q
+
+
+SALT = 'admissions.pagination.keyset'
+
+
+def _encode_datetime(value):
+    return value.isoformat() if value is not None else None
+
+
+def _decode_datetime(value):
+    return datetime.fromisoformat(value) if value is not None else None
+
+
+def _after(key):
+    """Rows that come after ``key`` in descending order."""
+    submitted, created, pk = key
+    later_in_group = Q(created_at__lt=created) | Q(created_at=created, id__lt=pk)
+    if submitted is None:
+        return Q(submission_date__isnull=True) & later_in_group
+    return (
+        Q(submission_date__lt=submitted)
+        | Q(submission_date=submitted) & later_in_group
+        | Q(submission_date__isnull=True)
+    )
+
+
+def _before(key):
+    """Rows that come before ``key`` in descending order."""
+    submitted, created, pk = key
+    earlier_in_group = Q(created_at__gt=created) | Q(created_at=created, id__gt=pk)
+    if submitted is None:
+        return Q(submission_date__isnull=False) | Q(submission_date__isnull=True) & earlier_in_group
+    return Q(submission_date__gt=submitted) | Q(submission_date=submitted) & earlier_in_group
+
+
+class KeysetPage:
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+class KeysetPaginator:
+    ordering = ('-submission_date', '-created_at', '-id')
+    reverse_ordering = ('submission_date', 'created_at', 'id')
+
+    def __init__(self, queryset, per_page, fingerprint=''):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.fingerprint = fingerprint
+
+    def _cursor(self, obj, direction):
+        key = [_encode_datetime(obj.submission_date), _encode_datetime(obj.created_at), obj.pk]
+        return signing.dumps({'k': key, 'd': direction, 'f': self.fingerprint}, salt=SALT, compress=True)
+
+    def _decode(self, token):
+        try:
+            payload = signing.loads(token, salt=SALT)
+            submitted, created, pk = payload['k']
+            if payload.get('f') != self.fingerprint or payload.get('d') not in ('next', 'prev'):
+                return None, None
+            return payload['d'], (_decode_datetime(submitted), _decode_datetime(created), int(pk))
+        except (signing.BadSignature, KeyError, TypeError, ValueError):
+            return None, None
+
+    def get_page(self, token=None):
+        """Return the page addressed by ``token``; bad or stale tokens give the first page."""
+        direction, key = self._decode(token) if token else (None, None)
+        limit = self.per_page + 1
+
+        if direction == 'prev':
+            rows = list(self.queryset.filter(_before(key)).order_by(*self.reverse_ordering)[:limit])
+            has_more = len(rows) > self.per_page
+            items = rows[:self.per_page][::-1]
+            if not items:
+                return KeysetPage([])
+            return KeysetPage(
+                items,
+                next_cursor=self._cursor(items[-1], 'next'),
+                previous_cursor=self._cursor(items[0], 'prev') if has_more else None,
+            )
+
+        queryset = self.queryset
+        if direction == 'next':
+            queryset = queryset.filter(_after(key))
+        rows = list(queryset.order_by(*self.ordering)[:limit])
+        has_more = len(rows) > self.per_page
+        items = rows[:self.per_page]
+        if not items:
+            return KeysetPage([])
+        return KeysetPage(
+            items,
+            next_cursor=self._cursor(items[-1], 'next') if has_more else None,
+            previous_cursor=self._cursor(items[0], 'prev') if direction == 'next' else None,
+        )
+
+
+def iterate_in_key_order(queryset, fields, batch_size=2000):
+    """Yield ``values_list(*fields)`` rows of ``queryset`` in queue order.
+
+    Rows are fetched one keyset batch at a time, so memory stays flat even
+    on MySQL, whose driver buffers a whole result set in the client
+    (``QuerySet.iterator()`` does not help there).
+    """
+    key_fields = ('submission_date', 'created_at', 'id')
+    queryset = queryset.order_by(*KeysetPaginator.ordering).values_list(*key_fields, *fields)
+    key = None
+    while True:
+        batch = queryset if key is None else queryset.filter(_after(key))
+        rows = list(batch[:batch_size])
+        for row in rows:
+            yield row[len(key_fields):]
+        if len(rows) < batch_size:
+            return
+        key = rows[-1][:len(key_fields)]
@@ -0,0 +1,171 @@
+"""Contention-safe seat reservation.
+
+A seat is taken with one conditional UPDATE on ``Course.filled_seats``
+so concurrent officers can never push a course past ``total_seats`` or
+lose an increment, and only the seat counter (plus ``updated_at``) is
+written instead of the whole ``Course`` row. The student's row is locked
+for the one-seat-per-student check, so two reservations in different
+courses can't both pass it. Seats are handed back the
+same way: ``release_seat`` for one allocation (``release_seats`` for
+several), ``release_expired_seats`` for every unconfirmed allocation
+past its deadline. Reviews call ``release_seats`` when a seated
+application leaves APPROVED.
+"""
+import time
+from dataclasses import dataclass, field
+
+from django.contrib.auth.models import User
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .applying import student_lock
+from .catalog import bump_catalog_version
+from .models import Course, SeatAllocation
+from .waitlist import promote_waitlist
+
+
+CONFIRMATION_DAYS = 14
+EXPIRY_BATCH_SIZE = 500
+
+
+class SeatReservationError(Exception):
+    """Base class for reservation failures, carrying a user-facing message."""
+
+
+class NoSeatsAvailable(SeatReservationError):
+    pass
+
+
+class StudentAlreadySeated(SeatReservationError):
+    pass
+
+
+def reserve_seat(application, allocated_by=None, confirmation_days=CONFIRMATION_DAYS, notes=''):
+    """Reserve one seat in ``application.course`` and record the allocation.
+
+    Raises ``NoSeatsAvailable`` when the course is full and
+    ``StudentAlreadySeated`` when the student already holds a seat.
+    """
+    with student_lock(application.student_id), transaction.atomic():
+        # Write first: on SQLite a read would take a shared lock the write then can't upgrade
+        taken = Course.objects.filter(
+            pk=application.course_id,
+            filled_seats__lt=F('total_seats'),
+        ).update(filled_seats=F('filled_seats') + 1, updated_at=timezone.now())
+        if not taken:
+            raise NoSeatsAvailable('⚠️ No seats available in this course.')
+
+        # Lock the student so a reservation in another course can't pass the check alongside this one.
+        # Raising rolls the increment back.
+        list(User.objects.select_for_update().filter(pk=application.student_id).values_list('pk'))
+        can_allocate, message = SeatAllocation.can_allocate(application)
+        if not can_allocate:
+            raise StudentAlreadySeated(message)
+
+        # A failed insert leaves the outer block and rolls the increment back.
+        try:
+            with transaction.atomic():
+                allocation = SeatAllocation.objects.create(
+                    application=application,
+                    course_id=application.course_id,
+                    allocated_by=allocated_by,
+                    confirmation_deadline=timezone.now().date() + timezone.timedelta(days=confirmation_days),
+                    notes=notes,
+                )
+        except IntegrityError:
+            raise StudentAlreadySeated('❌ This application already has an allocated seat')
+        bump_catalog_version(seats_only=True)
+    return allocation
+
+
+def release_seat(allocation):
+    """Delete ``allocation`` and hand its seat back to the course, or to the head of its waitlist."""
+    return bool(release_seats([allocation]))
+
+
+def release_seats(allocations):
+    """``release_seat`` for many allocations, promoting each course's waitlist once; returns how many were released."""
+    by_course = {}
+    for allocation in allocations:
+        by_course.setdefault(allocation.course_id, []).append(allocation.pk)
+    released = 0
+    with transaction.atomic():
+        now = timezone.now()
+        for course_id, ids in by_course.items():
+            deleted, _ = SeatAllocation.objects.filter(pk__in=ids).delete()
+            if deleted:
+                Course.objects.filter(pk=course_id).update(
+                    filled_seats=Greatest(F('filled_seats') - deleted, 0),
+                    updated_at=now,
+                )
+                released += deleted
+        if released:
+            bump_catalog_version(seats_only=True)
+            promote_waitlist(list(by_course))
+    return released
+
+
+@dataclass
+class ExpiryResult:
+    released: dict = field(default_factory=dict)  # course_id: seats handed back
+    promoted: int = 0
+    batches: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def total_released(self):
+        return sum(self.released.values())
+
+
+def release_expired_seats(today=None, batch_size=EXPIRY_BATCH_SIZE, promote=True):
+    """Release every unconfirmed allocation whose deadline is before ``today``.
+
+    Works through ``seat_expiry_idx`` in batches of ``batch_size``, each in
+    its own short transaction. Rows are locked with SKIP LOCKED where the
+    database supports it, so concurrent sweeps never fight over a batch,
+    and ``filled_seats`` moves by the rows each DELETE actually removed,
+    so nothing is handed back twice. The freed seats then go to the
+    waitlists unless ``promote`` is off.
+    """
+    today = today or timezone.localdate()
+    result = ExpiryResult()
+    started = time.perf_counter()
+    skip_locked = connection.features.has_select_for_update_skip_locked
+
+    while True:
+        with transaction.atomic():
+            rows = list(
+                SeatAllocation.objects
+                # __in keeps an indexable "is_confirmed = false"; Django writes
+                # is_confirmed=False as NOT is_confirmed, which seat_expiry_idx can't serve
+                .filter(is_confirmed__in=[False], confirmation_deadline__lt=today)
+                .select_for_update(skip_locked=skip_locked)
+                .order_by('confirmation_deadline', 'id')
+                .values_list('id', 'course_id')[:batch_size]
+            )
+            if not rows:
+                break
+            by_course = {}
+            for allocation_id, course_id in rows:
+                by_course.setdefault(course_id, []).append(allocation_id)
+            now = timezone.now()
+            for course_id, ids in by_course.items():
+                deleted, _ = SeatAllocation.objects.filter(pk__in=ids, is_confirmed=False).delete()
+                if deleted:
+                    Course.objects.filter(pk=course_id).update(
+                        filled_seats=Greatest(F('filled_seats') - deleted, 0),
+                        updated_at=now,
+                    )
+                    result.released[course_id] = result.released.get(course_id, 0) + deleted
+            bump_catalog_version(seats_only=True)
+        result.batches += 1
+
+        if promote:
+            result.promoted += promote_waitlist(list(by_course)).total_allocated
+        if len(rows) < batch_size:
+            break
+
+    result.elapsed = time.perf_counter() - started
+    return result
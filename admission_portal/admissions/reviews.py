@@ -0,0 +1,139 @@
+"""Bulk review of many applications in one request.
+
+``bulk_review`` moves every selected application to the action's status
+with set-based UPDATEs instead of one ``review_application`` POST each.
+The selection is locked and classified in one query, applications the
+action doesn't apply to are skipped with a reason, the status counters
+move by the same deltas, and seats are allocated in merit order by
+``allocate_merit_list`` when the action asks for it, with the rest
+joining the course waitlist, all in one transaction. Seated applications
+moved off APPROVED give their seats back through ``release_seats``.
+"""
+import time
+from dataclasses import dataclass, field
+
+from django.db import transaction
+from django.utils import timezone
+
+from .allocation import allocate_merit_list
+from .live import publish_status_changes
+from .models import Application, SeatAllocation, WaitlistEntry
+from .reservations import release_seats
+from .stats import adjust_status_counts
+from .waitlist import add_to_waitlist, remove_from_waitlist
+
+
+BATCH_SIZE = 1000
+
+# action: (label, new status, allocate seats)
+ACTIONS = {
+    'under_review': ('Mark under review', 'UNDER_REVIEW', False),
+    'shortlist': ('Shortlist', 'SHORTLISTED', False),
+    'approve': ('Approve', 'APPROVED', False),
+    'approve_and_allocate': ('Approve and allocate seats', 'APPROVED', True),
+    'reject': ('Reject', 'REJECTED', False),
+}
+
+SKIP_REASONS = {
+    'draft': 'not submitted yet',
+    'unchanged': 'already in that status',
+    'no_seat': 'approved without a seat or a waitlist place',
+}
+
+
+@dataclass
+class BulkReviewResult:
+    action: str
+    selected: int = 0
+    updated: int = 0
+    allocated: int = 0
+    waitlisted: int = 0
+    released: int = 0
+    skipped: dict = field(default_factory=dict)
+    elapsed: float = 0.0
+
+    def skip(self, reason, count=1):
+        self.skipped[reason] = self.skipped.get(reason, 0) + count
+
+    def summary(self):
+        """One line for the officer, e.g. '120 updated, 40 seats allocated, 3 skipped (not submitted yet)'"""
+        parts = [f'{self.updated} updated']
+        if ACTIONS[self.action][2]:
+            parts.append(f'{self.allocated} seats allocated')
+            parts.append(f'{self.waitlisted} waitlisted')
+        if self.released:
+            parts.append(f'{self.released} seats released')
+        if self.skipped:
+            reasons = ', '.join(f'{count} {SKIP_REASONS[reason]}' for reason, count in self.skipped.items())
+            parts.append(f'{sum(self.skipped.values())} skipped ({reasons})')
+        return ', '.join(parts)
+
+
+def bulk_review(applications, action, reviewer, notes=''):
+    """Apply ``action`` (a key of ``ACTIONS``) to the ``applications`` queryset.
+
+    Returns a ``BulkReviewResult``. Drafts are never reviewed, and
+    applications holding a seat lose it when they leave APPROVED.
+    """
+    label, new_status, allocate = ACTIONS[action]
+    result = BulkReviewResult(action)
+    started = time.perf_counter()
+    now = timezone.now()
+
+    with transaction.atomic():
+        selection = applications.order_by()
+        rows = list(selection.select_for_update().values_list('id', 'status', 'student_id', 'course_id'))
+        seated = set(
+            SeatAllocation.objects.filter(application__in=selection.values('id')).values_list('application_id', flat=True)
+        )
+        result.selected = len(rows)
+
+        changed, deltas = [], {}
+        to_allocate, students = [], set()
+        for app_id, status, student_id, _ in rows:
+            if status == 'DRAFT':
+                result.skip('draft')
+            elif app_id in seated and new_status == 'APPROVED':
+                result.skip('unchanged')
+            elif status == new_status and not allocate:
+                result.skip('unchanged')
+            else:
+                if status != new_status:
+                    changed.append(app_id)
+                    deltas[status] = deltas.get(status, 0) - 1
+                    deltas[new_status] = deltas.get(new_status, 0) + 1
+                    students.add(student_id)
+                to_allocate.append(app_id)
+
+        for start in range(0, len(changed), BATCH_SIZE):
+            fields = dict(status=new_status, reviewed_by=reviewer, review_date=now, last_updated=now)
+            if notes:
+                fields['review_notes'] = notes
+            Application.objects.filter(pk__in=changed[start:start + BATCH_SIZE]).update(**fields)
+            if new_status != 'APPROVED':
+                remove_from_waitlist(changed[start:start + BATCH_SIZE])
+        adjust_status_counts(deltas)
+        publish_status_changes(students)
+        result.updated = len(changed)
+
+        if new_status != 'APPROVED' and seated:
+            # The freed seats go to the heads of the waitlists
+            result.released = release_seats(SeatAllocation.objects.filter(application_id__in=seated))
+
+        if allocate and to_allocate:
+            # The ids locked above: re-running ``selection`` after the UPDATE would drop
+            # rows a status filter (e.g. the default pending queue) no longer matches
+            ids = [app_id for app_id, *_ in rows]
+            # Only the selection's courses are locked, not the whole catalog
+            courses = {course_id for *_, course_id in rows}
+            allocation = allocate_merit_list(courses=courses, allocated_by=reviewer, application_ids=ids)
+            result.allocated = allocation.total_allocated
+            # Whoever missed out queues for the next free seat
+            add_to_waitlist(Application.objects.filter(pk__in=ids))
+            result.waitlisted = WaitlistEntry.objects.filter(application__in=ids).count()
+            unplaced = len(to_allocate) - result.allocated - result.waitlisted
+            if unplaced > 0:
+                result.skip('no_seat', unplaced)
+
+    result.elapsed = time.perf_counter() - started
+    return result
@@ -0,0 +1,77 @@
+"""Role resolution for the access checks.
+
+A user's group names are loaded once, kept on the request for the rest
+of the request and stored in the session alongside a version stamp. The
+stamp lives in the cache and is bumped whenever group membership changes
+(see ``admissions.signals``), so steady-state role checks cost no
+database queries at all.
+
+With several worker processes the default cache must be shared (Redis,
+Memcached, database cache) for invalidation to reach every worker.
+"""
+import uuid
+
+from django.core.cache import cache
+
+
+STUDENT = 'Students'
+OFFICER = 'Admission Officers'
+
+SESSION_KEY = '_admissions_roles'
+GLOBAL_VERSION_KEY = 'admissions:roles:version'
+USER_VERSION_KEY = 'admissions:roles:version:{}'
+
+
+def _version_stamp(user_id):
+    keys = [GLOBAL_VERSION_KEY, USER_VERSION_KEY.format(user_id)]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            # Never compare against "missing": an evicted stamp must force a reload.
+            cache.add(key, uuid.uuid4().hex, None)
+            found[key] = cache.get(key)
+    return f"{found[keys[0]]}:{found[keys[1]]}"
+
+
+def load_roles(user):
+    return frozenset(user.groups.values_list('name', flat=True))
+
+
+def get_roles(request):
+    """Return the frozenset of group names for ``request.user``."""
+    roles = getattr(request, '_admissions_roles', None)
+    if roles is not None:
+        return roles
+
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        roles = frozenset()
+    else:
+        stamp = _version_stamp(user.pk)
+        session = getattr(request, 'session', None)
+        cached = session.get(SESSION_KEY) if session is not None else None
+        if cached and cached.get('user') == user.pk and cached.get('version') == stamp:
+            roles = frozenset(cached['roles'])
+        else:
+            roles = load_roles(user)
+            if session is not None:
+                session[SESSION_KEY] = {'user': user.pk, 'version': stamp, 'roles': sorted(roles)}
+
+    request._admissions_roles = roles
+    return roles
+
+
+def is_officer(request):
+    return OFFICER in get_roles(request)
+
+
+def is_student(request):
+    return STUDENT in get_roles(request)
+
+
+def invalidate_user_roles(user_id):
+    cache.set(USER_VERSION_KEY.format(user_id), uuid.uuid4().hex, None)
+
+
+def invalidate_all_roles():
+    cache.set(GLOBAL_VERSION_KEY, uuid.uuid4().hex, None)
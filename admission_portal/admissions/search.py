@@ -0,0 +1,260 @@
+"""Ranked course search.
+
+``search_courses`` backs the search box of every course list. Each word
+of the query must match a course (code, name, department, description or
+eligibility criteria), either exactly or as a prefix; words that match
+nothing are retried against the vocabulary with a small edit distance so
+a typo still finds the course. Hits are ranked by field weight and term
+rarity.
+
+On MySQL the matching runs on the FULLTEXT indexes added in migration
+0006. Elsewhere, and for the typo retry, an in-process inverted index is
+used. It is rebuilt lazily whenever the search version changes (see
+``admissions.catalog``), which seat reservations don't touch.
+"""
+import math
+import re
+import threading
+from bisect import bisect_left
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import FloatField
+from django.db.models.expressions import RawSQL
+
+from .catalog import search_version
+from .models import Course
+
+
+TOKEN_RE = re.compile(r'\w+')
+
+FIELD_WEIGHTS = {
+    'code': 5.0,
+    'name': 4.0,
+    'department': 2.0,
+    'eligibility_criteria': 1.0,
+    'description': 1.0,
+}
+ALL_FIELDS = tuple(FIELD_WEIGHTS)
+NAME_FIELDS = ('code', 'name')
+DEPARTMENT_FIELDS = ('department',)
+
+# MySQL FULLTEXT indexes by the column group they cover (see migration 0006).
+FULLTEXT_INDEXES = {
+    ALL_FIELDS: 'course_search_ft',
+    NAME_FIELDS: 'course_name_ft',
+    DEPARTMENT_FIELDS: 'course_department_ft',
+}
+
+PREFIX_FACTOR = 0.6
+FUZZY_FACTOR = 0.4
+MIN_PREFIX_LENGTH = 2
+MAX_EXPANSIONS = 50
+
+
+def tokenize(text):
+    return TOKEN_RE.findall((text or '').lower())
+
+
+def trigrams(term):
+    padded = f'^{term}$'
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def max_typos(term):
+    if len(term) < 4:
+        return 0
+    return 1 if len(term) < 8 else 2
+
+
+def within_distance(a, b, limit):
+    """True when the Levenshtein distance between ``a`` and ``b`` is at most ``limit``."""
+    if abs(len(a) - len(b)) > limit:
+        return False
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if min(current) > limit:
+            return False
+        previous = current
+    return previous[-1] <= limit
+
+
+class CourseIndex:
+    """Inverted index over the searchable course fields."""
+
+    def __init__(self, rows, version=None):
+        self.version = version
+        self.postings = {field: defaultdict(dict) for field in ALL_FIELDS}
+        self.course_types = {}
+        for course_id, course_type, *values in rows:
+            self.course_types[course_id] = course_type
+            for field, value in zip(ALL_FIELDS, values):
+                postings = self.postings[field]
+                for term in tokenize(value):
+                    documents = postings[term]
+                    documents[course_id] = documents.get(course_id, 0) + 1
+        self.size = len(self.course_types)
+
+        terms = set()
+        for postings in self.postings.values():
+            terms.update(postings)
+        self.terms = terms
+        self.vocabulary = sorted(terms)
+        self.trigram_index = defaultdict(list)
+        for term in self.vocabulary:
+            for gram in trigrams(term):
+                self.trigram_index[gram].append(term)
+
+    @classmethod
+    def build(cls, version=None):
+        return cls(Course.objects.order_by().values_list('id', 'course_type', *ALL_FIELDS), version)
+
+    def expand(self, token):
+        """Index terms ``token`` stands for, as ``(term, factor)`` pairs."""
+        matches = []
+        if token in self.terms:
+            matches.append((token, 1.0))
+        if len(token) >= MIN_PREFIX_LENGTH:
+            position = bisect_left(self.vocabulary, token)
+            while position < len(self.vocabulary) and len(matches) < MAX_EXPANSIONS:
+                term = self.vocabulary[position]
+                if not term.startswith(token):
+                    break
+                if term != token:
+                    matches.append((term, PREFIX_FACTOR))
+                position += 1
+        if not matches:
+            matches = [(term, FUZZY_FACTOR) for term in self.near_misses(token)]
+        return matches
+
+    def near_misses(self, token):
+        limit = max_typos(token)
+        if not limit:
+            return []
+        grams = trigrams(token)
+        shared = Counter(term for gram in grams for term in self.trigram_index.get(gram, ()))
+        # Each edit destroys at most three trigrams, so anything sharing fewer can't be close enough.
+        needed = max(len(grams) - 3 * limit, 1)
+        candidates = [term for term, count in shared.most_common() if count >= needed]
+        return [term for term in candidates if within_distance(token, term, limit)][:MAX_EXPANSIONS]
+
+    def search(self, clauses, course_type=None):
+        """Course ids matching every token of ``clauses``, best first.
+
+        ``clauses`` is a list of ``(tokens, fields)`` pairs.
+        """
+        scores = None
+        for tokens, fields in clauses:
+            for token in tokens:
+                token_scores = defaultdict(float)
+                for term, factor in self.expand(token):
+                    for field in fields:
+                        documents = self.postings[field].get(term)
+                        if not documents:
+                            continue
+                        weight = FIELD_WEIGHTS[field] * factor * math.log(1 + self.size / len(documents))
+                        for course_id, frequency in documents.items():
+                            token_scores[course_id] += weight * (1 + math.log(frequency))
+                if scores is None:
+                    scores = dict(token_scores)
+                else:
+                    scores = {cid: score + token_scores[cid] for cid, score in scores.items() if cid in token_scores}
+                if not scores:
+                    return []
+        scores = scores or {}
+        if course_type:
+            scores = {cid: score for cid, score in scores.items() if self.course_types[cid] == course_type}
+        return sorted(scores, key=lambda cid: (-scores[cid], cid))
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index():
+    """The in-process index for the current search version."""
+    global _index
+    version = search_version()
+    index = _index
+    if index is None or index.version != version:
+        with _index_lock:
+            if _index is None or _index.version != version:
+                _index = CourseIndex.build(version)
+            index = _index
+    return index
+
+
+def use_fulltext():
+    backend = getattr(settings, 'ADMISSIONS_COURSE_SEARCH', 'auto')
+    if backend == 'auto':
+        return connection.vendor == 'mysql'
+    return backend == 'fulltext'
+
+
+def fulltext_ids(queryset, clauses):
+    """Ranked course ids from the MySQL FULLTEXT indexes."""
+    quote = connection.ops.quote_name
+    rank = None
+    for number, (tokens, fields) in enumerate(clauses):
+        columns = ', '.join(quote(Course._meta.get_field(field).column) for field in fields)
+        match = RawSQL(
+            f'MATCH ({columns}) AGAINST (%s IN BOOLEAN MODE)',
+            (' '.join(f'+{token}*' for token in tokens),),
+            output_field=FloatField(),
+        )
+        alias = f'search_match_{number}'
+        queryset = queryset.annotate(**{alias: match}).filter(**{f'{alias}__gt': 0})
+        rank = match if rank is None else rank + match
+    queryset = queryset.annotate(search_rank=rank).order_by('-search_rank', 'id')
+    return list(queryset.values_list('id', flat=True))
+
+
+class RankedCourses:
+    """Ranked search hits; slicing loads only the courses of that slice."""
+
+    def __init__(self, queryset, ids):
+        self.queryset = queryset
+        self.ids = ids
+
+    def count(self):
+        return len(self.ids)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        return iter(self[:])
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            ids = self.ids[key]
+            courses = self.queryset.in_bulk(ids)
+            return [courses[course_id] for course_id in ids if course_id in courses]
+        return self[key:key + 1][0]
+
+
+def search_courses(queryset, q='', name='', department='', course_type=''):
+    """Filter and rank ``queryset`` by the course search form fields.
+
+    Without any search words the (type-filtered) queryset is returned in
+    its own order; otherwise a ``RankedCourses`` sequence, best match first.
+    """
+    if course_type:
+        queryset = queryset.filter(course_type=course_type)
+    clauses = [
+        (tokens, fields)
+        for tokens, fields in ((tokenize(q), ALL_FIELDS), (tokenize(name), NAME_FIELDS),
+                               (tokenize(department), DEPARTMENT_FIELDS))
+        if tokens
+    ]
+    if not clauses:
+        return queryset
+
+    ids = fulltext_ids(queryset, clauses) if use_fulltext() else []
+    if not ids:
+        ids = get_index().search(clauses, course_type)
+    return RankedCourses(queryset, ids)
@@ -0,0 +1,46 @@
+from django.contrib.auth.models import Group, User
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from . import roles
+from .catalog import bump_catalog_version
+from .models import Application, Course
+from .stats import adjust_status_counts
+
+
+SEAT_FIELDS = {'total_seats', 'filled_seats', 'updated_at'}
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def group_membership_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """Bump the role version of every user whose groups changed"""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        roles.invalidate_user_roles(instance.pk)
+    elif pk_set:
+        for user_id in pk_set:
+            roles.invalidate_user_roles(user_id)
+    else:
+        # group.user_set.clear() doesn't say which users were affected
+        roles.invalidate_all_roles()
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def group_changed(sender, **kwargs):
+    roles.invalidate_all_roles()
+
+
+@receiver(post_delete, sender=Application)
+def application_deleted(sender, instance, **kwargs):
+    """Keep the status counters in step when applications are deleted (including cascades)"""
+    adjust_status_counts({instance.status: -1})
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+def course_changed(sender, update_fields=None, **kwargs):
+    # A save limited to seat counts can't change what search matches
+    seats_only = update_fields is not None and set(update_fields) <= SEAT_FIELDS
+    bump_catalog_version(seats_only=seats_only)
@@ -0,0 +1,189 @@
+"""Application statistics for the dashboards.
+
+``status_counts`` returns every status count from one conditional
+aggregation. When ``ADMISSIONS_STATUS_COUNTERS`` is enabled the officer
+views read the materialized ``ApplicationStatusCounter`` rows instead,
+which ``Application.save``/delete and the bulk write paths keep in step
+inside the same transaction. With the setting off the rows are not
+maintained at all, so writes don't queue on them; run
+``rebuild_status_counters`` when switching it on.
+
+``seat_statistics`` sums seats per department and course type in one
+grouped query and caches the rollup until the catalog version changes.
+"""
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, Count, F, IntegerField, Q, Sum, Value, When
+
+from .catalog import catalog_version
+from .models import PENDING_STATUSES, Application, ApplicationStatusCounter, Course
+
+
+SEAT_STATISTICS_KEY = 'admissions:seats:{}'
+SEAT_STATISTICS_TIMEOUT = 60 * 60
+
+
+class StatusCounts(dict):
+    """Mapping of status code to count with a few derived totals."""
+
+    @property
+    def total(self):
+        return sum(self.values())
+
+    @property
+    def pending(self):
+        return sum(self.get(status, 0) for status in PENDING_STATUSES)
+
+
+def _empty_counts():
+    return StatusCounts((status, 0) for status, _ in Application.APPLICATION_STATUS)
+
+
+def status_counts(queryset=None):
+    """Count ``queryset`` (all applications by default) per status in one query."""
+    if queryset is None:
+        queryset = Application.objects.all()
+    aggregates = {
+        status: Count('id', filter=Q(status=status))
+        for status, _ in Application.APPLICATION_STATUS
+    }
+    counts = _empty_counts()
+    counts.update(queryset.order_by().aggregate(**aggregates))
+    return counts
+
+
+def counter_status_counts():
+    counts = _empty_counts()
+    counts.update(ApplicationStatusCounter.objects.filter(status__in=counts).values_list('status', 'count'))
+    return counts
+
+
+def counters_enabled():
+    return getattr(settings, 'ADMISSIONS_STATUS_COUNTERS', False)
+
+
+def application_status_counts():
+    """Status counts over all applications, from the counters when enabled."""
+    if counters_enabled():
+        return counter_status_counts()
+    return status_counts()
+
+
+def adjust_status_counts(deltas):
+    """Apply ``{status: delta}`` to the counter rows in a single UPDATE.
+
+    Must run inside the transaction that changed the applications so the
+    counters commit or roll back with them. A no-op unless
+    ``ADMISSIONS_STATUS_COUNTERS`` is enabled.
+    """
+    deltas = {status: delta for status, delta in deltas.items() if status and delta}
+    if not deltas or not counters_enabled():
+        return
+    updated = ApplicationStatusCounter.objects.filter(status__in=deltas).update(
+        count=F('count') + Case(
+            *[When(status=status, then=Value(delta)) for status, delta in deltas.items()],
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+    )
+    if updated < len(deltas):
+        existing = set(ApplicationStatusCounter.objects.filter(status__in=deltas).values_list('status', flat=True))
+        ApplicationStatusCounter.objects.bulk_create(
+            [ApplicationStatusCounter(status=s, count=d) for s, d in deltas.items() if s not in existing],
+            ignore_conflicts=True,
+        )
+
+
+def status_deltas(queryset, new_status):
+    """Counter deltas for moving every row of ``queryset`` to ``new_status``."""
+    deltas = {}
+    for status, count in queryset.order_by().values_list('status').annotate(n=Count('id')):
+        if status != new_status:
+            deltas[status] = deltas.get(status, 0) - count
+            deltas[new_status] = deltas.get(new_status, 0) + count
+    return deltas
+
+
+def rebuild_status_counters():
+    """Recompute every counter row from the applications table.
+
+    Returns ``{status: (stored, actual)}`` for rows that had drifted.
+    """
+    with transaction.atomic():
+        stored = dict(ApplicationStatusCounter.objects.select_for_update().values_list('status', 'count'))
+        actual = status_counts()
+        ApplicationStatusCounter.objects.all().delete()
+        ApplicationStatusCounter.objects.bulk_create(
+            ApplicationStatusCounter(status=status, count=count) for status, count in actual.items()
+        )
+    return {
+        status: (stored.get(status, 0), count)
+        for status, count in actual.items()
+        if stored.get(status, 0) != count
+    }
+
+
+@dataclass
+class SeatTotals:
+    label: str
+    courses: int = 0
+    total: int = 0
+    filled: int = 0
+
+    @property
+    def available(self):
+        return self.total - self.filled
+
+    @property
+    def occupancy(self):
+        return self.filled / self.total * 100 if self.total else 0.0
+
+    def add(self, courses, total, filled):
+        self.courses += courses
+        self.total += total
+        self.filled += filled
+
+
+@dataclass
+class SeatStatistics:
+    overall: SeatTotals
+    by_department: list = field(default_factory=list)
+    by_course_type: list = field(default_factory=list)
+
+
+def seat_statistics():
+    """Seat totals overall, per department and per course type.
+
+    One grouped query over the seat columns; the result is cached until a
+    course or its seat counts change.
+    """
+    key = SEAT_STATISTICS_KEY.format(catalog_version())
+    statistics = cache.get(key)
+    if statistics is not None:
+        return statistics
+
+    rows = (
+        Course.objects.order_by()
+        .values_list('department', 'course_type')
+        .annotate(courses=Count('id'), total=Sum('total_seats'), filled=Sum('filled_seats'))
+    )
+    type_labels = dict(Course.COURSE_TYPES)
+    overall = SeatTotals('All courses')
+    departments = {}
+    course_types = {}
+    for department, course_type, courses, total, filled in rows:
+        overall.add(courses, total, filled)
+        departments.setdefault(department, SeatTotals(department)).add(courses, total, filled)
+        course_types.setdefault(course_type, SeatTotals(type_labels.get(course_type, course_type))).add(courses, total, filled)
+
+    statistics = SeatStatistics(
+        overall=overall,
+        by_department=[departments[name] for name in sorted(departments)],
+        by_course_type=[course_types[code] for code in type_labels if code in course_types]
+        + [totals for code, totals in course_types.items() if code not in type_labels],
+    )
+    cache.set(key, statistics, SEAT_STATISTICS_TIMEOUT)
+    return statistics
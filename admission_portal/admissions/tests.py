@@ -1,3 +1,1163 @@
-from django.test import TestCase
+import asyncio
+import io
+import threading
+from datetime import date, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, connections, transaction
+from asgiref.sync import async_to_sync, sync_to_async
+from django.test import AsyncClient, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .applying import AlreadyApplied, ApplicationLimitReached, create_application
+from .allocation import allocate_merit_list
+from .async_views import async_urlconf
+from .catalog import page_cache_stats
+from .eligibility import check_eligibility, reevaluate_course
+from .forms import ApplicationFilterForm, ApplicationForm, CourseForm
+from .importing import import_applications, import_courses
+from .live import status_events, status_feed
+from .metrics import registry as metrics_registry
+from .numbering import ApplicationNumberAllocator, application_numbers, format_application_number
+from . import loadtest
+from .models import Application, ApplicationSequence, Course, SeatAllocation, WaitlistEntry
+from .pagination import KeysetPaginator, iterate_in_key_order
+from .reservations import NoSeatsAvailable, StudentAlreadySeated, release_expired_seats, release_seat, reserve_seat
+from .reviews import bulk_review
+from .search import get_index, search_courses
+from .waitlist import add_to_waitlist, with_waitlist_position
+from .stats import counter_status_counts, rebuild_status_counters, seat_statistics, status_counts
+
+
+def make_course(code='CS101', **kwargs):
+    fields = dict(
+        name='Computer Science', department='Computer Science', description='-',
+        duration=4, course_type='UG', total_seats=60, min_percentage=60,
+        eligibility_criteria='-', fee_per_year=1000,
+    )
+    fields.update(kwargs)
+    return Course.objects.create(code=code, **fields)
+
+
+def make_application(student, course, **kwargs):
+    fields = dict(
+        previous_school='School', previous_qualification='12th', percentage_obtained=80,
+        year_of_passing=2024, date_of_birth=date(2005, 1, 1), address='-',
+        phone='9999999999', emergency_contact='9999999999',
+    )
+    fields.update(kwargs)
+    return Application.objects.create(student=student, course=course, **fields)
+
+
+def read_stream(response):
+    async def read():
+        return b''.join([part async for part in response.streaming_content]).decode()
+    return async_to_sync(read)()
+
+
+def group_queries(captured):
+    return [q['sql'] for q in captured.captured_queries if 'auth_group' in q['sql']]
+
+
+class RoleResolutionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.officers = Group.objects.create(name='Admission Officers')
+        cls.students = Group.objects.create(name='Students')
+        cls.officer = User.objects.create_user('officer', password='pass12345')
+        cls.officer.groups.add(cls.officers)
+        cls.student = User.objects.create_user('student', password='pass12345')
+        cls.student.groups.add(cls.students)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_roles_loaded_once_per_session(self):
+        self.client.force_login(self.officer)
+        with CaptureQueriesContext(connection) as first:
+            self.client.get(reverse('dashboard_officer'))
+        self.assertEqual(len(group_queries(first)), 1)
+
+        with CaptureQueriesContext(connection) as second:
+            response = self.client.get(reverse('dashboard_officer'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(group_queries(second), [])
+
+    def test_login_caches_roles_for_next_request(self):
+        response = self.client.post(reverse('login'), {'username': 'student', 'password': 'pass12345'})
+        self.assertRedirects(response, reverse('dashboard_student'))
+        with CaptureQueriesContext(connection) as captured:
+            self.client.get(reverse('dashboard_student'))
+        self.assertEqual(group_queries(captured), [])
+
+    def test_membership_change_invalidates_cached_roles(self):
+        self.client.force_login(self.officer)
+        self.assertEqual(self.client.get(reverse('dashboard_officer')).status_code, 200)
+
+        self.officer.groups.remove(self.officers)
+        response = self.client.get(reverse('dashboard_officer'))
+        self.assertRedirects(response, reverse('home'))
+
+    def test_wrong_role_redirected(self):
+        self.client.force_login(self.student)
+        response = self.client.get(reverse('manage_applications'))
+        self.assertRedirects(response, reverse('home'))
+
+
+class ApplicationNumberTests(TransactionTestCase):
+    # Not a TestCase: blocks are only pre-allocated outside a transaction
+
+    def counter(self, year=2031):
+        return ApplicationSequence.objects.get(year=year).last_value
+
+    def test_blocks_are_reserved_once_and_reused(self):
+        allocator = ApplicationNumberAllocator(block_size=10)
+        self.assertEqual(allocator.next_number(2031), 'APP203100001')
+        self.assertEqual(self.counter(), 10)
+        with self.assertNumQueries(0):
+            numbers = allocator.take(9, 2031)
+        self.assertEqual(numbers[-1], 'APP203100010')
+        self.assertEqual(allocator.next_number(2031), 'APP203100011')
+        self.assertEqual(self.counter(), 20)
+
+    def test_no_block_is_kept_inside_a_transaction(self):
+        allocator = ApplicationNumberAllocator(block_size=10)
+        with transaction.atomic():
+            self.assertEqual(allocator.take(2, 2031), ['APP203100001', 'APP203100002'])
+        self.assertEqual(self.counter(), 2)
+        # A rollback of that block could have handed these numbers to another worker
+        self.assertEqual(allocator.next_number(2031), 'APP203100003')
+        self.assertEqual(self.counter(), 12)
+
+    def test_numbers_grow_past_five_digits(self):
+        ApplicationSequence.objects.create(year=2031, last_value=99999)
+        allocator = ApplicationNumberAllocator(block_size=1)
+        self.assertEqual(allocator.take(2, 2031), ['APP2031100000', 'APP2031100001'])
+
+    def test_new_counter_starts_after_the_highest_issued_number(self):
+        course = make_course()
+        for i, number in enumerate(['APP203100001', 'APP203100002', 'APP203199999', 'APP2031100000']):
+            make_application(User.objects.create_user(f'applicant{i}'), course, application_number=number)
+        # Deleting one must not let the counter reissue a number still in use
+        Application.objects.filter(application_number='APP203100002').delete()
+        self.assertEqual(ApplicationNumberAllocator(block_size=1).next_number(2031), 'APP2031100001')
+
+
+@override_settings(ADMISSIONS_STATUS_COUNTERS=True)
+class StatusCounterTests(TestCase):
+    def test_counters_follow_status_changes_and_deletes(self):
+        course = make_course()
+        student = User.objects.create_user('student')
+        application = make_application(student, course)
+        make_application(User.objects.create_user('other'), course, status='SUBMITTED')
+
+        application = Application.objects.get(pk=application.pk)
+        application.status = 'APPROVED'
+        application.save()
+        self.assertEqual(counter_status_counts(), status_counts())
+
+        course.delete()
+        self.assertEqual(counter_status_counts().total, 0)
+        self.assertEqual(rebuild_status_counters(), {})
+
+    @override_settings(ADMISSIONS_STATUS_COUNTERS=False)
+    def test_counters_are_left_alone_when_disabled(self):
+        application = make_application(User.objects.create_user('student'), make_course())
+        application.status = 'SUBMITTED'
+        application.save()
+        self.assertEqual(counter_status_counts().total, 0)
+        # Switching on starts from a rebuild
+        with override_settings(ADMISSIONS_STATUS_COUNTERS=True):
+            self.assertEqual(rebuild_status_counters(), {'SUBMITTED': (0, 1)})
+            self.assertEqual(counter_status_counts(), status_counts())
+
+    def test_status_counts_single_query(self):
+        with self.assertNumQueries(1):
+            counts = status_counts()
+        self.assertEqual(counts.total, 0)
+
+
+class ListingQueryCountTests(TestCase):
+    """List pages must cost the same number of queries whatever the page holds"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.officer = User.objects.create_user('officer', first_name='Olive', last_name='Officer')
+        cls.officer.groups.add(Group.objects.create(name='Admission Officers'))
+        cls.students = Group.objects.create(name='Students')
+        cls.student = User.objects.create_user('student', first_name='Sam', last_name='Student')
+        cls.student.groups.add(cls.students)
+
+    def setUp(self):
+        cache.clear()
+
+    def add_applications(self, count, start=0):
+        for i in range(start, start + count):
+            student = User.objects.create_user(f'applicant{i}', first_name='App', last_name=str(i))
+            course = make_course(code=f'C{i}')
+            make_application(student, course, status='SUBMITTED', reviewed_by=self.officer)
+
+    def count_queries(self, user, url):
+        self.client.force_login(user)
+        self.client.get(url)  # warm the session role cache
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(captured)
+
+    def test_manage_applications_query_count_is_fixed(self):
+        url = reverse('manage_applications') + '?show_all=true'
+        self.add_applications(1)
+        one = self.count_queries(self.officer, url)
+        self.add_applications(6, start=1)
+        self.assertEqual(self.count_queries(self.officer, url), one)
+
+    def test_dashboard_officer_query_count_is_fixed(self):
+        url = reverse('dashboard_officer')
+        self.add_applications(1)
+        one = self.count_queries(self.officer, url)
+        self.add_applications(6, start=1)
+        self.assertEqual(self.count_queries(self.officer, url), one)
+
+    def test_dashboard_student_query_count_is_fixed(self):
+        url = reverse('dashboard_student')
+        make_application(self.student, make_course(code='S0'))
+        one = self.count_queries(self.student, url)
+        for i in range(1, 3):
+            make_application(self.student, make_course(code=f'S{i}'))
+        self.assertEqual(self.count_queries(self.student, url), one)
+
+    def test_application_detail_loads_allocation_with_relations(self):
+        course = make_course()
+        application = make_application(self.student, course, reviewed_by=self.officer)
+        url = reverse('review_application', args=[application.pk])
+        without_seat = self.count_queries(self.officer, url)
+        SeatAllocation.objects.create(application=application, course=course, allocated_by=self.officer)
+        self.assertEqual(self.count_queries(self.officer, url), without_seat)
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        course = make_course()
+        now = timezone.now()
+        dates = [now - timedelta(days=3), now - timedelta(days=1), None, now - timedelta(days=2), None, now, None]
+        for i, submitted in enumerate(dates):
+            make_application(User.objects.create_user(f'applicant{i}'), course, submission_date=submitted)
+        # Newest submissions first, unsubmitted (NULL) last, then newest created
+        rows = sorted(
+            Application.objects.all(),
+            key=lambda a: (a.submission_date is not None, a.submission_date or now, a.created_at, a.pk),
+            reverse=True,
+        )
+        self.expected = [a.pk for a in rows]
+        self.paginator = KeysetPaginator(Application.objects.all(), 3)
+
+    def ids(self, page):
+        return [a.pk for a in page]
+
+    def test_forward_and_backward_cursors(self):
+        first = self.paginator.get_page()
+        second = self.paginator.get_page(first.next_cursor)
+        last = self.paginator.get_page(second.next_cursor)
+        self.assertEqual(self.ids(first) + self.ids(second) + self.ids(last), self.expected)
+        self.assertEqual((first.has_previous(), last.has_next()), (False, False))
+        # The second page straddles the dated rows and the NULL submission dates
+        self.assertEqual(sum(a.submission_date is None for a in second), 2)
+
+        back = self.paginator.get_page(last.previous_cursor)
+        self.assertEqual(self.ids(back), self.ids(second))
+        self.assertEqual(self.ids(self.paginator.get_page(back.previous_cursor)), self.ids(first))
+
+    def test_deleted_boundary_row_keeps_the_cursor_valid(self):
+        first = self.paginator.get_page()
+        Application.objects.filter(pk=self.expected[2]).delete()
+        self.assertEqual(self.ids(self.paginator.get_page(first.next_cursor)), self.expected[3:6])
+
+    def test_bad_cursors_fall_back_to_the_first_page(self):
+        cursor = self.paginator.get_page().next_cursor
+        other_filters = KeysetPaginator(Application.objects.all(), 3, fingerprint='status=SUBMITTED')
+        for page in [
+            self.paginator.get_page(cursor[:-4] + 'abcd'),
+            self.paginator.get_page('not-a-cursor'),
+            other_filters.get_page(cursor),
+        ]:
+            self.assertEqual(self.ids(page), self.expected[:3])
+            self.assertFalse(page.has_previous())
+
+
+class CourseSearchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.robotics = make_course('ME210', name='Robotics and Automation', department='Mechanical')
+        self.mechanical = make_course('ME101', name='Mechanical Engineering', department='Mechanical',
+                                      description='Includes an elective in robotics.')
+        self.commerce = make_course('BC101', name='Commerce', department='Commerce', eligibility_criteria='12th with Accountancy')
+
+    def search(self, **data):
+        return [course.code for course in search_courses(Course.objects.all(), **data)]
+
+    def test_ranks_name_matches_above_description_matches(self):
+        self.assertEqual(self.search(q='robotics'), ['ME210', 'ME101'])
+        self.assertEqual(self.search(q='accountancy'), ['BC101'])
+
+    def test_prefix_and_typo_matching(self):
+        self.assertEqual(self.search(name='robo'), ['ME210'])
+        self.assertEqual(self.search(name='mechanicl engineering'), ['ME101'])
+        self.assertEqual(self.search(department='mechanical', course_type='PG'), [])
+
+    def test_course_views_search_the_current_catalog(self):
+        response = self.client.get(reverse('view_courses'), {'q': 'automation'})
+        self.assertEqual([c.code for c in response.context['page_obj']], ['ME210'])
+
+        make_course('EE101', name='Industrial Automation', department='Electrical')
+        response = self.client.get(reverse('view_courses'), {'q': 'automation'})
+        self.assertEqual(response.context['total_count'], 2)
+
+    def test_seat_changes_keep_the_index(self):
+        index = get_index()
+        reserve_seat(make_application(User.objects.create_user('student'), self.robotics))
+        self.assertIs(get_index(), index)
+
+        self.robotics.name = 'Robotics and Mechatronics'
+        self.robotics.save()
+        self.assertIsNot(get_index(), index)
+        self.assertEqual(self.search(name='mechatronics'), ['ME210'])
+
+
+class CoursePageCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.course = make_course()
+        self.url = reverse('view_courses')
+
+    def test_repeat_request_served_from_cache(self):
+        self.client.get(self.url, {'name': ' Computer  '})
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(self.url, {'name': 'computer'})
+        self.assertContains(response, 'CS101')
+        self.assertFalse([q for q in captured.captured_queries if 'admissions_course' in q['sql']])
+        self.assertEqual(page_cache_stats(), {'hits': 1, 'misses': 1, 'ratio': 0.5})
+
+    def test_out_of_range_pages_share_the_last_page_entry(self):
+        self.client.get(self.url)
+        for page in ['2', '999999', '-3', 'junk']:
+            response = self.client.get(self.url, {'page': page})
+            self.assertContains(response, 'CS101')
+        self.assertEqual(page_cache_stats()['misses'], 1)
+
+    def test_conditional_get_until_catalog_changes(self):
+        etag = self.client.get(self.url)['ETag']
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.course.total_seats = 80
+        self.course.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '80/80')
+
+    def test_seat_changes_invalidate_cached_page(self):
+        self.assertContains(self.client.get(self.url), '60/60')
+        application = make_application(User.objects.create_user('student'), self.course)
+        reserve_seat(application)
+        self.assertContains(self.client.get(self.url), '59/60')
+
+
+class SeatStatisticsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_rollups_are_cached_until_seats_change(self):
+        cs = make_course('CS101', department='Computing', total_seats=60, filled_seats=30)
+        make_course('CS201', department='Computing', course_type='PG', total_seats=40, filled_seats=10)
+        make_course('BC101', department='Commerce', total_seats=100)
+
+        stats = seat_statistics()
+        self.assertEqual((stats.overall.total, stats.overall.filled), (200, 40))
+        self.assertEqual([(d.label, d.courses, d.occupancy) for d in stats.by_department],
+                         [('Commerce', 1, 0.0), ('Computing', 2, 40.0)])
+        self.assertEqual([(t.label, t.total) for t in stats.by_course_type], [('Undergraduate', 160), ('Postgraduate', 40)])
+
+        with self.assertNumQueries(0):
+            seat_statistics()
+        reserve_seat(make_application(User.objects.create_user('student'), cs))
+        self.assertEqual(seat_statistics().overall.filled, 41)
+
+
+class ApplicationExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.officer = User.objects.create_user('officer')
+        cls.officer.groups.add(Group.objects.create(name='Admission Officers'))
+        cls.course = make_course()
+        now = timezone.now()
+        for i in range(7):
+            make_application(
+                User.objects.create_user(f'applicant{i}'), cls.course,
+                status='DRAFT' if i % 3 == 0 else 'APPROVED',
+                submission_date=None if i % 3 == 0 else now - timedelta(days=i % 2),
+            )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_keyset_batches_cover_every_row_once(self):
+        expected = list(Application.objects.order_by(*KeysetPaginator.ordering).values_list('id', flat=True))
+        rows = [row[0] for row in iterate_in_key_order(Application.objects.all(), ['id'], batch_size=2)]
+        self.assertEqual(rows, expected)
+
+    def test_csv_export_streams_filtered_rows(self):
+        self.client.force_login(self.officer)
+        response = self.client.get(reverse('export_applications'), {'show_all': 'true', 'status': 'APPROVED'})
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode('utf-8-sig').splitlines()
+        self.assertTrue(lines[0].startswith('Application Number,'))
+        self.assertEqual(len(lines) - 1, Application.objects.filter(status='APPROVED').count())
+
+
+@override_settings(ADMISSIONS_STATUS_COUNTERS=True)
+class MeritAllocationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.cs = make_course('CS101', total_seats=2)
+        self.me = make_course('ME101', name='Mechanical', department='Mechanical', total_seats=1)
+        students = {name: User.objects.create_user(name) for name in 'abcdef'}
+
+        def apply(student, course, pct, **kwargs):
+            fields = {'status': 'SUBMITTED', 'is_eligible': True, 'percentage_obtained': pct, **kwargs}
+            return make_application(students[student], course, **fields)
+
+        self.a_cs, self.a_me = apply('a', self.cs, 95), apply('a', self.me, 95)
+        self.b = apply('b', self.cs, 90)
+        self.c = apply('c', self.cs, 85)
+        self.d = apply('d', self.me, 80)
+        apply('e', self.cs, 99, is_eligible=False)
+        apply('f', self.me, 99, status='REJECTED')
+        rebuild_status_counters()
+
+    def test_dry_run_writes_nothing(self):
+        out = io.StringIO()
+        call_command('allocate_seats', '--dry-run', stdout=out)
+        self.assertIn('DRY RUN', out.getvalue())
+        self.assertIn('cutoff: 90.00%', out.getvalue())
+        self.assertFalse(SeatAllocation.objects.exists())
+        self.assertEqual(Application.objects.filter(status='APPROVED').count(), 0)
+        self.assertEqual(list(Course.objects.order_by('code').values_list('filled_seats', flat=True)), [0, 0])
+
+    def test_seats_go_by_merit_within_capacity_one_per_student(self):
+        officer = User.objects.create_user('officer')
+        call_command('allocate_seats', '--officer', 'officer', stdout=io.StringIO())
+
+        # a takes a CS seat and gives up the ME place to d; c misses the CS cutoff
+        seated = dict(SeatAllocation.objects.values_list('application_id', 'course__code'))
+        self.assertEqual(seated, {self.a_cs.pk: 'CS101', self.b.pk: 'CS101', self.d.pk: 'ME101'})
+        self.assertEqual(set(Application.objects.filter(status='APPROVED', reviewed_by=officer).values_list('id', flat=True)), set(seated))
+        self.assertEqual(list(Course.objects.order_by('code').values_list('filled_seats', flat=True)), [2, 1])
+        self.assertEqual(counter_status_counts(), status_counts())
+
+        result = allocate_merit_list()
+        self.assertEqual(result.total_allocated, 0)
+
+    def test_result_reports_cutoffs_and_skips(self):
+        result = allocate_merit_list(dry_run=True)
+        self.assertEqual({c.code: (c.allocated, c.cutoff) for c in result.courses}, {'CS101': (2, 90), 'ME101': (1, 80)})
+        self.assertEqual(result.skipped_already_seated, 1)
+
+    def test_students_are_locked_before_their_seats_are_read(self):
+        with CaptureQueriesContext(connection) as captured:
+            allocate_merit_list()
+        tables = [q['sql'].split(' FROM ', 1)[1].split()[0].strip('"`') for q in captured.captured_queries
+                  if q['sql'].startswith('SELECT')]
+        self.assertLess(tables.index('auth_user'), tables.index('admissions_seatallocation'))
+
+
+class SampleDataTests(TestCase):
+    def test_scale_mode_summary_and_notes_match_what_it_created(self):
+        out = io.StringIO()
+        call_command('populate_sample_data', scale=1, seed=7, officers=1, stdout=out)
+        self.assertIn('Students: username: scale_student_0000000, password: password123', out.getvalue())
+        self.assertNotIn('john_doe', out.getvalue())
+        self.assertTrue(User.objects.filter(username='scale_student_0000000').exists())
+        for application in Application.objects.select_related('course')[:50]:
+            self.assertEqual(
+                (application.is_eligible, application.eligibility_notes),
+                check_eligibility(application.percentage_obtained, application.course.min_percentage),
+            )
+
+
+@override_settings(ADMISSIONS_STATUS_COUNTERS=True)
+class BulkReviewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.officer = User.objects.create_user('officer')
+        self.officer.groups.add(Group.objects.create(name='Admission Officers'))
+        self.course = make_course(total_seats=2)
+        self.applications = [
+            make_application(User.objects.create_user(f'applicant{i}'), self.course, status=status, percentage_obtained=70 + i,
+                             is_eligible=True)
+            for i, status in enumerate(['DRAFT', 'SUBMITTED', 'SUBMITTED', 'UNDER_REVIEW', 'REJECTED'])
+        ]
+
+    def test_skips_drafts_and_keeps_counters_in_step(self):
+        result = bulk_review(Application.objects.all(), 'reject', reviewer=self.officer, notes='Incomplete')
+        self.assertEqual((result.selected, result.updated), (5, 3))
+        self.assertEqual(result.skipped, {'draft': 1, 'unchanged': 1})
+        self.assertEqual(Application.objects.filter(status='REJECTED', reviewed_by=self.officer, review_notes='Incomplete').count(), 3)
+        self.assertEqual(counter_status_counts(), status_counts())
+
+    def test_allocation_respects_capacity(self):
+        result = bulk_review(Application.objects.all(), 'approve_and_allocate', reviewer=self.officer)
+        self.assertEqual((result.allocated, result.waitlisted), (2, 2))
+        self.assertEqual(result.skipped, {'draft': 1})
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.filled_seats, 2)
+        # The two best eligible candidates win the seats
+        seated = set(SeatAllocation.objects.values_list('application_id', flat=True))
+        self.assertEqual(seated, {self.applications[3].pk, self.applications[4].pk})
+        self.assertEqual(counter_status_counts(), status_counts())
+
+        # Rejecting seated applications hands their seats to the waitlist
+        result = bulk_review(Application.objects.filter(pk__in=seated), 'reject', reviewer=self.officer)
+        self.assertEqual((result.updated, result.released), (2, 2))
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.filled_seats, 2)
+        seated_now = set(SeatAllocation.objects.values_list('application_id', flat=True))
+        self.assertEqual(seated_now, {self.applications[1].pk, self.applications[2].pk})
+        self.assertEqual(counter_status_counts(), status_counts())
+
+    def test_allocation_locks_only_the_selected_courses(self):
+        other = make_course('BC101', department='Commerce')
+        make_application(User.objects.create_user('other'), other, status='SUBMITTED', is_eligible=True)
+        with mock.patch('admissions.reviews.allocate_merit_list', wraps=allocate_merit_list) as allocate:
+            result = bulk_review(Application.objects.filter(course=self.course), 'approve_and_allocate', reviewer=self.officer)
+        self.assertEqual(allocate.call_args.kwargs['courses'], {self.course.pk})
+        self.assertEqual(result.allocated, 2)
+        self.assertFalse(SeatAllocation.objects.filter(course=other).exists())
+
+    def test_view_allocates_from_the_default_pending_queue(self):
+        # The default queue only shows pending statuses, which approval moves rows out of
+        self.client.force_login(self.officer)
+        response = self.client.post(reverse('bulk_review_applications'), {
+            'action': 'approve_and_allocate', 'select_all': 'on',
+        })
+        self.assertRedirects(response, reverse('manage_applications') + '?', fetch_redirect_response=False)
+        seated = set(SeatAllocation.objects.values_list('application_id', flat=True))
+        self.assertEqual(seated, {self.applications[2].pk, self.applications[3].pk})
+        self.assertEqual(
+            list(WaitlistEntry.objects.values_list('application_id', flat=True)), [self.applications[1].pk]
+        )
+        self.assertIn('2 seats allocated, 1 waitlisted', str(list(response.wsgi_request._messages)[0]))
+
+    def test_view_reviews_only_the_filtered_queue(self):
+        self.client.force_login(self.officer)
+        response = self.client.post(reverse('bulk_review_applications'), {
+            'action': 'shortlist', 'select_all': 'on', 'status': 'SUBMITTED',
+        })
+        self.assertRedirects(response, reverse('manage_applications') + '?status=SUBMITTED', fetch_redirect_response=False)
+        self.assertEqual(Application.objects.filter(status='SHORTLISTED').count(), 2)
+        self.assertEqual(Application.objects.get(pk=self.applications[3].pk).status, 'UNDER_REVIEW')
+
+
+class EligibilityTests(TestCase):
+    def setUp(self):
+        self.course = make_course(min_percentage=60)
+        for i, (percentage, status) in enumerate([(55, 'SUBMITTED'), (65, 'SUBMITTED'), (75, 'DRAFT'), (50, 'REJECTED')]):
+            eligible, notes = check_eligibility(percentage, 60)
+            make_application(
+                User.objects.create_user(f'applicant{i}'), self.course, status=status,
+                percentage_obtained=percentage, is_eligible=eligible, eligibility_notes=notes,
+            )
+
+    def test_course_form_reevaluates_open_applications_on_cutoff_change(self):
+        data = {field: getattr(self.course, field) for field in CourseForm.Meta.fields}
+        form = CourseForm({**data, 'min_percentage': 70}, instance=self.course)
+        self.assertTrue(form.is_valid(), form.errors)
+        form.save()
+
+        audit = form.eligibility_audit
+        self.assertEqual((audit.previous_min_percentage, audit.min_percentage), (60, 70))
+        self.assertEqual((audit.reevaluated, audit.became_eligible, audit.became_ineligible), (3, 0, 1))
+        eligibility = dict(Application.objects.values_list('percentage_obtained', 'is_eligible'))
+        # The rejected application keeps the eligibility it was decided on
+        self.assertEqual(eligibility, {55: False, 65: False, 75: True, 50: False})
+        notes = Application.objects.get(percentage_obtained=65).eligibility_notes
+        self.assertEqual(notes, '❌ Not Eligible: 65.00% < 70.0%')
+        self.assertEqual(notes, check_eligibility(65.0, 70.0)[1])
+        notes = Application.objects.get(percentage_obtained=75).eligibility_notes
+        self.assertEqual(notes, check_eligibility(75.0, 70.0)[1])
+
+        # Saving without touching the cutoff leaves eligibility alone
+        form = CourseForm({**data, 'min_percentage': 70, 'name': 'Renamed'}, instance=self.course)
+        self.assertTrue(form.is_valid(), form.errors)
+        form.save()
+        self.assertIsNone(form.eligibility_audit)
+
+    def test_reevaluation_cost_does_not_grow_with_applications(self):
+        self.course.min_percentage = 50
+        with CaptureQueriesContext(connection) as few:
+            reevaluate_course(self.course)
+        for i in range(20):
+            make_application(User.objects.create_user(f'more{i}'), self.course, status='SUBMITTED', percentage_obtained=40 + i)
+        self.course.min_percentage = 52
+        with CaptureQueriesContext(connection) as many:
+            audit = reevaluate_course(self.course)
+        self.assertEqual(len(few), len(many))
+        self.assertEqual(audit.became_eligible, 8)  # 52-59
+
+
+class WaitlistTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.course = make_course(total_seats=1)
+        self.students = Group.objects.create(name='Students')
+        self.applications = []
+        for i, percentage in enumerate([90, 70, 80, 60]):
+            student = User.objects.create_user(f'applicant{i}')
+            student.groups.add(self.students)
+            self.applications.append(make_application(
+                student, self.course, status='APPROVED', is_eligible=True,
+                percentage_obtained=percentage, submission_date=timezone.now(),
+            ))
+        self.seat = reserve_seat(self.applications[0])
+
+    def positions(self):
+        return dict(with_waitlist_position(Application.objects.all()).values_list('percentage_obtained', 'waitlist_position'))
+
+    def test_queue_in_merit_order_and_promotes_when_seats_are_added(self):
+        self.assertEqual(add_to_waitlist(Application.objects.all()), 3)
+        self.assertEqual(self.positions(), {90: None, 80: 1, 70: 2, 60: 3})
+
+        data = {field: getattr(self.course, field) for field in CourseForm.Meta.fields}
+        form = CourseForm({**data, 'total_seats': 2}, instance=self.course)
+        self.assertTrue(form.is_valid(), form.errors)
+        form.save()
+        self.assertEqual(form.promotion.total_allocated, 1)
+        self.assertTrue(SeatAllocation.objects.filter(application__percentage_obtained=80).exists())
+        self.assertEqual(self.positions(), {90: None, 80: None, 70: 1, 60: 2})
+
+    def test_released_seat_goes_to_head_of_queue(self):
+        add_to_waitlist(Application.objects.all())
+        release_seat(self.seat)
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.filled_seats, 1)
+        self.assertEqual(SeatAllocation.objects.get().application.percentage_obtained, 80)
+        self.assertEqual(self.positions(), {90: None, 80: None, 70: 1, 60: 2})
+
+    def test_rejecting_a_seated_application_promotes_the_waitlist(self):
+        add_to_waitlist(Application.objects.all())
+        officer = User.objects.create_user('officer')
+        officer.groups.add(Group.objects.create(name='Admission Officers'))
+        self.client.force_login(officer)
+        response = self.client.post(reverse('review_application', args=[self.applications[0].pk]), {
+            'action': 'reject', 'status': 'APPROVED', 'review_notes': 'Withdrawn',
+            'is_eligible': 'on', 'eligibility_notes': '',
+        })
+        self.assertRedirects(response, reverse('manage_applications'), fetch_redirect_response=False)
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.filled_seats, 1)
+        self.assertEqual(SeatAllocation.objects.get().application.percentage_obtained, 80)
+        self.assertEqual(self.positions(), {90: None, 80: None, 70: 1, 60: 2})
+
+    def test_dashboard_shows_position_without_extra_queries(self):
+        self.client.force_login(self.applications[3].student)
+        self.client.get(reverse('dashboard_student'))
+        with CaptureQueriesContext(connection) as before:
+            self.client.get(reverse('dashboard_student'))
+        add_to_waitlist(Application.objects.all())
+        with CaptureQueriesContext(connection) as after:
+            response = self.client.get(reverse('dashboard_student'))
+        self.assertContains(response, 'Waitlist position: #3')
+        self.assertEqual(len(before), len(after))
+
+
+class SeatReservationTests(TestCase):
+    def setUp(self):
+        self.student = User.objects.create_user('student')
+        self.cs = make_course('CS101', total_seats=1)
+        self.me = make_course('ME101', name='Mechanical', total_seats=5)
+        self.application = make_application(self.student, self.cs, status='APPROVED')
+
+    def filled(self):
+        return dict(Course.objects.values_list('code', 'filled_seats'))
+
+    def test_reserving_takes_one_seat(self):
+        allocation = reserve_seat(self.application, notes='Merit')
+        self.assertEqual((allocation.course_id, allocation.notes), (self.cs.pk, 'Merit'))
+        self.assertEqual(allocation.confirmation_deadline, timezone.localdate() + timedelta(days=14))
+        self.assertEqual(self.filled(), {'CS101': 1, 'ME101': 0})
+
+    def test_full_course_is_refused(self):
+        reserve_seat(make_application(User.objects.create_user('other'), self.cs, status='APPROVED'))
+        with self.assertRaises(NoSeatsAvailable):
+            reserve_seat(self.application)
+        self.assertEqual(self.filled(), {'CS101': 1, 'ME101': 0})
+
+    def test_student_keeps_a_single_seat(self):
+        other = make_application(self.student, self.me, status='APPROVED')
+        reserve_seat(other)
+        with self.assertRaises(StudentAlreadySeated):
+            reserve_seat(self.application)
+        with self.assertRaises(StudentAlreadySeated):
+            reserve_seat(other)
+        # Refusals hand the seat they took straight back
+        self.assertEqual(self.filled(), {'CS101': 0, 'ME101': 1})
+        self.assertEqual(SeatAllocation.objects.count(), 1)
+
+
+class ParallelSeatReservationTests(TransactionTestCase):
+    def test_parallel_reservations_seat_a_student_once(self):
+        student = User.objects.create_user('student')
+        applications = [
+            make_application(student, make_course(code, total_seats=5), status='APPROVED')
+            for code in ['CS101', 'ME101', 'EE101', 'CE101']
+        ]
+        barrier = threading.Barrier(len(applications), timeout=10)
+        seated, refused, errors = [], [], []
+
+        def reserve(application):
+            try:
+                barrier.wait()
+                seated.append(reserve_seat(application).course_id)
+            except StudentAlreadySeated:
+                refused.append(application.pk)
+            except Exception as e:
+                import traceback; traceback.print_exc()
+                errors.append(e)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=reserve, args=(application,)) for application in applications]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual((len(seated), len(refused)), (1, 3))
+        self.assertEqual(SeatAllocation.objects.count(), 1)
+        self.assertEqual(sum(Course.objects.values_list('filled_seats', flat=True)), 1)
+
+
+class SeatExpiryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.course = make_course(total_seats=3)
+        self.applications = [
+            make_application(User.objects.create_user(f'applicant{i}'), self.course, status='APPROVED',
+                             is_eligible=True, percentage_obtained=70 + i, submission_date=timezone.now())
+            for i in range(4)
+        ]
+        for application in self.applications[:3]:
+            reserve_seat(application)
+        yesterday = timezone.localdate() - timedelta(days=1)
+        SeatAllocation.objects.filter(application__in=self.applications[:2]).update(confirmation_deadline=yesterday)
+        SeatAllocation.objects.filter(application=self.applications[0]).update(is_confirmed=True)
+        SeatAllocation.objects.filter(application=self.applications[2]).update(confirmation_deadline=yesterday)
+        add_to_waitlist(Application.objects.all())
+
+    def test_sweep_releases_unconfirmed_expired_seats_in_batches(self):
+        result = release_expired_seats(batch_size=1)
+        self.assertEqual(result.released, {self.course.pk: 2})
+        self.assertEqual((result.batches, result.promoted), (2, 1))
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.filled_seats, 2)
+        seated = set(SeatAllocation.objects.values_list('application_id', flat=True))
+        self.assertEqual(seated, {self.applications[0].pk, self.applications[3].pk})
+
+        # A second run finds nothing to do
+        self.assertEqual(release_expired_seats().total_released, 0)
+
+
+class CatalogSnapshotTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.student = User.objects.create_user('student')
+        self.student.groups.add(Group.objects.create(name='Students'))
+        make_course('CS101')
+        make_course('ME101', name='Mechanical', department='Mechanical')
+        self.client.force_login(self.student)
+
+    def course_queries(self, path):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(path)
+        return response, [q['sql'] for q in captured.captured_queries if '"admissions_course"' in q['sql']]
+
+    def test_apply_page_reads_courses_from_snapshot(self):
+        self.client.get(reverse('apply_for_course'))
+        response, queries = self.course_queries(reverse('apply_for_course'))
+        self.assertEqual(queries, [])
+        self.assertContains(response, 'ME101 - Mechanical')
+
+        # A course change bumps the version and the next request rebuilds the snapshot once
+        make_course('EE101', name='Electrical', department='Electrical')
+        response, queries = self.course_queries(reverse('apply_for_course'))
+        self.assertEqual(len(queries), 1)
+        self.assertContains(response, 'EE101 - Electrical')
+
+    def test_apply_page_summary_shows_first_four_courses(self):
+        for code in ['EE101', 'CE101', 'BT101']:
+            make_course(code)
+        response = self.client.get(reverse('apply_for_course'))
+        summary = response.content.decode().split('available-courses-summary', 1)[1]
+        self.assertEqual(summary.count('course-mini-card'), 4)
+        self.assertIn('View All 5 Courses', summary)
+
+    def test_application_form_validates_without_queries(self):
+        course = Course.objects.get(code='ME101')
+        data = {
+            'course': course.pk, 'previous_school': 'School', 'previous_qualification': '12th',
+            'percentage_obtained': 80, 'year_of_passing': 2024, 'date_of_birth': '2005-01-01',
+            'address': '-', 'phone': '9999999999', 'emergency_contact': '9999999999',
+        }
+        ApplicationForm(data).is_valid()
+        with self.assertNumQueries(0):
+            form = ApplicationForm(data)
+            self.assertTrue(form.is_valid(), form.errors)
+        self.assertEqual(form.save(commit=False).course_id, course.pk)
+        self.assertFalse(ApplicationForm({**data, 'course': 999999}).is_valid())
+
+    def test_course_list_miss_renders_from_snapshot(self):
+        self.client.get(reverse('view_courses'))
+        response, queries = self.course_queries(reverse('view_courses') + '?course_type=UG')
+        self.assertEqual(queries, [])
+        self.assertContains(response, 'CS101')
+
+
+    def test_course_choice_field_validates_and_renders_without_queries(self):
+        course = Course.objects.get(code='ME101')
+        str(ApplicationFilterForm()['course'])
+        with self.assertNumQueries(0):
+            form = ApplicationFilterForm({'course': str(course.pk)})
+            self.assertTrue(form.is_valid())
+            self.assertEqual(form.cleaned_data['course'].code, 'ME101')
+            self.assertIn(f'<option value="{course.pk}" selected>ME101 - Mechanical</option>', str(form['course']))
+            self.assertFalse(ApplicationFilterForm({'course': '999999'}).is_valid())
+            self.assertFalse(ApplicationFilterForm({'course': 'abc'}).is_valid())
+
+
+@override_settings(ADMISSIONS_STATUS_COUNTERS=True)
+class CsvImportTests(TestCase):
+    HEADER = 'username,email,course_code,previous_school,previous_qualification,percentage_obtained,' \
+             'year_of_passing,date_of_birth,address,phone,emergency_contact\n'
+
+    def setUp(self):
+        cache.clear()
+
+    def test_courses_import_validates_with_form_rules(self):
+        result = import_courses(io.StringIO(
+            'code,name,department,description,duration,course_type,total_seats,min_percentage,fee_per_year,eligibility_criteria\n'
+            'cs101,Computer Science,CS,-,4,UG,60,60,1000,-\n'
+            'CS101,Duplicate,CS,-,4,UG,60,60,1000,-\n'
+            'ME101,Mechanical,ME,-,4,XX,60,120,0,-\n'
+        ))
+        self.assertEqual(result.created, 1)
+        self.assertEqual(Course.objects.get().code, 'CS101')
+        self.assertEqual(
+            [(e.line, e.field) for e in result.errors],
+            [(3, 'code'), (4, 'course_type'), (4, 'min_percentage'), (4, 'fee_per_year')],
+        )
+
+    def test_applications_import_in_batches(self):
+        make_course('CS101', min_percentage=70)
+        make_application(User.objects.create_user('existing'), Course.objects.get())
+        rows = [
+            'new1,new1@example.com,cs101,School,12th,85,2024,2006-01-01,-,9999999999,8888888888',
+            'new2,,CS101,School,12th,55,2024,01/01/2006,-,9999999999,8888888888',
+            'new1,,CS101,School,12th,85,2024,2006-01-01,-,9999999999,8888888888',
+            'existing,,CS101,School,12th,85,2024,2006-01-01,-,9999999999,8888888888',
+            'new3,,CS101,School,12th,85,2024,2006-01-01,-,12345,8888888888',
+        ]
+        result = import_applications(io.StringIO(self.HEADER + '\n'.join(rows)), batch_size=2)
+
+        self.assertEqual((result.created, result.users_created), (2, 2))
+        self.assertEqual([(e.line, e.field) for e in result.errors], [(4, 'course_code'), (5, 'course_code'), (6, 'phone')])
+        imported = Application.objects.filter(student__username__in=['new1', 'new2']).order_by('student__username')
+        self.assertEqual([a.is_eligible for a in imported], [True, False])
+        self.assertTrue(all(a.application_number for a in imported))
+        self.assertTrue(User.objects.get(username='new1').groups.filter(name='Students').exists())
+        self.assertEqual(counter_status_counts(), status_counts())
+
+    def test_applications_import_checks_email_and_active_limit(self):
+        codes = ['CS101', 'CS102', 'CS103', 'CS104', 'CS105']
+        for code in codes:
+            make_course(code)
+        busy = User.objects.create_user('busy')
+        make_application(busy, Course.objects.get(code='CS101'), status='SUBMITTED')
+        make_application(busy, Course.objects.get(code='CS102'), status='REJECTED')
+        row = '{},{},{},School,12th,85,2024,2006-01-01,-,9999999999,8888888888'
+        rows = [
+            row.format('bad', 'not-an-email', 'CS101'),
+            # One active already: two more fit, the third doesn't
+            row.format('busy', '', 'CS103'),
+            row.format('busy', '', 'CS104'),
+            row.format('busy', '', 'CS105'),
+            # Counted across batches for students new to the database too
+            *[row.format('fresh', '', code) for code in codes[:4]],
+        ]
+        result = import_applications(io.StringIO(self.HEADER + '\n'.join(rows)), batch_size=2)
+
+        self.assertEqual([(e.line, e.field) for e in result.errors], [(2, 'email'), (5, 'username'), (9, 'username')])
+        self.assertIn('Maximum limit is 3', result.errors[1].message)
+        self.assertEqual(result.created, 5)
+        self.assertFalse(User.objects.filter(username='bad').exists())
+        self.assertEqual(Application.objects.filter(student=busy, status='SUBMITTED').count(), 3)
+
+
+class LoadTestHarnessTests(TransactionTestCase):
+    # Async routes query from worker threads, which can't see a TestCase transaction
+    def setUp(self):
+        cache.clear()
+
+    def test_every_route_has_a_scenario(self):
+        self.assertEqual(loadtest.missing_routes(), [])
+
+    def test_every_route_answers_without_errors(self):
+        course = make_course('CS101')
+        student = User.objects.create_user('student')
+        student.groups.add(Group.objects.create(name='Students'))
+        make_application(student, course, status='SUBMITTED')
+
+        results = loadtest.run(loadtest.LoadContext(seed=1), requests=2, concurrency=1, warmup=0)
+
+        self.assertEqual(set(results), set(loadtest.ROUTES))
+        self.assertEqual({name: r.statuses for name, r in results.items() if r.errors}, {})
+        self.assertTrue(all(r.requests == 2 for r in results.values()))
+
+
+class RequestMetricsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        metrics_registry.reset()
+
+    def test_requests_are_recorded_per_url_name(self):
+        make_course('CS101')
+        self.client.get(reverse('view_courses'))
+        self.client.get(reverse('view_courses'))
+
+        histograms = metrics_registry.snapshot()
+        _, _, count = histograms[('request_duration_seconds', 'view_courses')]
+        self.assertEqual(count, 2)
+        self.assertGreater(histograms[('sql_queries', 'view_courses')][1], 0)
+        self.assertGreater(histograms[('template_render_seconds', 'view_courses')][1], 0)
+        self.assertGreater(histograms[('response_size_bytes', 'view_courses')][1], 0)
+
+    def test_endpoint_is_prometheus_text_for_superusers_only(self):
+        officer = User.objects.create_user('officer')
+        self.client.force_login(officer)
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 302)
+
+        self.client.force_login(User.objects.create_superuser('root'))
+        self.client.get(reverse('home'))
+        response = self.client.get(reverse('metrics'))
+
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        self.assertIn('# TYPE admissions_request_duration_seconds histogram', body)
+        self.assertIn('admissions_request_duration_seconds_bucket{view="home",le="+Inf"} 1', body)
+        self.assertIn('admissions_sql_queries_count{view="home"} 1', body)
+
+
+class AsyncViewTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.course = make_course('CS101', total_seats=10, filled_seats=9)
+        self.student = User.objects.create_user('student')
+        self.student.groups.add(Group.objects.create(name='Students'))
+        self.officer = User.objects.create_user('officer')
+        self.officer.groups.add(Group.objects.create(name='Admission Officers'))
+        make_application(self.student, self.course, status='SUBMITTED', submission_date=timezone.now())
+
+    def get_async(self, user, name):
+        client = AsyncClient()
+        async_to_sync(client.aforce_login)(user)
+        with override_settings(ROOT_URLCONF=async_urlconf()):
+            return async_to_sync(client.get)(reverse(name))
+
+    def test_async_views_render_the_same_context_as_sync_views(self):
+        superuser = User.objects.create_superuser('root')
+        for user, name, keys in [
+            (self.officer, 'dashboard_officer', ['total_applications', 'pending_review', 'total_courses']),
+            (self.student, 'dashboard_student', ['total_applications', 'submitted_applications']),
+            (self.officer, 'manage_applications', ['pending_count', 'total_count', 'cursor_mode']),
+            (superuser, 'manage_seats', ['total_seats', 'filled_seats']),
+        ]:
+            self.client.force_login(user)
+            expected = self.client.get(reverse(name))
+            response = self.get_async(user, name)
+            self.assertEqual(response.status_code, 200, name)
+            self.assertEqual({k: response.context[k] for k in keys}, {k: expected.context[k] for k in keys})
+
+        metrics_registry.reset()
+        response = self.get_async(self.officer, 'dashboard_officer')
+        # Queries run in worker threads are still charged to the request
+        self.assertGreaterEqual(metrics_registry.snapshot()[('sql_queries', 'dashboard_officer')][1], 4)
+        self.assertEqual([a.pk for a in response.context['recent_applications']], [Application.objects.get().pk])
+        self.assertEqual(response.context['low_seat_courses'], [self.course])
+
+    def test_async_views_keep_role_checks(self):
+        response = self.get_async(self.student, 'manage_seats')
+        self.assertRedirects(response, reverse('dashboard_student'), fetch_redirect_response=False)
+        response = self.get_async(self.officer, 'dashboard_student')
+        self.assertRedirects(response, reverse('dashboard_officer'), fetch_redirect_response=False)
+
+
+class ApplyServiceTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.courses = [make_course(f'CS10{i}') for i in range(5)]
+        self.student = User.objects.create_user('student')
+        self.student.groups.add(Group.objects.create(name='Students'))
+
+    def new_application(self, course):
+        return Application(course=course, previous_school='School', previous_qualification='12th',
+                           percentage_obtained=80, year_of_passing=2024, date_of_birth=date(2005, 1, 1),
+                           address='-', phone='9999999999', emergency_contact='9999999999')
+
+    def test_conflicts_raise_clean_errors(self):
+        create_application(self.student, self.new_application(self.courses[0]))
+        with self.assertRaisesMessage(AlreadyApplied, 'already applied'):
+            create_application(self.student, self.new_application(self.courses[0]))
+        create_application(self.student, self.new_application(self.courses[1]))
+        with self.assertRaisesMessage(ApplicationLimitReached, 'Maximum limit is 2'):
+            create_application(self.student, self.new_application(self.courses[2]), limit=2)
+        self.assertEqual(Application.objects.filter(student=self.student).count(), 2)
+
+    @override_settings(ADMISSIONS_APPLICATION_NUMBER_BLOCK=10)
+    def test_numbers_come_from_a_reserved_block(self):
+        application_numbers.reset()
+        self.addCleanup(application_numbers.reset)
+        first = create_application(self.student, self.new_application(self.courses[0]))
+        year = timezone.now().year
+        self.assertEqual(ApplicationSequence.objects.get(year=year).last_value, 10)
+        with CaptureQueriesContext(connection) as captured:
+            second = create_application(self.student, self.new_application(self.courses[1]))
+        self.assertFalse([q for q in captured.captured_queries if 'applicationsequence' in q['sql']])
+        self.assertEqual(ApplicationSequence.objects.get(year=year).last_value, 10)
+        self.assertEqual(
+            [first.application_number, second.application_number],
+            [format_application_number(year, 1), format_application_number(year, 2)],
+        )
+
+    def test_parallel_submits_respect_duplicate_and_limit_checks(self):
+        # Every course once, and the first three twice: only three may get through
+        targets = self.courses + self.courses[:3]
+        barrier = threading.Barrier(len(targets), timeout=10)
+        created, rejected, errors = [], [], []
+
+        def submit(course):
+            application = self.new_application(course)
+            try:
+                # Numbered up front: the in-memory test database takes one writer at a time, and
+                # numbers are taken outside the student lock that serializes the rest
+                application.application_number = application_numbers.next_number()
+                barrier.wait()
+                created.append(create_application(self.student, application).course_id)
+            except (AlreadyApplied, ApplicationLimitReached) as e:
+                rejected.append(e)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=submit, args=(course,)) for course in targets]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual((len(created), len(rejected)), (3, 5))
+        self.assertEqual(len(set(created)), 3)
+        applied = Application.objects.filter(student=self.student).values_list('course_id', flat=True)
+        self.assertEqual(sorted(applied), sorted(created))
+
+    def test_apply_view_shows_conflicts_as_messages(self):
+        make_application(self.student, self.courses[0])
+        self.client.force_login(self.student)
+        data = {
+            'course': self.courses[0].pk, 'previous_school': 'School', 'previous_qualification': '12th',
+            'percentage_obtained': 80, 'year_of_passing': 2024, 'date_of_birth': '2005-01-01',
+            'address': '-', 'phone': '9999999999', 'emergency_contact': '9999999999',
+        }
+        response = self.client.post(reverse('apply_for_course'), data)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('already applied', ' '.join(str(m) for m in response.context['messages']))
+        data['course'] = self.courses[1].pk
+        self.assertRedirects(self.client.post(reverse('apply_for_course'), data), reverse('dashboard_student'),
+                             fetch_redirect_response=False)
+
+
+class LiveStatusTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.student = User.objects.create_user('student')
+        self.student.groups.add(Group.objects.create(name='Students'))
+        self.application = make_application(self.student, make_course(), status='SUBMITTED')
+
+    def review(self, status):
+        application = Application.objects.get(pk=self.application.pk)
+        application.status = status
+        application.save()
+
+    def test_stream_reports_changes_since_the_cursor(self):
+        self.client.force_login(self.student)
+        since = (timezone.now() - timedelta(hours=1)).isoformat()
+        response = self.client.get(reverse('application_status_stream'), {'since': since, 'max_age': 0})
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        body = read_stream(response)
+        self.assertIn('event: status', body)
+        self.assertIn(f'"application_number": "{self.application.application_number}"', body)
+        self.assertIn('"status": "SUBMITTED"', body)
+
+        # A reconnect resumes from Last-Event-ID rather than ?since=
+        future = (timezone.now() + timedelta(hours=1)).isoformat()
+        response = self.client.get(
+            reverse('application_status_stream'), {'since': since, 'max_age': 0}, headers={'last-event-id': future}
+        )
+        self.assertEqual(read_stream(response), 'retry: 3000\n\n')
+
+    def test_dashboard_opens_the_stream_only_when_enabled(self):
+        self.client.force_login(self.student)
+        with override_settings(ADMISSIONS_LIVE_STATUS=True):
+            response = self.client.get(reverse('dashboard_student'))
+        self.assertContains(response, reverse('application_status_stream') + '?since=')
+        self.assertContains(response, f'data-application-id="{self.application.pk}"')
+        with override_settings(ADMISSIONS_LIVE_STATUS=False):
+            self.assertNotContains(self.client.get(reverse('dashboard_student')), 'EventSource')
+
+    @override_settings(ADMISSIONS_LIVE_STATUS_POLL=60)
+    def test_review_wakes_waiting_streams(self):
+        async def scenario():
+            events = status_events(self.student.pk, timezone.now() - timedelta(hours=1), max_age=30)
+            self.assertIn('retry', await anext(events))
+            self.assertIn('"SUBMITTED"', await anext(events))
+            waiting = asyncio.ensure_future(anext(events))
+            await asyncio.sleep(0)
+            self.assertEqual(len(status_feed), 1)
+            # Far sooner than the poll interval: the save published the change
+            await sync_to_async(self.review)('APPROVED')
+            self.assertIn('"APPROVED"', await asyncio.wait_for(waiting, 5))
+            await events.aclose()
+            self.assertEqual(len(status_feed), 0)
+
+        async_to_sync(scenario)()
+
+    @override_settings(ADMISSIONS_LIVE_STATUS_POLL=0.05)
+    def test_idle_streams_poll_for_unpublished_changes(self):
+        async def scenario():
+            events = status_events(self.student.pk, timezone.now() - timedelta(hours=1), max_age=30)
+            await anext(events)
+            await anext(events)
+            # A plain queryset update never reaches the feed
+            await Application.objects.filter(pk=self.application.pk).aupdate(status='REJECTED', last_updated=timezone.now())
+            event = await asyncio.wait_for(anext(events), 5)
+            while event.startswith(':'):
+                event = await asyncio.wait_for(anext(events), 5)
+            self.assertIn('"REJECTED"', event)
+            await events.aclose()
+
+        async_to_sync(scenario)()
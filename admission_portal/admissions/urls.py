@@ -1,5 +1,9 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import async_views, views
+
+# Under an ASGI server the dashboards and listings can run their queries concurrently
+listings = async_views if getattr(settings, 'ADMISSIONS_ASYNC_VIEWS', False) else views
 
 urlpatterns = [
     path('', views.home, name='home'),
@@ -9,18 +13,23 @@ urlpatterns = [
     path('courses/', views.view_courses, name='view_courses'),
     
     
-    path('student/dashboard/', views.dashboard_student, name='dashboard_student'),
+    path('student/dashboard/', listings.dashboard_student, name='dashboard_student'),
+    path('student/dashboard/stream/', async_views.application_status_stream, name='application_status_stream'),
     path('student/apply/', views.apply_for_course, name='apply_for_course'),
     path('student/application/<int:application_id>/submit/', views.submit_application, name='submit_application'),
     
-    path('officer/dashboard/', views.dashboard_officer, name='dashboard_officer'),
-    path('officer/applications/', views.manage_applications, name='manage_applications'),
+    path('officer/dashboard/', listings.dashboard_officer, name='dashboard_officer'),
+    path('officer/applications/', listings.manage_applications, name='manage_applications'),
+    path('officer/applications/bulk-review/', views.bulk_review_applications, name='bulk_review_applications'),
+    path('officer/applications/export/', views.export_applications, name='export_applications'),
     path('officer/application/<int:application_id>/review/', views.review_application, name='review_application'),
     path('officer/courses/', views.view_courses_officer, name='officer_view_courses'),
+    path('officer/allocation/', views.merit_allocation, name='merit_allocation'),
     
     path('administration/courses/', views.manage_courses, name='manage_courses'),
     path('administration/courses/add/', views.add_course, name='add_course'),
     path('administration/courses/<int:course_id>/edit/', views.edit_course, name='edit_course'),
     path('administration/courses/<int:course_id>/delete/', views.delete_course, name='delete_course'),
-    path('administration/seats/', views.manage_seats, name='manage_seats'),
+    path('administration/seats/', listings.manage_seats, name='manage_seats'),
+    path('metrics/', views.metrics, name='metrics'),
 ]
\ No newline at end of file
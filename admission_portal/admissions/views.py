@@ -1,15 +1,39 @@
 from django.shortcuts import render, redirect, get_object_or_404
+from django.http import HttpResponse, StreamingHttpResponse
 from django.contrib.auth import login, logout, authenticate
 from django.contrib.auth.decorators import login_required
 # from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
+from django.contrib.messages import get_messages
 from django.core.paginator import Paginator
 # from django.db.models import Q
 from django.db.models import F
 from .models import Application, Course, SeatAllocation
-from .forms import UserRegistrationForm, ApplicationForm, ReviewApplicationForm, CourseSearchForm, ApplicationFilterForm,CourseForm
+from .forms import UserRegistrationForm, ApplicationForm, ReviewApplicationForm, CourseSearchForm, ApplicationFilterForm,CourseForm,BulkReviewForm
 from .decorators import student_required,officer_required_with_login,admin_required_with_login
+from .roles import is_officer, is_student
+from .stats import application_status_counts, seat_statistics, status_counts
+from .pagination import KeysetPaginator
+from .search import RankedCourses
+from .concurrency import run_queries
+from .allocation import allocate_merit_list
+from .reviews import bulk_review
+from .eligibility import check_eligibility
+from .applying import MAX_ACTIVE_APPLICATIONS, ApplicationRejected, create_application
+from .waitlist import add_to_waitlist, remove_from_waitlist, waitlist_position, with_waitlist_position
+from .reservations import release_seats, reserve_seat, NoSeatsAvailable, SeatReservationError
+from .export import FORMATS as EXPORT_FORMATS, export_rows
+from .metrics import registry as metrics_registry
+from .catalog import PAGE_TIMEOUT, catalog_etag, catalog_snapshot, catalog_last_modified, page_cache_key, record_page_cache
 from django.utils import timezone
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.safestring import mark_safe
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.views.decorators.http import condition, require_POST
+from django.utils.http import urlencode
+from django.urls import reverse
+from django.conf import settings
 import logging
 # from django.contrib.admin.views.decorators import staff_member_required
 # from django.contrib.auth.decorators import user_passes_test
@@ -17,6 +41,9 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+APPLICATIONS_PER_PAGE = 5
+COURSES_PER_SEAT_PAGE = 25
+
 
 def home(request):
     """Home page view"""
@@ -32,10 +59,10 @@ def user_login(request):
         if user is not None:
             login(request, user)
             
-            # Redirect based on user role
-            if user.groups.filter(name='Admission Officers').exists():
+            # Redirect based on user role (cached in the session for later requests)
+            if is_officer(request):
                 return redirect('dashboard_officer')
-            elif user.groups.filter(name='Students').exists():
+            elif is_student(request):
                 return redirect('dashboard_student')
             else:
                 return redirect('home')
@@ -69,35 +96,42 @@ def register(request):
     return render(request, 'admissions/register.html', {'form': form})
 
 
+def student_dashboard_queries(request):
+    """The student dashboard's independent queries"""
+    applications = Application.objects.filter(student=request.user).for_listing().order_by('-created_at')
+    return {
+        # Waitlist places come from an indexed count per row, not the whole queue
+        'applications': lambda: list(with_waitlist_position(applications)[:3]),
+        # Get statistics (one conditional aggregation)
+        'counts': lambda: status_counts(applications),
+    }
+
+def student_dashboard_context(results):
+    counts = results['counts']
+    return {
+        'applications': results['applications'],
+        'total_applications': counts.total,
+        'submitted_applications': counts['SUBMITTED'],
+        'approved_applications': counts['APPROVED'],
+        'live_status': getattr(settings, 'ADMISSIONS_LIVE_STATUS', False),
+    }
+
 @login_required
 @student_required
 def dashboard_student(request):
     """Student dashboard"""
-    student = request.user
-    applications = Application.objects.filter(student=student).order_by('-created_at')
-    
-    # Get statistics
-    total_applications = applications.count()
-    submitted_applications = applications.filter(status='SUBMITTED').count()
-    approved_applications = applications.filter(status='APPROVED').count()
-    
-    context = {
-        'applications': applications[:3],  
-        'total_applications': total_applications,
-        'submitted_applications': submitted_applications,
-        'approved_applications': approved_applications,
-    }
-    return render(request, 'admissions/dashboard_student.html', context)
+    results = run_queries(student_dashboard_queries(request))
+    return render(request, 'admissions/dashboard_student.html', student_dashboard_context(results))
 
 @login_required
 @student_required
 def apply_for_course(request):
     """Apply for a new course"""
     
-    MAX_APPLICATIONS = 3
-    courses = Course.objects.all()
+    # Course list and cutoffs come from the in-process snapshot, not the course table
+    courses = catalog_snapshot()
 
-    if not courses.exists():
+    if not courses:
         messages.warning(request, '⚠️ No courses are available for application at this time.')
 
     if request.method == 'POST':
@@ -105,62 +139,43 @@ def apply_for_course(request):
 
         if form.is_valid():
             course = form.cleaned_data['course']
+            application = form.save(commit=False)
+            application.status = 'DRAFT'
 
-            # ✅ Check 1: Already applied?
-            can_apply, message = Application.can_apply(request.user, course)
-            if not can_apply:
-                messages.error(request, message)
-            else:
-                # ✅ Check 2: Max applications reached?
-                can_create, message = Application.can_create_more(request.user, MAX_APPLICATIONS)
-                if not can_create:
-                    messages.error(request, message)
-                else:
-                    # ✅ All validations passed
-                    application = form.save(commit=False)
-                    application.student = request.user
-                    application.status = 'DRAFT'
-
-                    # Eligibility check
-                    percentage = form.cleaned_data['percentage_obtained']
-
-                    if percentage >= course.min_percentage:
-                        application.is_eligible = True
-                        application.eligibility_notes = (
-                            f"✅ Eligible: {percentage}% >= {course.min_percentage}%"
-                        )
-                    else:
-                        application.is_eligible = False
-                        application.eligibility_notes = (
-                            f"❌ Not Eligible: {percentage}% < {course.min_percentage}%"
-                        )
-
-                    application.save()
+            # Eligibility check
+            application.is_eligible, application.eligibility_notes = check_eligibility(
+                form.cleaned_data['percentage_obtained'], (courses.get(course.pk) or course).min_percentage
+            )
 
-                    messages.success(request, '✅ Application saved successfully!')
-                    return redirect('dashboard_student')
+            # Duplicate and limit checks run under a per-student lock, in the insert's transaction
+            try:
+                create_application(request.user, application)
+            except ApplicationRejected as e:
+                messages.error(request, str(e))
+            else:
+                messages.success(request, '✅ Application saved successfully!')
+                return redirect('dashboard_student')
         else:
-            # 🔥 IMPORTANT: See form errors in terminal
-            print("FORM ERRORS:", form.errors)
+            logger.debug('Application form errors for %s: %s', request.user, form.errors.as_json())
 
     else:
         form = ApplicationForm()
 
     # Active application count
     active_count = 0
-    remaining = MAX_APPLICATIONS
+    remaining = MAX_ACTIVE_APPLICATIONS
 
     if request.user.is_authenticated:
         active_count = Application.get_active_count(request.user)
-        remaining = MAX_APPLICATIONS - active_count
+        remaining = MAX_ACTIVE_APPLICATIONS - active_count
 
     return render(request, 'admissions/apply.html', {
         'form': form,
         'courses': courses,
         'active_count': active_count,
         'remaining': remaining,
-        'max_applications': MAX_APPLICATIONS,
-        'total_courses': courses.count(),
+        'max_applications': MAX_ACTIVE_APPLICATIONS,
+        'total_courses': len(courses),
     })
 @login_required
 @student_required
@@ -179,102 +194,149 @@ def submit_application(request, application_id):
     return redirect('dashboard_student')
 
 # Officer Views
+def officer_dashboard_queries(request):
+    """The officer dashboard's independent queries"""
+    return {
+        # Get statistics
+        'counts': application_status_counts,
+        'total_courses': Course.objects.count,
+        # Get recent applications
+        'recent_applications': lambda: list(
+            Application.objects.filter(status='SUBMITTED').for_listing().order_by('-submission_date')[:5]
+        ),
+        # Get courses with low seat availability
+        'low_seat_courses': lambda: list(Course.objects.filter(filled_seats__gte=F('total_seats') * 4/5)[:5]),
+    }
+
+def officer_dashboard_context(results):
+    counts = results['counts']
+    return {
+        'total_applications': counts.total,
+        'pending_review': counts['SUBMITTED'],
+        'approved_applications': counts['APPROVED'],
+        'total_courses': results['total_courses'],
+        'recent_applications': results['recent_applications'],
+        'low_seat_courses': results['low_seat_courses'],
+    }
+
 @login_required
 @officer_required_with_login
 def dashboard_officer(request):
     """Admission officer dashboard"""
-    # Get statistics
-    total_applications = Application.objects.count()
-    pending_review = Application.objects.filter(status='SUBMITTED').count()
-    approved_applications = Application.objects.filter(status='APPROVED').count()
-    total_courses = Course.objects.count()
-    
-    # Get recent applications
-    recent_applications = Application.objects.filter(status='SUBMITTED').order_by('-submission_date')[:5]
-    
-    # Get courses with low seat availability
-    low_seat_courses = Course.objects.filter(filled_seats__gte=F('total_seats') * 4/5)[:5]
-    
-    context = {
-        'total_applications': total_applications,
-        'pending_review': pending_review,
-        'approved_applications': approved_applications,
-        'total_courses': total_courses,
-        'recent_applications': recent_applications,
-        'low_seat_courses': low_seat_courses,
+    results = run_queries(officer_dashboard_queries(request))
+    return render(request, 'admissions/dashboard_officer.html', officer_dashboard_context(results))
+
+def _load_page(get_page):
+    """Fetch a page's rows now, so they can be loaded in a worker thread"""
+    def load():
+        page = get_page()
+        page.object_list = list(page.object_list)
+        return page
+    return load
+
+def application_queue_queries(request):
+    """The officer queue's independent queries and the filter state they were built from"""
+    # Pending (unreviewed) applications unless show_all, narrowed by status/course/dates
+    applications = Application.objects.for_listing().matching_filters(request.GET)
+    
+    # Numbered pages for small queues, keyset cursors when OFFSET gets expensive
+    filter_params = {
+        key: request.GET[key]
+        for key in ('show_all', 'status', 'course', 'date_from', 'date_to')
+        if request.GET.get(key)
+    }
+    pagination = request.GET.get('paginate', getattr(settings, 'ADMISSIONS_QUEUE_PAGINATION', 'pages'))
+    cursor_mode = pagination == 'cursor'
+    if cursor_mode:
+        filter_params['paginate'] = 'cursor'
+        paginator = KeysetPaginator(applications, APPLICATIONS_PER_PAGE, fingerprint=urlencode(sorted(filter_params.items())))
+        page = _load_page(lambda: paginator.get_page(request.GET.get('cursor')))
+    else:
+        # Order by submission date (newest first)
+        applications = applications.order_by('-submission_date', '-created_at')
+        paginator = Paginator(applications, APPLICATIONS_PER_PAGE)
+        page = _load_page(lambda: paginator.get_page(request.GET.get('page')))
+
+    return {
+        'page_obj': page,
+        # Get counts for badges
+        'counts': application_status_counts,
+    }, {'cursor_mode': cursor_mode, 'filter_params': filter_params}
+
+def application_queue_context(request, results, state):
+    counts = results['counts']
+    return {
+        'page_obj': results['page_obj'],
+        'form': ApplicationFilterForm(request.GET or None),
+        'bulk_form': BulkReviewForm(),
+        'pending_count': counts.pending,
+        'approved_count': counts['APPROVED'],
+        'rejected_count': counts['REJECTED'],
+        'total_count': counts.total,
+        'show_all': request.GET.get('show_all', 'false') == 'true',
+        'current_status': request.GET.get('status'),
+        'cursor_mode': state['cursor_mode'],
+        'filter_query': urlencode(state['filter_params']),
     }
-    return render(request, 'admissions/dashboard_officer.html', context)
 
 @login_required
 @officer_required_with_login
 def manage_applications(request):
     """View and filter applications - PENDING FIRST!"""
-    
-    # Start with ONLY unreviewed applications
-    applications = Application.objects.filter(
-        status__in=['DRAFT', 'SUBMITTED', 'UNDER_REVIEW']
+    queries, state = application_queue_queries(request)
+    results = run_queries(queries)
+    return render(request, 'admissions/applications.html', application_queue_context(request, results, state))
+@login_required
+@officer_required_with_login
+@require_POST
+def bulk_review_applications(request):
+    """Approve, reject or allocate the selected applications in one request"""
+    filter_form = ApplicationFilterForm(request.POST)
+    form = BulkReviewForm(request.POST)
+    filter_params = {
+        key: request.POST[key]
+        for key in ('show_all', 'status', 'course', 'date_from', 'date_to')
+        if request.POST.get(key)
+    }
+    queue_url = f"{reverse('manage_applications')}?{urlencode(filter_params)}"
+    if not filter_form.is_valid() or not form.is_valid():
+        messages.error(request, '❌ Nothing reviewed. Select applications and an action, then try again.')
+        return redirect(queue_url)
+
+    # Only applications the queue currently shows, so a stale checkbox can't reach outside the filter
+    applications = Application.objects.matching_filters(filter_params)
+    if not form.cleaned_data['select_all']:
+        applications = applications.filter(pk__in=form.cleaned_data['applications'])
+    result = bulk_review(
+        applications,
+        form.cleaned_data['action'],
+        reviewer=request.user,
+        notes=form.cleaned_data['review_notes'],
     )
-    
-    # Check if user wants to see all
-    show_all = request.GET.get('show_all', 'false')
-    if show_all == 'true':
-        applications = Application.objects.all()
-    
-    # Apply status filter if specified
-    status_filter = request.GET.get('status')
-    if status_filter:
-        applications = applications.filter(status=status_filter)
-    
-    # Apply course filter
-    course_filter = request.GET.get('course')
-    if course_filter:
-        applications = applications.filter(course_id=course_filter)
-    
-    # Apply date filters
-    date_from = request.GET.get('date_from')
-    if date_from:
-        applications = applications.filter(submission_date__date__gte=date_from)
-    
-    date_to = request.GET.get('date_to')
-    if date_to:
-        applications = applications.filter(submission_date__date__lte=date_to)
-    
-    # Order by submission date (newest first)
-    applications = applications.order_by('-submission_date', '-created_at')
-    
-    # Pagination
-    paginator = Paginator(applications, 5)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
-    
-    # Get counts for badges
-    pending_count = Application.objects.filter(
-        status__in=['DRAFT', 'SUBMITTED', 'UNDER_REVIEW']
-    ).count()
-    
-    approved_count = Application.objects.filter(status='APPROVED').count()
-    rejected_count = Application.objects.filter(status='REJECTED').count()
-    total_count = Application.objects.count()
-    
-    # Get all courses for filter dropdown
-    all_courses = Course.objects.all()
-    
-    return render(request, 'admissions/applications.html', {
-        'page_obj': page_obj,
-        'form': ApplicationFilterForm(request.GET or None),
-        'all_courses': all_courses,
-        'pending_count': pending_count,
-        'approved_count': approved_count,
-        'rejected_count': rejected_count,
-        'total_count': total_count,
-        'show_all': show_all == 'true',
-        'current_status': status_filter,
-    })
+    messages.success(request, f'✅ Bulk review of {result.selected} applications: {result.summary()}.')
+    return redirect(queue_url)
+
+@login_required
+@officer_required_with_login
+def export_applications(request):
+    """Stream the filtered application queue as CSV or XLSX"""
+    export_format = request.GET.get('format', 'csv')
+    filter_form = ApplicationFilterForm(request.GET)
+    if export_format not in EXPORT_FORMATS or not filter_form.is_valid():
+        messages.error(request, '❌ Invalid export request. Check the filters and try again.')
+        return redirect('manage_applications')
+
+    writer, content_type = EXPORT_FORMATS[export_format]
+    filename = f'applications-{timezone.localdate():%Y%m%d}.{export_format}'
+    response = StreamingHttpResponse(writer(export_rows(request.GET)), content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
 @login_required
 @officer_required_with_login
 def review_application(request, application_id):
     """Review a specific application"""
-    application = get_object_or_404(Application, id=application_id)
+    application = get_object_or_404(Application.objects.for_detail(), id=application_id)
     
     if request.method == 'POST':
         form = ReviewApplicationForm(request.POST, instance=application)
@@ -290,22 +352,21 @@ def review_application(request, application_id):
                 reviewed_application.status = 'APPROVED'
                 reviewed_application.save()
                 
-                # Check seat availability
+                # Reserve the seat with a conditional UPDATE so concurrent officers can't oversubscribe
                 course = reviewed_application.course
-                if course.available_seats > 0:
-                    # Create seat allocation
-                    SeatAllocation.objects.create(
-                        application=reviewed_application,
-                        course=course,
-                        allocated_by=request.user,
-                        confirmation_deadline=timezone.now().date() + timezone.timedelta(days=14)
-                    )
-                    # ✅ REDUCE SEAT COUNT!
-                    course.filled_seats += 1
-                    course.save()
-                    messages.success(request, f'✅ Application approved and seat allocated! {course.available_seats} seats remaining.')
+                try:
+                    reserve_seat(reviewed_application, allocated_by=request.user)
+                except NoSeatsAvailable:
+                    if add_to_waitlist(Application.objects.filter(pk=reviewed_application.pk)):
+                        position = waitlist_position(reviewed_application.waitlist_entry)
+                        messages.warning(request, f'⚠️ Application approved but NO SEATS AVAILABLE. Student added to waitlist at position {position}.')
+                    else:
+                        messages.warning(request, '⚠️ Application approved but NO SEATS AVAILABLE. Not waitlisted: the application is not eligible or the student already holds a seat.')
+                except SeatReservationError as e:
+                    messages.error(request, str(e))
                 else:
-                    messages.warning(request, '⚠️ Application approved but NO SEATS AVAILABLE. Student added to waitlist.')
+                    course.refresh_from_db(fields=['total_seats', 'filled_seats'])
+                    messages.success(request, f'✅ Application approved and seat allocated! {course.available_seats} seats remaining.')
                     
             elif action == 'approve_only':
                 reviewed_application.status = 'APPROVED'
@@ -320,7 +381,12 @@ def review_application(request, application_id):
             else:  # 'save' - just save review
                 reviewed_application.save()
                 messages.success(request, '✅ Review saved successfully.')
-            
+
+            if reviewed_application.status != 'APPROVED':
+                remove_from_waitlist([reviewed_application.pk])
+                # A seat only belongs to an approved application; the next on the waitlist gets it
+                if release_seats(SeatAllocation.objects.filter(application_id=reviewed_application.pk)):
+                    messages.info(request, '🪑 The seat held by this application was released.')
             return redirect('manage_applications')
     else:
         form = ReviewApplicationForm(instance=application)
@@ -334,25 +400,31 @@ def review_application(request, application_id):
         'status_choices': status_choices,
     })
 @login_required
+@officer_required_with_login
+def merit_allocation(request):
+    """Allocate seats for all courses by merit list"""
+    if request.method == 'POST':
+        result = allocate_merit_list(allocated_by=request.user)
+        messages.success(
+            request,
+            f'✅ Merit list allocated {result.total_allocated} seats in {result.timings["total"]:.2f}s.'
+        )
+        return redirect('merit_allocation')
+
+    # GET shows a dry run so officers can check cutoffs before committing
+    result = allocate_merit_list(dry_run=True)
+    return render(request, 'admissions/merit_allocation.html', {
+        'result': result,
+    })
+
+@login_required
 @admin_required_with_login  # 👈 CHANGED FROM officer_required TO admin_required!
 def manage_courses(request):
     """View and search courses - ADMIN ONLY"""
     courses = Course.objects.all().order_by('code')
     form = CourseSearchForm(request.GET or None)
-    
-    # Apply search filters
-    if form.is_valid():
-        name = form.cleaned_data.get('name')
-        department = form.cleaned_data.get('department')
-        course_type = form.cleaned_data.get('course_type')
-        
-        if name:
-            courses = courses.filter(name__icontains=name)
-        if department:
-            courses = courses.filter(department__icontains=department)
-        if course_type:
-            courses = courses.filter(course_type=course_type)
-    
+    courses = form.search(courses)
+
     # Pagination
     paginator = Paginator(courses, 5)
     page_number = request.GET.get('page')
@@ -361,57 +433,113 @@ def manage_courses(request):
     return render(request, 'admissions/manage_courses.html', {
         'page_obj': page_obj,
         'form': form,
-        'total_count': courses.count(),
+        'total_count': paginator.count,
     })
+def seat_overview_queries(request):
+    """The seat management page's independent queries"""
+    seat_allocations = SeatAllocation.objects.select_related('application', 'course').order_by('-allocation_date')
+    # Course table: only the seat columns, one page at a time
+    courses = Course.objects.only('name', 'code', 'department', 'total_seats', 'filled_seats').order_by('department', 'code')
+    paginator = Paginator(courses, COURSES_PER_SEAT_PAGE)
+    return {
+        'seat_allocations': lambda: list(seat_allocations[:10]),
+        # Seat totals and rollups come from one cached aggregate query
+        'seat_stats': seat_statistics,
+        'page_obj': _load_page(lambda: paginator.get_page(request.GET.get('page'))),
+    }
+
+def seat_overview_context(results):
+    seat_stats = results['seat_stats']
+    return {
+        'seat_allocations': results['seat_allocations'],
+        'courses': results['page_obj'],
+        'page_obj': results['page_obj'],
+        'seat_stats': seat_stats,
+        'total_seats': seat_stats.overall.total,
+        'filled_seats': seat_stats.overall.filled,
+        'available_seats': seat_stats.overall.available,
+    }
+
 @login_required
 @admin_required_with_login  # 👈 CHANGED FROM officer_required TO admin_required!
 def manage_seats(request):
     """Manage seat allocations - ADMIN ONLY"""
-    seat_allocations = SeatAllocation.objects.select_related('application', 'course').order_by('-allocation_date')
-    
-    # Get seat statistics
-    total_seats = sum(course.total_seats for course in Course.objects.all())
-    filled_seats = sum(course.filled_seats for course in Course.objects.all())
-    
-    # Get courses with seat information
-    courses = Course.objects.all().order_by('department')
-    
-    context = {
-        'seat_allocations': seat_allocations[:10],
-        'courses': courses,
-        'total_seats': total_seats,
-        'filled_seats': filled_seats,
-        'available_seats': total_seats - filled_seats,
-    }
-    return render(request, 'admissions/manage_seats.html', context)
+    results = run_queries(seat_overview_queries(request))
+    return render(request, 'admissions/manage_seats.html', seat_overview_context(results))
 # Public Views
+def _course_page_state(request):
+    """Search form, normalized parameters, page number and audience of a course list request"""
+    state = getattr(request, '_course_page_state', None)
+    if state is None:
+        form = CourseSearchForm(request.GET or None)
+        try:
+            page = max(int(request.GET.get('page', 1)), 1)
+        except (TypeError, ValueError):
+            page = 1
+        if is_student(request):
+            audience = 'student'
+        elif request.user.is_authenticated:
+            audience = 'user'
+        else:
+            audience = 'anonymous'
+        state = request._course_page_state = (form, form.normalized_params(), page, audience)
+    return state
+
+
+def _course_page_etag(request):
+    # Pending flash messages make the page one-off, so don't let it validate.
+    if len(get_messages(request)):
+        return None
+    form, params, page, audience = _course_page_state(request)
+    return catalog_etag('view_courses', sorted(params.items()), page, audience, request.user.pk)
+
+
+def _course_page_last_modified(request):
+    if len(get_messages(request)):
+        return None
+    return catalog_last_modified()
+
+
+def _catalog_results(form, snapshot):
+    """The course search as snapshot records, by department then code when no words are given"""
+    results = form.search(Course.objects.all())
+    if isinstance(results, RankedCourses):
+        return [snapshot.get(course_id) for course_id in results.ids if course_id in snapshot]
+    course_type = form.cleaned_data.get('course_type') if form.is_valid() else None
+    return [course for course in snapshot.by_department if not course_type or course.course_type == course_type]
+
+
+@condition(etag_func=_course_page_etag, last_modified_func=_course_page_last_modified)
 def view_courses(request):
     """Public view of available courses"""
-    courses = Course.objects.all().order_by('department', 'code')
-    form = CourseSearchForm(request.GET or None)
-    
-    # Apply search filters
-    if form.is_valid():
-        name = form.cleaned_data.get('name')
-        department = form.cleaned_data.get('department')
-        course_type = form.cleaned_data.get('course_type')
-        
-        if name:
-            courses = courses.filter(name__icontains=name)
-        if department:
-            courses = courses.filter(department__icontains=department)
-        if course_type:
-            courses = courses.filter(course_type=course_type)
-    
-    # Pagination
-    paginator = Paginator(courses, 5)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
-    
-    return render(request, 'admissions/courses_public.html', {
-        'page_obj': page_obj,
+    form, params, page, audience = _course_page_state(request)
+
+    # Resolved first so out-of-range pages share the cache entry of the page they show
+    paginator = Paginator(_catalog_results(form, catalog_snapshot()), 5)
+    page_obj = paginator.get_page(page)
+
+    # The results fragment is cached per search, page and audience until the catalog changes
+    cache_key = page_cache_key('view_courses', sorted(params.items()), page_obj.number, audience)
+    results_html = cache.get(cache_key)
+    record_page_cache(hit=results_html is not None)
+    if results_html is None:
+        results_html = render_to_string('admissions/course_results.html', {
+            'page_obj': page_obj,
+            'total_count': paginator.count,
+            'filter_query': urlencode(params),
+        }, request=request)
+        cache.set(cache_key, results_html, PAGE_TIMEOUT)
+
+    response = render(request, 'admissions/courses_public.html', {
         'form': form,
+        'results_html': mark_safe(results_html),
     })
+    patch_vary_headers(response, ['Cookie'])
+    if request.user.is_authenticated:
+        patch_cache_control(response, private=True, max_age=0, must_revalidate=True)
+    else:
+        patch_cache_control(response, public=True, max_age=0, must_revalidate=True)
+    return response
 
 def allocate_seat(request, application):
     # Check if student already has a seat
@@ -432,20 +560,8 @@ def view_courses_officer(request):
     """View-only courses for officers - NO EDIT/DELETE"""
     courses = Course.objects.all().order_by('department', 'code')
     form = CourseSearchForm(request.GET or None)
-    
-    # Apply search filters
-    if form.is_valid():
-        name = form.cleaned_data.get('name')
-        department = form.cleaned_data.get('department')
-        course_type = form.cleaned_data.get('course_type')
-        
-        if name:
-            courses = courses.filter(name__icontains=name)
-        if department:
-            courses = courses.filter(department__icontains=department)
-        if course_type:
-            courses = courses.filter(course_type=course_type)
-    
+    courses = form.search(courses)
+
     # Pagination
     paginator = Paginator(courses, 5)
     page_number = request.GET.get('page')
@@ -454,7 +570,7 @@ def view_courses_officer(request):
     return render(request, 'admissions/courses_viewonly.html', {
         'page_obj': page_obj,
         'form': form,
-        'total_count': courses.count(),
+        'total_count': paginator.count,
     })
 
 @login_required
@@ -482,10 +598,19 @@ def edit_course(request, course_id):
     course = get_object_or_404(Course, id=course_id)
     
     if request.method == 'POST':
-        form = CourseForm(request.POST, instance=course)
+        form = CourseForm(request.POST, instance=course, changed_by=request.user)
         if form.is_valid():
             form.save()
             messages.success(request, f'✅ Course {course.code} updated successfully!')
+            if form.promotion is not None:
+                messages.info(request, f'🪑 {form.promotion.total_allocated} waitlisted applications were given the new seats.')
+            audit = form.eligibility_audit
+            if audit is not None:
+                messages.info(
+                    request,
+                    f'🔄 Eligibility re-checked for {audit.reevaluated} open applications: '
+                    f'{audit.became_eligible} now eligible, {audit.became_ineligible} no longer eligible.'
+                )
             return redirect('manage_courses')
     else:
         form = CourseForm(instance=course)
@@ -510,4 +635,10 @@ def delete_course(request, course_id):
     
     return render(request, 'admissions/course_confirm_delete.html', {
         'course': course
-    })
\ No newline at end of file
+    })
+
+@login_required
+@admin_required_with_login
+def metrics(request):
+    """Request metrics in Prometheus text format - ADMIN ONLY"""
+    return HttpResponse(metrics_registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
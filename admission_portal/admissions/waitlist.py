@@ -0,0 +1,107 @@
+"""Per-course waitlist of approved applications that found no free seat.
+
+The queue is in merit-list order: best ``percentage_obtained`` first,
+then earliest submission, then application id, the same order
+``allocate_merit_list`` seats candidates in. ``WaitlistEntry`` keeps
+those keys next to the course and one index covers them, so a position is
+an index-range count of the entries ahead of it rather than a scan of the
+queue. ``promote_waitlist`` seats the head of a course's queue through
+``allocate_merit_list`` whenever seats may have come free: capacity
+raised, a seat released or a confirmation lapsed.
+"""
+from django.db import transaction
+from django.db.models import Case, Count, IntegerField, OuterRef, Q, Subquery, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .allocation import allocate_merit_list
+from .models import WaitlistEntry
+
+
+def add_to_waitlist(applications):
+    """Queue the approved, eligible and unseated ones among ``applications``; returns how many joined.
+
+    Applications already queued, or whose student holds a seat anywhere,
+    are left out.
+    """
+    now = timezone.now()
+    rows = (
+        applications
+        .filter(status='APPROVED', is_eligible=True, seat_allocation__isnull=True, waitlist_entry__isnull=True)
+        .exclude(student__applications__seat_allocation__isnull=False)
+        .order_by()
+        .values_list('id', 'course_id', 'percentage_obtained', 'submission_date')
+    )
+    entries = [
+        WaitlistEntry(
+            application_id=app_id,
+            course_id=course_id,
+            percentage_obtained=percentage,
+            submitted_at=submitted or now,
+        )
+        for app_id, course_id, percentage, submitted in rows
+    ]
+    WaitlistEntry.objects.bulk_create(entries, ignore_conflicts=True)
+    return len(entries)
+
+
+def remove_from_waitlist(application_ids):
+    """Drop the entries of ``application_ids`` (a list or a subquery)."""
+    WaitlistEntry.objects.filter(application_id__in=application_ids).delete()
+
+
+def _ahead_of(ref):
+    """Entries queued ahead of the entry whose columns ``ref(name)`` refers to."""
+    percentage, submitted, application = ref('percentage_obtained'), ref('submitted_at'), ref('application_id')
+    return WaitlistEntry.objects.filter(
+        Q(percentage_obtained__gt=percentage)
+        | Q(percentage_obtained=percentage, submitted_at__lt=submitted)
+        | Q(percentage_obtained=percentage, submitted_at=submitted, application_id__lt=application),
+        course_id=ref('course_id'),
+    )
+
+
+def waitlist_position(entry):
+    """1-based place of ``entry`` in its course's queue."""
+    return _ahead_of(lambda name: getattr(entry, name)).count() + 1
+
+
+def with_waitlist_position(applications):
+    """Annotate ``applications`` with ``waitlist_position`` (``None`` when not queued), in the same query."""
+    ahead = (
+        _ahead_of(lambda name: OuterRef(f'waitlist_entry__{name}'))
+        .order_by()
+        .values('course_id')
+        .annotate(count=Count('pk'))
+        .values('count')
+    )
+    return applications.annotate(
+        waitlist_position=Case(
+            When(waitlist_entry__isnull=False, then=Coalesce(Subquery(ahead), 0) + 1),
+            default=None,
+            output_field=IntegerField(),
+        )
+    )
+
+
+def promote_waitlist(courses, allocated_by=None):
+    """Seat waitlisted applications wherever ``courses`` have free seats.
+
+    Returns the ``AllocationResult``. Entries that were seated, or can no
+    longer be (rejected, ineligible, student seated elsewhere), leave the
+    queue.
+    """
+    course_ids = [getattr(course, 'pk', course) for course in courses]
+    with transaction.atomic():
+        result = allocate_merit_list(
+            course_ids,
+            allocated_by=allocated_by,
+            application_ids=WaitlistEntry.objects.filter(course_id__in=course_ids).values('application_id'),
+        )
+        stale = WaitlistEntry.objects.filter(course_id__in=course_ids).filter(
+            ~Q(application__status='APPROVED')
+            | Q(application__is_eligible=False)
+            | Q(application__student__applications__seat_allocation__isnull=False)
+        )
+        stale.delete()
+    return result